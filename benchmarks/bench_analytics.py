@@ -0,0 +1,49 @@
+"""
+Latency of the dashboard analytics endpoints over growing date ranges.
+
+Whole days are summed from the case_rollups collection, so the latency should
+follow the length of the range rather than the number of cases. The
+"live" rows pass a prefix violation filter, which is still aggregated over the
+cases, for comparison. The dashboard sums its series the same way and reads
+one capped page of cases; the map always reads the matching cases (one grid
+$group).
+
+    python rebuild_rollups.py --check
+    python -m benchmarks.bench_analytics --end 2025-01-01 --violation tort
+"""
+from datetime import datetime, timedelta
+
+from benchmarks.common import base_parser, new_session, print_table, summarize, timed_get
+
+ENDPOINTS = ("violations", "geodata", "timeline", "dashboard", "map")
+RANGES_DAYS = (30, 365, 3650)
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--end", default=datetime.utcnow().date().isoformat(), help="Last day of every range")
+    parser.add_argument("--violation", default="tort", help="Prefix for the live (non-rollup) comparison")
+    args = parser.parse_args()
+
+    session = new_session()
+    end = datetime.fromisoformat(args.end)
+    scenarios = [(f"{days}d", {"date_from": (end - timedelta(days=days)).isoformat(), "date_to": end.isoformat()})
+                 for days in RANGES_DAYS]
+    scenarios.append(("all", {}))
+    scenarios.append(("all, live", {"violation": args.violation}))
+
+    rows = []
+    for endpoint in ENDPOINTS:
+        url = f"{args.api_url}/api/analytics/{endpoint}"
+        for name, params in scenarios:
+            timed_get(session, url, params=params)  # warm-up
+            latencies = [timed_get(session, url, params=params)[0] for _ in range(args.repeat)]
+            row = {"endpoint": endpoint, "range": name}
+            row.update(summarize(latencies))
+            rows.append(row)
+
+    print_table(rows, ["endpoint", "range", "runs", "p50_ms", "p95_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares keyset-paginated pages of GET /api/cases against the full NDJSON export
+(stream=true), the only way left to read every case in one request.
+
+Run against a populated database:
+
+    python -m benchmarks.bench_case_listing --server-pid <uvicorn pid>
+
+Paged scenarios run first because peak RSS (VmHWM) only ever grows.
+"""
+from benchmarks.common import base_parser, new_session, print_table, read_rss_mb, summarize, timed_get
+
+LIST_FIELDS = "case_id,title,status,priority,location.country,date_occurred"
+
+
+def walk_pages(session, url, page_size, fields=None):
+    """Follows X-Next-Cursor to the end; returns (pages, cases, bytes, per-page latencies)."""
+    params = {"limit": page_size}
+    if fields:
+        params["fields"] = fields
+    latencies, total_cases, total_bytes, pages = [], 0, 0, 0
+    while True:
+        elapsed, response, size = timed_get(session, url, params=params)
+        latencies.append(elapsed)
+        pages += 1
+        total_cases += len(response.json())
+        total_bytes += size
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            return pages, total_cases, total_bytes, latencies
+        params["cursor"] = next_cursor
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    url = f"{args.api_url}/api/cases"
+    session = new_session()
+    rows = []
+
+    def record(name, latencies, cases, size):
+        rss, peak = read_rss_mb(args.server_pid)
+        row = {"scenario": name, "cases": cases, "bytes": size, "rss_mb": rss, "peak_rss_mb": peak}
+        row.update(summarize(latencies))
+        rows.append(row)
+
+    # First page only: what a list view actually needs
+    for name, fields in [("first page (full docs)", None), ("first page (fields=)", LIST_FIELDS)]:
+        params = {"limit": args.page_size}
+        if fields:
+            params["fields"] = fields
+        latencies, cases, size = [], 0, 0
+        for _ in range(args.repeat):
+            elapsed, response, size = timed_get(session, url, params=params)
+            latencies.append(elapsed)
+            cases = len(response.json())
+        record(name, latencies, cases, size)
+
+    # Walking every page with a projection
+    pages, cases, size, latencies = walk_pages(session, url, args.page_size, LIST_FIELDS)
+    record(f"all {pages} pages (fields=)", latencies, cases, size)
+
+    # Every case in one request, streamed from the cursor as NDJSON
+    latencies, cases, size = [], 0, 0
+    for _ in range(max(1, args.repeat // 4)):
+        elapsed, response, size = timed_get(session, url, params={"stream": "true"})
+        latencies.append(elapsed)
+        cases = response.content.count(b"\n")
+    record("full export (stream)", latencies, cases, size)
+
+    print_table(rows, ["scenario", "cases", "bytes", "p50_ms", "p95_ms", "p99_ms", "rss_mb", "peak_rss_mb"])
+
+
+if __name__ == "__main__":
+    main()
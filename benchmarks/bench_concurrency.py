@@ -0,0 +1,53 @@
+"""
+Measures throughput of the case and analytics endpoints as the number of
+simultaneous clients grows. With non-blocking Mongo calls, requests/s should
+keep rising with concurrency instead of flattening at the single-client rate.
+
+    python -m benchmarks.bench_concurrency --clients 1,4,16,64
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import base_parser, new_session, print_table, summarize, timed_get
+
+ENDPOINTS = {
+    "case list page": ("/api/cases", {"limit": 50, "fields": "case_id,title,status"}),
+    "violations": ("/api/analytics/violations", {}),
+    "geodata": ("/api/analytics/geodata", {}),
+    "timeline": ("/api/analytics/timeline", {}),
+}
+
+
+def run_client(api_url, path, params, requests_per_client):
+    session = new_session()
+    latencies = []
+    for _ in range(requests_per_client):
+        elapsed, _, _ = timed_get(session, api_url + path, params=params)
+        latencies.append(elapsed)
+    return latencies
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--clients", default="1,4,16,64", help="Comma-separated concurrency levels")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.clients.split(",")]
+    rows = []
+    for name, (path, params) in ENDPOINTS.items():
+        for clients in levels:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                futures = [pool.submit(run_client, args.api_url, path, params, args.repeat) for _ in range(clients)]
+                latencies = [ms for future in futures for ms in future.result()]
+            wall = time.perf_counter() - start
+
+            row = {"endpoint": name, "clients": clients, "req_per_s": round(len(latencies) / wall, 1)}
+            row.update(summarize(latencies))
+            rows.append(row)
+
+    print_table(rows, ["endpoint", "clients", "req_per_s", "p50_ms", "p95_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
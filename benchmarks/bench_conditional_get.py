@@ -0,0 +1,78 @@
+"""
+Measures the bytes saved by ETag revalidation and byte ranges.
+
+For a case, a report and an evidence file it compares a plain re-download with
+a conditional GET (If-None-Match), and for the evidence file it also fetches
+the second half with a Range request, as a video player does when seeking.
+
+    python -m benchmarks.bench_conditional_get --case-id HRM-2023-1001 \\
+        --report-id IR-2025-1001 --evidence-url /uploads/blobs/...
+"""
+import sys
+
+from benchmarks.common import base_parser, new_session, print_table
+
+
+def measure(session, url, rerenders):
+    """Bytes on the wire for `rerenders` plain GETs vs one GET plus conditional GETs."""
+    first = session.get(url)
+    first.raise_for_status()
+    etag = first.headers.get("ETag")
+    plain = len(first.content) * rerenders
+
+    conditional = len(first.content)
+    statuses = set()
+    for _ in range(rerenders - 1):
+        response = session.get(url, headers={"If-None-Match": etag} if etag else {})
+        statuses.add(response.status_code)
+        conditional += len(response.content)
+
+    return {
+        "resource": url,
+        "etag": etag,
+        "revalidation_status": ",".join(str(s) for s in sorted(statuses)),
+        "plain_bytes": plain,
+        "conditional_bytes": conditional,
+        "saved_pct": round(100 * (1 - conditional / plain), 1) if plain else 0,
+    }
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--case-id")
+    parser.add_argument("--report-id")
+    parser.add_argument("--evidence-url", help="Path of an uploaded file, e.g. /uploads/blobs/ab/cd/<sha>.mp4")
+    args = parser.parse_args()
+
+    session = new_session()
+    targets = []
+    if args.case_id:
+        targets.append(f"{args.api_url}/api/cases/{args.case_id}")
+    if args.report_id:
+        targets.append(f"{args.api_url}/api/reports/{args.report_id}")
+    if args.evidence_url:
+        targets.append(args.api_url + args.evidence_url)
+    if not targets:
+        parser.error("pass at least one of --case-id, --report-id or --evidence-url")
+
+    rows = [measure(session, url, args.repeat) for url in targets]
+    print_table(rows, ["resource", "revalidation_status", "plain_bytes", "conditional_bytes", "saved_pct"])
+
+    failed = [row for row in rows if row["revalidation_status"] != "304"]
+
+    if args.evidence_url:
+        url = args.api_url + args.evidence_url
+        size = int(session.head(url).headers["Content-Length"])
+        seek = session.get(url, headers={"Range": f"bytes={size // 2}-"})
+        print(f"\nRange bytes={size // 2}- -> {seek.status_code}, {seek.headers.get('Content-Range')}, "
+              f"{len(seek.content)} of {size} bytes transferred")
+        if seek.status_code != 206 or len(seek.content) != size - size // 2:
+            failed.append(url)
+
+    if failed:
+        print("❌ Some resources were not revalidated or ranged as expected")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Hit rate and latency of the reverse geocoding cache (utils/geocoding.py).
+
+Simulates field teams: reports are scattered within a few hundred metres of a
+handful of villages and run through a GeocodingCache whose backend is a stub
+that sleeps like a network call. Nominatim is never contacted. The script
+prints the hit rate and per-lookup latency for a cold and a warm pass, then a
+third pass with a fresh LRU that shows the persistent Mongo layer on its own.
+
+    python -m benchmarks.bench_geocoding --villages 20 --reports 2000 --backend-latency-ms 800
+
+It needs MONGODB_URI (read from .env like the API) and uses a throwaway
+collection that it drops at the end.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.common import print_table, summarize
+from utils.geocoding import GeocodingCache
+
+
+class StubBackend:
+    """Stands in for Nominatim: fixed latency, deterministic answers, counts calls."""
+    name = "stub"
+
+    def __init__(self, latency_s):
+        self.latency_s = latency_s
+        self.calls = 0
+
+    def reverse(self, latitude, longitude):
+        self.calls += 1
+        time.sleep(self.latency_s)
+        return {"country": "Stubland", "city": f"village {round(latitude, 1)},{round(longitude, 1)}"}
+
+
+def make_reports(villages, reports, spread_deg, seed):
+    rng = random.Random(seed)
+    centres = [(rng.uniform(-60, 60), rng.uniform(-170, 170)) for _ in range(villages)]
+    points = []
+    for _ in range(reports):
+        lat, lon = rng.choice(centres)
+        points.append((lat + rng.uniform(-spread_deg, spread_deg), lon + rng.uniform(-spread_deg, spread_deg)))
+    return points
+
+
+async def run_pass(cache, points, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def lookup(lat, lon):
+        async with semaphore:
+            start = time.perf_counter()
+            await cache.reverse(lat, lon)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(lookup(lat, lon) for lat, lon in points))
+    return latencies
+
+
+async def main_async(args):
+    client = AsyncIOMotorClient(args.mongodb_uri)
+    collection = client.human_rights_monitor[f"bench_geocode_{uuid.uuid4().hex[:8]}"]
+    backend = StubBackend(args.backend_latency_ms / 1000)
+    points = make_reports(args.villages, args.reports, args.spread_deg, args.seed)
+
+    rows = []
+    try:
+        cache = GeocodingCache(collection, backend)
+        for name in ("cold", "warm"):
+            before = backend.calls
+            latencies = await run_pass(cache, points, args.concurrency)
+            row = {"pass": name, "backend_calls": backend.calls - before,
+                   "hit_rate": round(1 - (backend.calls - before) / len(points), 4)}
+            row.update(summarize(latencies))
+            rows.append(row)
+
+        # New process: empty LRU, persistent table still populated
+        restarted = GeocodingCache(collection, backend)
+        before = backend.calls
+        latencies = await run_pass(restarted, points, args.concurrency)
+        row = {"pass": "restart (mongo only)", "backend_calls": backend.calls - before,
+               "hit_rate": round(1 - (backend.calls - before) / len(points), 4)}
+        row.update(summarize(latencies))
+        rows.append(row)
+    finally:
+        await collection.drop()
+        client.close()
+
+    print_table(rows, ["pass", "runs", "backend_calls", "hit_rate", "p50_ms", "p95_ms", "p99_ms"])
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-uri", default=os.getenv("MONGODB_URI"))
+    parser.add_argument("--villages", type=int, default=20)
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--spread-deg", type=float, default=0.002, help="Scatter around each village (0.002 deg ~ 200 m)")
+    parser.add_argument("--backend-latency-ms", type=float, default=800)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if not args.mongodb_uri:
+        parser.error("set MONGODB_URI or pass --mongodb-uri")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
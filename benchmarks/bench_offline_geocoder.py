@@ -0,0 +1,47 @@
+"""
+Per-lookup latency of the offline reverse geocoder (utils/offline_geocoding.py).
+
+Loads the boundary file once, then resolves random points (land and sea) and
+reports the load time, the hit ratio and the lookup latency in microseconds.
+
+    python -m benchmarks.bench_offline_geocoder --boundaries data/boundaries.geojson --points 100000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import print_table, summarize
+from utils.offline_geocoding import GEOCODER_BOUNDARIES, OfflineBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boundaries", default=GEOCODER_BOUNDARIES)
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    backend = OfflineBackend(path=args.boundaries)
+    start = time.perf_counter()
+    index = backend.index()
+    load_s = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    points = [(rng.uniform(-60, 75), rng.uniform(-180, 180)) for _ in range(args.points)]
+
+    latencies_us, found = [], 0
+    for lat, lon in points:
+        start = time.perf_counter()
+        place = backend.reverse(lat, lon)
+        latencies_us.append((time.perf_counter() - start) * 1_000_000)
+        found += place is not None
+
+    # summarize() labels are in ms; the samples here are microseconds
+    row = {"polygons": index.polygons, "grid_cells": len(index.cells), "load_s": round(load_s, 2),
+           "resolved": f"{found}/{len(points)}"}
+    row.update({key.replace("_ms", "_us"): value for key, value in summarize(latencies_us).items()})
+    print_table([row], ["polygons", "grid_cells", "load_s", "resolved", "p50_us", "p95_us", "p99_us"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Stress test for the report ID allocator (database/counters.py).
+
+Several processes, each with many concurrent tasks, draw numbers from one
+sequence in the counters collection. The script fails if any number is issued
+twice, and prints latency per slice of the run. The slices should stay flat
+however many IDs have been issued.
+
+    python -m benchmarks.bench_report_ids --processes 4 --concurrency 50 --allocations 20000
+    python -m benchmarks.bench_report_ids --block-size 100
+
+It needs MONGODB_URI (read from .env like the API). It works on a throwaway
+sequence name and deletes that counter when done.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.common import print_table, summarize
+from database.counters import SequenceAllocator
+
+SLICES = 5
+
+
+async def allocate(uri, sequence, count, concurrency, block_size):
+    client = AsyncIOMotorClient(uri)
+    allocator = SequenceAllocator(client.human_rights_monitor.counters, block_size=block_size)
+    results = []  # (start offset in seconds, value, latency in ms)
+    remaining = count
+    started = time.perf_counter()
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            value = await allocator.next(sequence)
+            results.append((start - started, value, (time.perf_counter() - start) * 1000))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    client.close()
+    return results
+
+
+def run_process(args):
+    uri, sequence, count, concurrency, block_size = args
+    return asyncio.run(allocate(uri, sequence, count, concurrency, block_size))
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-uri", default=os.getenv("MONGODB_URI"))
+    parser.add_argument("--allocations", type=int, default=10_000, help="Total IDs to allocate")
+    parser.add_argument("--processes", type=int, default=4, help="Simulated API workers")
+    parser.add_argument("--concurrency", type=int, default=25, help="Concurrent requests per worker")
+    parser.add_argument("--block-size", type=int, default=1, help="IDs leased per round trip")
+    args = parser.parse_args()
+    if not args.mongodb_uri:
+        parser.error("set MONGODB_URI or pass --mongodb-uri")
+
+    sequence = f"bench_report_id:{uuid.uuid4().hex}"
+    per_process = args.allocations // args.processes
+    jobs = [(args.mongodb_uri, sequence, per_process, args.concurrency, args.block_size)] * args.processes
+
+    wall_start = time.perf_counter()
+    with multiprocessing.Pool(args.processes) as pool:
+        per_worker = pool.map(run_process, jobs)
+    wall = time.perf_counter() - wall_start
+
+    samples = sorted(sample for results in per_worker for sample in results)
+    values = [value for _, value, _ in samples]
+    duplicates = len(values) - len(set(values))
+
+    # Latency per slice of the run, in issue order: flat means constant time
+    rows = []
+    slice_size = max(1, len(samples) // SLICES)
+    for i in range(0, len(samples), slice_size):
+        chunk = samples[i:i + slice_size]
+        row = {"ids": f"{i + 1}-{i + len(chunk)}"}
+        row.update(summarize([latency for _, _, latency in chunk]))
+        rows.append(row)
+    print_table(rows, ["ids", "runs", "p50_ms", "p95_ms", "p99_ms"])
+
+    print(f"\n{len(values)} IDs in {wall:.2f}s ({len(values) / wall:.0f}/s), "
+          f"block size {args.block_size}, duplicates: {duplicates}")
+
+    async def cleanup():
+        client = AsyncIOMotorClient(args.mongodb_uri)
+        await client.human_rights_monitor.counters.delete_one({"_id": sequence})
+        client.close()
+    asyncio.run(cleanup())
+
+    if duplicates:
+        print("❌ Duplicate IDs were allocated")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Serialization cost of a page of incident reports: the previous read path vs the fast one.
+
+previous: IncidentReport.model_validate per document, then FastAPI's response_model
+          validation and JSON-mode dump, then json.dumps
+fast:     report_to_json per document, then utils.serialization.dumps (orjson if installed)
+
+Runs in-process on synthetic BSON-shaped documents (no server or database
+needed) and first checks that both paths produce identical JSON.
+
+    python -m benchmarks.bench_report_serialization --page-sizes 20 100 1000
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+from typing import List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+# The router module needs a connection string at import time; nothing connects here
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+
+from benchmarks.common import print_table, summarize  # noqa: E402
+from routers.incident_routes import IncidentReport, report_to_json  # noqa: E402
+from utils.serialization import dumps, orjson  # noqa: E402
+
+response_adapter = TypeAdapter(List[IncidentReport])
+
+
+def make_document(i):
+    created = datetime.datetime(2025, 1, 1) + datetime.timedelta(minutes=i, milliseconds=i % 1000)
+    sha = f"{i:064x}"
+    return {
+        "_id": ObjectId(),
+        "report_id": f"IR-2025-{1001 + i}",
+        "reporter_type": "organization" if i % 3 else "individual",
+        "anonymous": i % 2 == 0,
+        "contact_info": None if i % 2 == 0 else {"email": f"reporter{i}@example.org", "phone": "+970-59-000-0000"},
+        "incident_details": {
+            "date": created - datetime.timedelta(days=2),
+            "location": {
+                "country": "Palestine",
+                "city": "Ramallah",
+                "coordinates": {"type": "Point", "coordinates": [35.2 + i * 1e-5, 31.9]},
+            },
+            "description": "Witnessed arbitrary detention at a checkpoint. " * 4,
+            "violation_types": ["arbitrary detention", "freedom of movement"],
+        },
+        "evidence": [
+            {"type": "photo", "url": f"/uploads/blobs/{sha[:2]}/{sha[2:4]}/{sha}.jpg", "description": "photo.jpg",
+             "sha256": sha, "size": 204800, "thumbnail_url": f"/api/evidence/{sha}/thumbnail",
+             "preview_url": f"/api/evidence/{sha}/preview"},
+            {"type": "document", "url": f"/uploads/blobs/{sha[:2]}/{sha[2:4]}/{sha}.pdf", "description": "statement.pdf",
+             "sha256": sha, "size": 51200},
+        ],
+        "status": "new",
+        "created_at": created,
+    }
+
+
+def previous_path(docs) -> bytes:
+    results = []
+    for doc in docs:
+        doc = dict(doc)
+        doc["id"] = str(doc.pop("_id"))
+        results.append(IncidentReport.model_validate(doc))
+    # What FastAPI does with response_model=List[IncidentReport]
+    validated = response_adapter.validate_python(results, from_attributes=True)
+    content = response_adapter.dump_python(validated, mode="json", by_alias=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(docs) -> bytes:
+    return dumps([report for report in map(report_to_json, docs) if report is not None])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sample = [make_document(i) for i in range(50)]
+    if json.loads(previous_path(sample)) != json.loads(fast_path(sample)):
+        print("❌ The fast path does not produce the same JSON as the previous path")
+        sys.exit(1)
+
+    rows = []
+    for size in args.page_sizes:
+        docs = [make_document(i) for i in range(size)]
+        for name, path in (("previous", previous_path), ("fast", fast_path)):
+            path(docs)  # warm-up
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                path(docs)
+                latencies.append((time.perf_counter() - start) * 1000)
+            row = {"page_size": size, "path": name}
+            row.update(summarize(latencies))
+            rows.append(row)
+
+    print(f"JSON encoder: {'orjson' if orjson else 'json (install orjson for the fast encoder)'}")
+    print_table(rows, ["page_size", "path", "runs", "p50_ms", "p95_ms", "mean_ms"])
+
+
+if __name__ == "__main__":
+    main()
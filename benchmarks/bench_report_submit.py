@@ -0,0 +1,59 @@
+"""
+Latency of POST /api/reports/ with and without attachments.
+
+With geocoding and thumbnail rendering moved to the background job queue, the
+latency should not depend on the geocoder. The only size-dependent part left is
+receiving and storing the upload itself.
+
+    python -m benchmarks.bench_report_submit --repeat 50 --attachment-kb 0 512 4096
+"""
+import os
+import random
+import time
+
+from benchmarks.common import base_parser, new_session, print_table, summarize
+
+
+def submit(session, url, attachment):
+    # Random coordinates so every submission misses the geocoding cache
+    data = {
+        "reporter_type": "individual",
+        "anonymous": "true",
+        "date": "2025-01-01",
+        "latitude": random.uniform(-60, 70),
+        "longitude": random.uniform(-170, 170),
+        "description": "Benchmark submission",
+        "violation_types": "benchmark",
+    }
+    files = [("files", ("evidence.bin", attachment, "application/octet-stream"))] if attachment else None
+    start = time.perf_counter()
+    response = session.post(url, data=data, files=files)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    response.raise_for_status()
+    return elapsed_ms, response.json()
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--attachment-kb", type=int, nargs="+", default=[0, 512, 4096])
+    args = parser.parse_args()
+
+    url = f"{args.api_url}/api/reports/"
+    session = new_session()
+    rows = []
+    for size_kb in args.attachment_kb:
+        attachment = os.urandom(size_kb * 1024) if size_kb else None
+        latencies, jobs = [], 0
+        for _ in range(args.repeat):
+            elapsed, report = submit(session, url, attachment)
+            latencies.append(elapsed)
+            jobs += bool(report.get("enrichment"))
+        row = {"attachment_kb": size_kb, "queued_jobs": jobs}
+        row.update(summarize(latencies))
+        rows.append(row)
+
+    print_table(rows, ["attachment_kb", "runs", "queued_jobs", "p50_ms", "p95_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
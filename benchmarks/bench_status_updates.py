@@ -0,0 +1,100 @@
+"""
+Fires concurrent PATCH /api/cases/{case_id}/status requests at one case, then
+checks that the recorded history is a consistent chain: versions 1..N with no
+gaps, each old_status equal to the previous new_status, and the final entry
+matching the case's current status and status_version. A transition sent with
+a stale status_version must be refused with 409. Also reports the write latency.
+
+    python -m benchmarks.bench_status_updates --clients 16 --repeat 20
+"""
+import random
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import base_parser, new_session, print_table, summarize
+
+STATUSES = ["new", "under_investigation", "resolved", "archived"]
+
+
+def create_case(session, api_url):
+    case_id = f"BENCH-STATUS-{uuid.uuid4().hex[:8]}"
+    response = session.post(f"{api_url}/api/cases", json={
+        "case_id": case_id,
+        "title": "Status benchmark case",
+        "description": "Created by benchmarks/bench_status_updates.py",
+        "violation_types": ["benchmark"],
+        "location": {"country": "Benchmark"},
+        "date_occurred": "2024-01-01T00:00:00",
+        "date_reported": "2024-01-01T00:00:00",
+    })
+    response.raise_for_status()
+    return case_id
+
+
+def run_client(api_url, case_id, updates):
+    session = new_session()
+    latencies = []
+    for _ in range(updates):
+        response = session.patch(f"{api_url}/api/cases/{case_id}/status",
+                                 json={"status": random.choice(STATUSES)})
+        response.raise_for_status()
+        latencies.append(response.elapsed.total_seconds() * 1000)
+    return latencies
+
+
+def check_history(history, final_status, expected):
+    errors = []
+    chain = sorted(history, key=lambda record: record["version"])
+    if len(chain) != expected:
+        errors.append(f"expected {expected} history entries, found {len(chain)}")
+
+    previous = "new"
+    for position, record in enumerate(chain, start=1):
+        if record["version"] != position:
+            errors.append(f"version gap: expected {position}, found {record['version']}")
+            break
+        if record["old_status"] != previous:
+            errors.append(f"version {position}: old_status {record['old_status']} != previous {previous}")
+        previous = record["new_status"]
+
+    if chain and previous != final_status:
+        errors.append(f"last history status {previous} != case status {final_status}")
+    return errors
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    session = new_session()
+    case_id = create_case(session, args.api_url)
+
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        futures = [pool.submit(run_client, args.api_url, case_id, args.repeat) for _ in range(args.clients)]
+        latencies = [ms for future in futures for ms in future.result()]
+
+    history = session.get(f"{args.api_url}/api/cases/{case_id}/history").json()
+    case = session.get(f"{args.api_url}/api/cases/{case_id}").json()
+    stale = session.patch(f"{args.api_url}/api/cases/{case_id}/status", json={"status": "new", "status_version": 0})
+
+    row = {"case_id": case_id, "updates": len(latencies), "clients": args.clients}
+    row.update(summarize(latencies))
+    print_table([row], ["case_id", "clients", "updates", "p50_ms", "p95_ms", "p99_ms"])
+
+    errors = check_history(history, case["status"], expected=len(latencies))
+    if case.get("status_version") != len(latencies):
+        errors.append(f"status_version {case.get('status_version')} != {len(latencies)} updates")
+    if stale.status_code != 409:
+        errors.append(f"a stale status_version was answered {stale.status_code} instead of 409")
+    if errors:
+        print("❌ History is inconsistent:")
+        for error in errors[:20]:
+            print("  -", error)
+        sys.exit(1)
+    print(f"✅ {len(history)} history entries form a consistent chain")
+
+
+if __name__ == "__main__":
+    main()
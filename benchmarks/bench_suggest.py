@@ -0,0 +1,60 @@
+"""
+Latency of the autocomplete endpoints for prefixes of growing length.
+
+Short prefixes match the most documents, so they are the worst case for the
+anchored index scans. The target is a p99 under 10 ms per request.
+
+    python -m benchmarks.bench_suggest --case-prefix HRM-2023 --title-prefix forced \\
+        --report-prefix IR-2025
+"""
+import sys
+
+from benchmarks.common import base_parser, new_session, print_table, summarize, timed_get
+
+P99_TARGET_MS = 10
+
+
+def prefixes(value):
+    """'HRM-2' -> ['H', 'HR', 'HRM', 'HRM-', 'HRM-2']"""
+    return [value[:n] for n in range(1, len(value) + 1)]
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--case-prefix", default="HRM-2023")
+    parser.add_argument("--title-prefix", default="forced")
+    parser.add_argument("--report-prefix", default="IR-2025")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    session = new_session()
+    targets = [
+        ("cases/case_id", f"{args.api_url}/api/cases/suggest", args.case_prefix),
+        ("cases/title", f"{args.api_url}/api/cases/suggest", args.title_prefix),
+        ("reports/report_id", f"{args.api_url}/api/reports/suggest", args.report_prefix),
+    ]
+
+    rows = []
+    for name, url, value in targets:
+        for prefix in prefixes(value):
+            params = {"q": prefix, "limit": args.limit}
+            timed_get(session, url, params=params)  # warm-up
+            latencies, matches = [], 0
+            for _ in range(args.repeat):
+                elapsed, response, _ = timed_get(session, url, params=params)
+                latencies.append(elapsed)
+                matches = len(response.json())
+            row = {"target": name, "q": prefix, "matches": matches}
+            row.update(summarize(latencies))
+            rows.append(row)
+
+    print_table(rows, ["target", "q", "matches", "p50_ms", "p95_ms", "p99_ms"])
+
+    slow = [row for row in rows if row["p99_ms"] > P99_TARGET_MS]
+    if slow:
+        print(f"❌ {len(slow)} prefixes above the {P99_TARGET_MS} ms p99 target")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Scaling suite for the analytics and list endpoints.
+
+For each data size the database is topped up with generated cases and
+incident reports (benchmarks/generate_data.py), then every endpoint below is
+timed against the running API. Latency percentiles and the server's RSS are
+printed and saved as JSON (with the git commit), so runs on different commits
+can be compared with --baseline.
+
+Needs a real local MongoDB (MongoDB 5.1+ for the timeline stages) and the API
+running on it; the seeding writes to the same databases the API reads (cases
+from database/connection.py, reports from MONGODB_URI in .env), and --drop
+refuses non-local hosts unless --i-know is given.
+
+    uvicorn main:app &
+    python -m benchmarks.bench_suite --sizes 10000,100000,1000000 --drop --server-pid <uvicorn pid>
+    python -m benchmarks.bench_suite --sizes 10000,100000 --baseline bench-results/<previous>.json
+"""
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmarks.common import base_parser, new_session, print_table, read_rss_mb, summarize, timed_get
+from benchmarks.generate_data import seed
+
+ENDPOINTS = {
+    "analytics/violations": ("/api/analytics/violations", {}),
+    "analytics/violations 1y": ("/api/analytics/violations", {"date_from": "2024-01-01", "date_to": "2024-12-31"}),
+    "analytics/geodata": ("/api/analytics/geodata", {}),
+    "analytics/timeline": ("/api/analytics/timeline", {}),
+    "analytics/timeline week+country": ("/api/analytics/timeline", {"granularity": "week", "breakdown": "country",
+                                                                    "date_from": "2024-01-01", "date_to": "2024-12-31"}),
+    "analytics/timeline live": ("/api/analytics/timeline", {"violation": "tort"}),
+    "analytics/dashboard": ("/api/analytics/dashboard", {"limit": 1000}),
+    "analytics/map": ("/api/analytics/map", {"zoom": 4}),
+    "cases page": ("/api/cases", {"limit": 50, "fields": "case_id,title,status"}),
+    "reports page": ("/api/reports/", {"limit": 50}),
+    "reports page + total": ("/api/reports/", {"limit": 50, "status": "new", "total": "exact"}),
+}
+COLUMNS = ["size", "endpoint", "p50_ms", "p95_ms", "p99_ms", "kb", "rss_mb", "peak_rss_mb"]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_endpoints(session, api_url, size, repeat, server_pid):
+    rows = []
+    for name, (path, params) in ENDPOINTS.items():
+        timed_get(session, api_url + path, params=params)  # warm-up
+        latencies, size_bytes = [], 0
+        for _ in range(repeat):
+            elapsed, _, size_bytes = timed_get(session, api_url + path, params=params)
+            latencies.append(elapsed)
+        rss, peak = read_rss_mb(server_pid)
+        row = {"size": size, "endpoint": name, "kb": round(size_bytes / 1024, 1),
+               "rss_mb": rss and round(rss, 1), "peak_rss_mb": peak and round(peak, 1)}
+        row.update(summarize(latencies))
+        rows.append(row)
+    return rows
+
+
+def compare(rows, baseline_path):
+    """Adds p95 change against a previous results file, matched on (size, endpoint)."""
+    with open(baseline_path, encoding="utf-8") as source:
+        baseline = {(row["size"], row["endpoint"]): row for row in json.load(source)["results"]}
+    regressions = []
+    for row in rows:
+        previous = baseline.get((row["size"], row["endpoint"]))
+        if previous and previous["p95_ms"]:
+            row["p95_vs_base"] = f"{row['p95_ms'] / previous['p95_ms']:.2f}x"
+            if row["p95_ms"] > previous["p95_ms"] * 1.2:
+                regressions.append(row)
+    return regressions
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Comma-separated numbers of cases (and as many reports) to measure at")
+    parser.add_argument("--drop", action="store_true", help="Start from empty collections (benchmark databases only)")
+    parser.add_argument("--i-know", action="store_true", help="Allow --drop on a MongoDB that is not on localhost")
+    parser.add_argument("--skip-seed", action="store_true", help="Measure the data already in the database")
+    parser.add_argument("--output", default=None, help="Results file (default bench-results/<timestamp>-<commit>.json)")
+    parser.add_argument("--baseline", default=None, help="Previous results file to compare p95 latency against")
+    args = parser.parse_args()
+
+    session = new_session()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    rows = []
+    for index, size in enumerate(sizes):
+        if not args.skip_seed:
+            print(f"🌱 Seeding up to {size} cases and reports")
+            seed(size, size, drop=args.drop and index == 0, allow_remote=args.i_know)
+        print(f"⏱️ Measuring at {size} documents")
+        rows.extend(run_endpoints(session, args.api_url, size, args.repeat, args.server_pid))
+
+    commit = git_commit()
+    output = args.output or os.path.join(
+        "bench-results", f"{datetime.utcnow():%Y%m%dT%H%M%S}-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as target:
+        json.dump({"commit": commit, "created_at": datetime.utcnow().isoformat(), "api_url": args.api_url,
+                   "repeat": args.repeat, "results": rows}, target, indent=2)
+
+    columns = COLUMNS
+    regressions = []
+    if args.baseline:
+        regressions = compare(rows, args.baseline)
+        columns = COLUMNS + ["p95_vs_base"]
+    print_table(rows, columns)
+    print(f"📄 Results saved to {output}")
+
+    if regressions:
+        print(f"❌ {len(regressions)} endpoints are more than 20% slower (p95) than the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Shared helpers for the benchmark scripts.
+
+The benchmarks talk to a running API (``uvicorn main:app``) over HTTP, so the
+numbers include serialization and transfer cost. Pass ``--server-pid`` to also
+sample the server's resident memory from /proc.
+"""
+import argparse
+import statistics
+import time
+
+import requests
+
+DEFAULT_API_URL = "http://127.0.0.1:8000"
+
+
+def base_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--api-url", default=DEFAULT_API_URL, help="Base URL of the running API")
+    parser.add_argument("--server-pid", type=int, default=None, help="PID of the uvicorn worker, for RSS sampling")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed runs per scenario")
+    return parser
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ms):
+    return {
+        "runs": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 2) if samples_ms else None,
+        "p50_ms": round(percentile(samples_ms, 50), 2) if samples_ms else None,
+        "p95_ms": round(percentile(samples_ms, 95), 2) if samples_ms else None,
+        "p99_ms": round(percentile(samples_ms, 99), 2) if samples_ms else None,
+    }
+
+
+def read_rss_mb(pid):
+    """Returns (current RSS, peak RSS) in MB for a process, or (None, None)."""
+    if not pid:
+        return None, None
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":", 1)
+                    values[key] = int(value.split()[0]) / 1024
+    except OSError:
+        return None, None
+    return values.get("VmRSS"), values.get("VmHWM")
+
+
+def timed_get(session, url, **kwargs):
+    start = time.perf_counter()
+    response = session.get(url, **kwargs)
+    body = response.content
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    response.raise_for_status()
+    return elapsed_ms, response, len(body)
+
+
+def new_session():
+    return requests.Session()
+
+
+def print_table(rows, columns):
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
@@ -0,0 +1,225 @@
+"""
+Seeds MongoDB with synthetic but realistic cases and incident reports (Faker).
+
+Documents are written straight to the collections the API reads (in batches,
+bypassing the API so a million documents take minutes, not hours), then the
+analytics rollups are rebuilt. Seeding tops up: running it again with a larger
+--cases / --reports only adds the missing generated documents.
+
+    python -m benchmarks.generate_data --cases 100000 --reports 100000
+    python -m benchmarks.generate_data --cases 10000 --reports 10000 --drop   # start from empty collections
+
+Cases go to the API's case database (database/connection.py) and reports to
+MONGODB_URI, read from .env exactly as the API reads it.
+
+--drop deletes every case, status history entry, rollup and incident report,
+so only use it on a benchmark database; it refuses to run against any host
+other than localhost unless --i-know is passed as well. Restart the API after
+seeding reports so the report ID counter is synced past the generated IDs.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from faker import Faker
+from pymongo import MongoClient
+from pymongo.uri_parser import parse_uri
+
+from database.connection import (
+    MONGO_URI, REPORTS_DATABASE_NAME, REPORTS_MONGO_URI, case_collection, case_history_collection, db,
+)
+from database.indexes import INDEX_PLAN
+from database.normalization import case_normalized_fields
+import rebuild_rollups
+
+GENERATOR_TAG = "bench-generator"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+BATCH_SIZE = 5000
+POOL_SIZE = 2000
+START_DATE = datetime(2015, 1, 1)
+END_DATE = datetime(2025, 12, 31)
+
+# Countries the monitor works on; codes Faker has land coordinates for
+COUNTRIES = {
+    "EG": "Egypt", "TN": "Tunisia", "SY": "Syria", "PS": "Palestine", "YE": "Yemen",
+    "IQ": "Iraq", "SD": "Sudan", "LY": "Libya", "MA": "Morocco", "DZ": "Algeria",
+}
+VIOLATION_TYPES = [
+    "arbitrary_arrest", "torture", "enforced_disappearance", "property_destruction",
+    "freedom_of_assembly", "denial_of_humanitarian_access", "freedom_of_expression",
+    "attacks_on_civilians", "forced_displacement", "extrajudicial_killing",
+]
+CASE_STATUSES = (["new", "under_investigation", "resolved", "archived"], [40, 35, 15, 10])
+REPORT_STATUSES = (["new", "in_progress", "resolved", "closed", "on_hold"], [45, 25, 15, 10, 5])
+PRIORITIES = ["low", "medium", "high", "critical"]
+PERPETRATOR_TYPES = ["police", "military_unit", "militia", "security_service", "unknown"]
+
+
+# The incident router's database, on the connection string it reads
+if not REPORTS_MONGO_URI:
+    raise RuntimeError("MONGODB_URI is not set (in the environment or .env); it must point at the API's report database")
+report_client = MongoClient(REPORTS_MONGO_URI)
+report_collection = report_client[REPORTS_DATABASE_NAME]["incident_reports"]
+
+
+class DocumentFactory:
+    """
+    Builds case and report documents shaped like the ones the API stores.
+
+    Faker is slow per call, so text and places are drawn once into pools and
+    sampled with a seeded Random; seeding empty collections with the same
+    seed and sizes yields the same documents.
+    """
+
+    def __init__(self, seed: int = 42):
+        fake = Faker()
+        fake.seed_instance(seed)
+        self.random = random.Random(seed)
+
+        self.places = []
+        for code, name in COUNTRIES.items():
+            for _ in range(POOL_SIZE // len(COUNTRIES)):
+                place = fake.local_latlng(country_code=code)
+                if place:
+                    lat, lon, city = float(place[0]), float(place[1]), place[2]
+                    self.places.append((name, city, lon, lat))
+        self.titles = [fake.sentence(nb_words=6).rstrip(".") for _ in range(POOL_SIZE)]
+        self.descriptions = [fake.paragraph(nb_sentences=4) for _ in range(POOL_SIZE)]
+        self.names = [fake.company() for _ in range(POOL_SIZE // 4)]
+        self.emails = [fake.email() for _ in range(POOL_SIZE // 4)]
+        self.phones = [fake.phone_number() for _ in range(POOL_SIZE // 4)]
+        self.span_seconds = int((END_DATE - START_DATE).total_seconds())
+
+    def _date(self):
+        # Skewed towards recent years, as reporting volume grows
+        fraction = self.random.random() ** 0.6
+        return START_DATE + timedelta(seconds=int(fraction * self.span_seconds))
+
+    def _place(self):
+        country, city, lon, lat = self.random.choice(self.places)
+        # Jitter so points in one city do not share exact coordinates
+        return country, city, round(lon + self.random.uniform(-0.05, 0.05), 5), round(lat + self.random.uniform(-0.05, 0.05), 5)
+
+    def _violations(self):
+        return self.random.sample(VIOLATION_TYPES, self.random.choices([1, 2, 3], [60, 30, 10])[0])
+
+    def case(self, i: int) -> dict:
+        rng = self.random
+        occurred = self._date()
+        reported = occurred + timedelta(days=rng.randint(0, 60))
+        country, city, lon, lat = self._place()
+        case = {
+            "case_id": f"HRM-{occurred.year}-B{i:07d}",
+            "title": rng.choice(self.titles),
+            "description": rng.choice(self.descriptions),
+            "violation_types": self._violations(),
+            "status": rng.choices(*CASE_STATUSES)[0],
+            "priority": rng.choice(PRIORITIES),
+            "location": {
+                "country": country,
+                "region": city,
+                "coordinates": {"type": "Point", "coordinates": [lon, lat]},
+            },
+            "date_occurred": occurred,
+            "date_reported": reported,
+            "victims": [],
+            "perpetrators": [{"name": rng.choice(self.names), "type": rng.choice(PERPETRATOR_TYPES)}
+                             for _ in range(rng.randint(0, 2))],
+            "evidence": [],
+            "created_by": GENERATOR_TAG,
+            "created_at": reported,
+            "updated_at": reported,
+        }
+        case["normalized"] = case_normalized_fields(case)
+        return case
+
+    def report(self, i: int) -> dict:
+        rng = self.random
+        occurred = self._date()
+        created = occurred + timedelta(hours=rng.randint(1, 24 * 14))
+        country, city, lon, lat = self._place()
+        anonymous = rng.random() < 0.4
+        return {
+            "report_id": f"IR-{created.year}-{1000 + i + 1}",
+            "reporter_type": rng.choice(["individual", "organization"]),
+            "anonymous": anonymous,
+            "contact_info": None if anonymous else {
+                "email": rng.choice(self.emails), "phone": rng.choice(self.phones), "preferred_contact": "email",
+            },
+            "incident_details": {
+                "date": occurred,
+                "location": {"country": country, "city": city, "coordinates": {"type": "Point", "coordinates": [lon, lat]}},
+                "description": rng.choice(self.descriptions),
+                "violation_types": self._violations(),
+            },
+            "evidence": [],
+            "status": rng.choices(*REPORT_STATUSES)[0],
+            "assigned_to": None,
+            "source_report_id": f"{GENERATOR_TAG}-{i}",
+            "created_at": created,
+        }
+
+
+def top_up(collection, query: dict, build, target: int, batch_size=BATCH_SIZE, label="documents") -> int:
+    """Inserts generated documents until `query` (the generated ones) matches `target`; returns the number added."""
+    existing = collection.count_documents(query)
+    start = time.perf_counter()
+    for offset in range(existing, target, batch_size):
+        end = min(offset + batch_size, target)
+        collection.insert_many([build(i) for i in range(offset, end)], ordered=False)
+        rate = (end - existing) / (time.perf_counter() - start)
+        print(f"   {label}: {end}/{target} ({rate:,.0f}/s)")
+    return max(0, target - existing)
+
+
+def is_local_uri(uri: str) -> bool:
+    """True if every host of a mongodb:// connection string is this machine (SRV records never are)."""
+    if not uri.startswith("mongodb://"):
+        return False
+    try:
+        hosts = [host for host, _ in parse_uri(uri)["nodelist"]]
+    except Exception:
+        return False
+    return bool(hosts) and all(host in LOCAL_HOSTS for host in hosts)
+
+
+def drop_collections(allow_remote=False):
+    remote = [uri for uri in (MONGO_URI, REPORTS_MONGO_URI) if not is_local_uri(uri)]
+    if remote and not allow_remote:
+        hosts = ", ".join(uri.split("://", 1)[-1].split("@")[-1].split("/")[0] for uri in remote)
+        raise SystemExit(f"❌ Refusing to drop collections on non-local MongoDB ({hosts}); pass --i-know to do it anyway")
+    for collection in (case_collection, case_history_collection, rebuild_rollups.rollup_collection, report_collection):
+        collection.drop()
+    # Dropping removes the indexes the API created at startup
+    for name, collection in (("cases", case_collection), ("case_status_history", case_history_collection),
+                             ("case_rollups", rebuild_rollups.rollup_collection), ("incident_reports", report_collection)):
+        collection.create_indexes(INDEX_PLAN[name])
+
+
+def seed(cases: int, reports: int, drop=False, seed_value=42, batch_size=BATCH_SIZE, allow_remote=False) -> dict:
+    factory = DocumentFactory(seed_value)
+    if drop:
+        print("🗑️ Dropping cases, history, rollups and incident reports")
+        drop_collections(allow_remote)
+
+    added_cases = top_up(case_collection, {"created_by": GENERATOR_TAG}, factory.case, cases, batch_size, "cases")
+    added_reports = top_up(report_collection, {"source_report_id": {"$regex": f"^{GENERATOR_TAG}-"}},
+                           factory.report, reports, batch_size, "reports")
+    if added_cases:
+        rebuild_rollups.rebuild(batch_size=batch_size)
+    print(f"✅ Seeded {added_cases} cases (database {db.name}) and {added_reports} reports (database {REPORTS_DATABASE_NAME})")
+    return {"cases": added_cases, "reports": added_reports}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=10_000)
+    parser.add_argument("--reports", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--drop", action="store_true", help="Delete all cases and reports first (benchmark databases only)")
+    parser.add_argument("--i-know", action="store_true", help="Allow --drop on a MongoDB that is not on localhost")
+    args = parser.parse_args()
+    seed(args.cases, args.reports, drop=args.drop, seed_value=args.seed, batch_size=args.batch_size,
+         allow_remote=args.i_know)
@@ -0,0 +1,91 @@
+import asyncio
+import bisect
+from datetime import datetime, timedelta
+
+from database.connection import async_db
+from utils.serialization import dumps
+
+meta_collection = async_db["meta"]
+
+CASE_INDEX_META_ID = "case_index"
+CASE_INDEX_FIELDS = {"_id": 0, "case_id": 1, "title": 1, "status": 1}
+# Covering indexes (see database/indexes.py) for the full and the delta read
+CASE_INDEX_HINT = "case_index_covering"
+CASE_INDEX_DELTA_HINT = "updated_at_case_index"
+# Writes from other API processes can commit with an updated_at slightly older
+# than this worker's last sync (clock skew, slow requests), so deltas overlap
+CASE_INDEX_DELTA_OVERLAP = timedelta(seconds=60)
+
+
+async def bump_case_index_version(full_rebuild: bool = False):
+    """
+    Call after any write that adds a case or changes its id, title or status.
+    Pass full_rebuild=True when an entry was renamed or removed, which the
+    updated_at delta read cannot see.
+    """
+    increments = {"version": 1, "generation": 1} if full_rebuild else {"version": 1}
+    await meta_collection.update_one({"_id": CASE_INDEX_META_ID}, {"$inc": increments}, upsert=True)
+
+
+async def current_case_index_version():
+    """Returns (version, generation); the generation only moves on full_rebuild bumps."""
+    meta = await meta_collection.find_one({"_id": CASE_INDEX_META_ID}, {"version": 1, "generation": 1})
+    if not meta:
+        return 0, 0
+    return meta.get("version", 0), meta.get("generation", 0)
+
+
+class CaseIndexCache:
+    """
+    Serialized case index of the latest version seen by this worker.
+
+    Nothing is read while the version in the meta collection stays the same.
+    When it moves, only the cases updated since the last sync are read (a
+    covered query on updated_at) and merged into the entries kept here; the
+    whole list is read again only when the generation moves. Entries are kept
+    serialized and in case_id order, so building the body is one join.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.version = None
+        self.generation = None
+        self.synced_at = None
+        self.entries = {}
+        self.order = []
+        self.body = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, version: int, generation: int = 0) -> bytes:
+        if self.version == version:
+            return self.body
+        async with self._lock:
+            if self.version != version:
+                started = datetime.utcnow()
+                if self.generation != generation or self.synced_at is None:
+                    await self._load_all()
+                else:
+                    await self._load_changed(self.synced_at - CASE_INDEX_DELTA_OVERLAP)
+                self.synced_at = started
+                self.generation = generation
+                self.body = (b'{"version":' + str(version).encode() + b',"cases":['
+                             + b",".join(self.entries[case_id] for case_id in self.order) + b"]}")
+                self.version = version
+        return self.body
+
+    async def _load_all(self):
+        cases = await (
+            self.collection.find({}, CASE_INDEX_FIELDS)
+            .sort("case_id", 1)
+            .hint(CASE_INDEX_HINT)
+            .to_list(length=None)
+        )
+        self.entries = {case["case_id"]: dumps(case) for case in cases}
+        self.order = list(self.entries)
+
+    async def _load_changed(self, since: datetime):
+        cursor = self.collection.find({"updated_at": {"$gte": since}}, CASE_INDEX_FIELDS).hint(CASE_INDEX_DELTA_HINT)
+        async for case in cursor:
+            if case["case_id"] not in self.entries:
+                bisect.insort(self.order, case["case_id"])
+            self.entries[case["case_id"]] = dumps(case)
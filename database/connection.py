@@ -1,11 +1,32 @@
+import os
+
+from dotenv import load_dotenv
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 
 MONGO_URI = "mongodb://localhost:27017"
+DATABASE_NAME = "human_rights_db"
 
+# Blocking client: scripts and sync route handlers
 client = MongoClient(MONGO_URI)
 
-db = client["human_rights_db"]
+db = client[DATABASE_NAME]
 
 case_collection = db["cases"]
 
-case_history_collection = db["case_status_history"]
\ No newline at end of file
+case_history_collection = db["case_status_history"]
+
+# Non-blocking client: async route handlers
+async_client = AsyncIOMotorClient(MONGO_URI)
+
+async_db = async_client[DATABASE_NAME]
+
+async_case_collection = async_db["cases"]
+
+async_case_history_collection = async_db["case_status_history"]
+
+# Incident reports live in their own database, on the connection string in
+# MONGODB_URI (.env); the incident router and the benchmark seeding both use it
+load_dotenv()
+REPORTS_MONGO_URI = os.getenv("MONGODB_URI")
+REPORTS_DATABASE_NAME = "human_rights_monitor"
@@ -0,0 +1,68 @@
+import asyncio
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+class SequenceAllocator:
+    """
+    Hands out increasing integers per named sequence from a counters collection.
+
+    Each allocation is one atomic $inc on the sequence's counter document
+    ({"_id": name, "seq": last issued}), so concurrent requests and workers
+    never receive the same value and the cost does not grow with the number of
+    values issued. With block_size > 1 a worker leases that many values per
+    round trip and serves them from memory; values still leased when the
+    process stops are skipped, never reused.
+    """
+
+    def __init__(self, collection, block_size: int = 1):
+        self.collection = collection
+        self.block_size = max(1, block_size)
+        self._leases = {}  # name -> [next value, last leased value]
+        self._locks = {}
+
+    async def next(self, name: str) -> int:
+        if self.block_size == 1:
+            return await self._reserve(name, 1)
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            lease = self._leases.get(name)
+            if lease is None or lease[0] > lease[1]:
+                last = await self._reserve(name, self.block_size)
+                lease = [last - self.block_size + 1, last]
+                self._leases[name] = lease
+            value = lease[0]
+            lease[0] += 1
+            return value
+
+    async def next_many(self, name: str, count: int) -> range:
+        """Reserves `count` consecutive values with a single $inc (bulk imports)."""
+        if count <= 0:
+            return range(0)
+        last = await self._reserve(name, count)
+        return range(last - count + 1, last + 1)
+
+    async def _reserve(self, name: str, count: int) -> int:
+        """Advances the counter by `count` and returns its new value, the last one reserved."""
+        for attempt in range(2):
+            try:
+                counter = await self.collection.find_one_and_update(
+                    {"_id": name},
+                    {"$inc": {"seq": count}},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+                return counter["seq"]
+            except DuplicateKeyError:
+                # Two first-time upserts raced; the counter exists now, so retry once
+                if attempt:
+                    raise
+
+    async def ensure_at_least(self, name: str, value: int):
+        """Raises the counter to `value` if it is lower; never moves it backwards."""
+        try:
+            await self.collection.update_one({"_id": name}, {"$max": {"seq": value}}, upsert=True)
+        except DuplicateKeyError:
+            await self.collection.update_one({"_id": name}, {"$max": {"seq": value}})
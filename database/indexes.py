@@ -0,0 +1,128 @@
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from pymongo.errors import OperationFailure
+
+# -------------------------------
+# Index declarations per collection
+# -------------------------------
+# Every query shape used by the routers should be backed by one of these.
+INDEX_PLAN = {
+    "cases": [
+        # GET/PATCH/DELETE /cases/{case_id}, duplicate check on create
+        IndexModel([("case_id", ASCENDING)], name="case_id_unique", unique=True),
+        # Covers GET /cases/index (case_id, title, status only)
+        IndexModel([("case_id", ASCENDING), ("title", ASCENDING), ("status", ASCENDING)], name="case_index_covering"),
+        # Covers the GET /cases/index delta read (cases updated since the last sync)
+        IndexModel([("updated_at", ASCENDING), ("case_id", ASCENDING), ("title", ASCENDING), ("status", ASCENDING)],
+                   name="updated_at_case_index"),
+        # GET /cases/suggest: anchored prefix on case_id / title, covered (no document fetch)
+        IndexModel([("normalized.case_id", ASCENDING), ("case_id", ASCENDING), ("title", ASCENDING),
+                    ("status", ASCENDING)], name="normalized_case_id_suggest"),
+        IndexModel([("normalized.title", ASCENDING), ("case_id", ASCENDING), ("title", ASCENDING),
+                    ("status", ASCENDING)], name="normalized_title_suggest"),
+        # Keyset pagination and date_occurred range filters
+        IndexModel([("date_occurred", DESCENDING), ("_id", DESCENDING)], name="date_occurred_id"),
+        # status filter + date range / sort
+        IndexModel([("status", ASCENDING), ("date_occurred", DESCENDING)], name="status_date_occurred"),
+        # Exact/prefix country and violation filters on the normalized shadow fields
+        IndexModel([("normalized.country", ASCENDING), ("date_occurred", DESCENDING)], name="normalized_country_date"),
+        IndexModel([("normalized.violation_types", ASCENDING), ("date_occurred", DESCENDING)], name="normalized_violation_date"),
+        IndexModel([("location.coordinates", GEOSPHERE)], name="location_2dsphere"),
+        # Status history entries not yet copied to case_status_history (startup reconciliation)
+        IndexModel([("pending_history._id", ASCENDING)], name="pending_history_sparse", sparse=True),
+    ],
+    "case_status_history": [
+        # GET /cases/{case_id}/history sorted by updated_at
+        IndexModel([("case_id", ASCENDING), ("updated_at", DESCENDING)], name="case_id_updated_at"),
+        IndexModel([("case_id", ASCENDING), ("version", DESCENDING), ("updated_at", DESCENDING)],
+                   name="case_id_version_updated_at"),
+    ],
+    "incident_reports": [
+        # GET/PATCH /reports/{report_id}, and anchored prefixes for GET /reports/suggest
+        IndexModel([("report_id", ASCENDING)], name="report_id_unique", unique=True),
+        # Re-running an import skips reports already imported from the same partner ID
+        IndexModel([("source_report_id", ASCENDING)], name="source_report_id_unique", unique=True, sparse=True),
+        # GET /reports/ keyset pages on (created_at, _id), newest first; the trailing
+        # incident_details.date lets date-range filters be checked inside the index
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING), ("incident_details.date", DESCENDING)],
+                   name="created_at_id_incident_date"),
+        # status / country equality filters + the same sort
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                   name="status_created_at_id"),
+        IndexModel([("incident_details.location.country", ASCENDING), ("created_at", DESCENDING),
+                    ("_id", DESCENDING)], name="country_created_at_id"),
+        IndexModel([("incident_details.date", DESCENDING)], name="incident_date"),
+        IndexModel([("incident_details.location.coordinates", GEOSPHERE)], name="incident_location_2dsphere"),
+    ],
+    "case_rollups": [
+        # One row per (day, country, violation, status); $inc upserts from the case writes
+        IndexModel([("day", ASCENDING), ("country", ASCENDING), ("violation", ASCENDING), ("status", ASCENDING)],
+                   name="rollup_key_unique", unique=True),
+        # Analytics country filters (exact / prefix) over a day range
+        IndexModel([("country_key", ASCENDING), ("day", ASCENDING)], name="country_key_day"),
+        IndexModel([("violation_key", ASCENDING), ("day", ASCENDING)], name="violation_key_day"),
+    ],
+    "jobs": [
+        # Picking up queued jobs at startup, re-queueing running jobs whose lease expired
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+    ],
+    "geocode_cache": [
+        # Each entry carries its own expiry time
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+
+def _key_of(index_model: IndexModel):
+    return list(index_model.document["key"].items())
+
+
+async def ensure_indexes(collections: dict) -> dict:
+    """
+    Creates every declared index that does not exist yet.
+
+    `collections` maps a name from INDEX_PLAN to its Motor collection.
+    Returns, per collection, the indexes that were created, already present,
+    could not be built ("missing") and existing ones not declared here ("extra").
+    """
+    report = {}
+    for name, collection in collections.items():
+        declared = INDEX_PLAN.get(name, [])
+        existing = await collection.index_information()
+        existing_keys = {tuple(tuple(k) for k in info["key"]): idx_name for idx_name, info in existing.items()}
+
+        result = {"created": [], "present": [], "missing": [], "extra": []}
+        declared_keys = set()
+        for index_model in declared:
+            index_name = index_model.document["name"]
+            key = tuple(_key_of(index_model))
+            declared_keys.add(key)
+
+            if key in existing_keys:
+                existing_name = existing_keys[key]
+                if index_model.document.get("unique") and not existing[existing_name].get("unique"):
+                    result["missing"].append({"name": index_name, "error": f"{existing_name} exists but is not unique"})
+                else:
+                    result["present"].append(existing_name)
+                continue
+            if index_name in existing:
+                result["missing"].append({"name": index_name, "error": "an index with this name has a different key"})
+                continue
+
+            try:
+                await collection.create_indexes([index_model])
+                result["created"].append(index_name)
+            except OperationFailure as e:
+                # e.g. duplicate values for a unique index or invalid GeoJSON
+                result["missing"].append({"name": index_name, "error": str(e)})
+
+        result["extra"] = [idx_name for key, idx_name in existing_keys.items()
+                           if key not in declared_keys and idx_name != "_id_"]
+        report[name] = result
+    return report
+
+
+def print_index_report(report: dict):
+    for name, result in report.items():
+        print(f"🗂️ Indexes on {name}: created={result['created']} present={result['present']}")
+        for missing in result["missing"]:
+            print(f"⚠️ Index {missing['name']} on {name} is missing: {missing['error']}")
@@ -0,0 +1,66 @@
+import re
+import unicodedata
+from typing import Literal, Optional
+
+# How a text filter is matched against a normalized field:
+#   exact    - equality, uses the index
+#   prefix   - anchored regex, uses the index (default)
+#   contains - unanchored substring regex, scans; explicit opt-in only
+MatchMode = Literal["exact", "prefix", "contains"]
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+
+def normalize_term(value) -> Optional[str]:
+    """Case-folds and collapses separators: 'Arbitrary_Detention ' -> 'arbitrary detention'."""
+    if value is None:
+        return None
+    text = unicodedata.normalize("NFKC", str(value)).casefold()
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def normalize_list(values):
+    return [normalize_term(v) for v in values or [] if v]
+
+
+# -------------------------------
+# Shadow fields stored on each case
+# -------------------------------
+def case_normalized_fields(case_data: dict) -> dict:
+    location = case_data.get("location") or {}
+    return {
+        "case_id": normalize_term(case_data.get("case_id")),
+        "title": normalize_term(case_data.get("title")),
+        "country": normalize_term(location.get("country")),
+        "violation_types": normalize_list(case_data.get("violation_types")),
+    }
+
+
+def normalized_updates(updated_data: dict) -> dict:
+    """Returns the `normalized.*` fields to $set alongside a partial case update."""
+    fields = {}
+    for key in ("case_id", "title"):
+        if key in updated_data:
+            fields[f"normalized.{key}"] = normalize_term(updated_data[key])
+
+    if "location" in updated_data:
+        location = updated_data["location"] or {}
+        fields["normalized.country"] = normalize_term(location.get("country"))
+    elif "location.country" in updated_data:
+        fields["normalized.country"] = normalize_term(updated_data["location.country"])
+
+    if "violation_types" in updated_data:
+        fields["normalized.violation_types"] = normalize_list(updated_data["violation_types"])
+    return fields
+
+
+# -------------------------------
+# Query helpers
+# -------------------------------
+def term_condition(value: str, match: MatchMode = "prefix"):
+    term = normalize_term(value)
+    if match == "exact":
+        return term
+    if match == "prefix":
+        return {"$regex": "^" + re.escape(term)}
+    return {"$regex": re.escape(term)}
@@ -0,0 +1,132 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# -------------------------------
+# Keyset cursor tokens
+# -------------------------------
+# Sort values are tagged with their BSON type so legacy documents storing the
+# sort field as a string or number still paginate. Descending sort order of
+# the tagged types: dates, then strings, then numbers, then null/missing.
+CURSOR_TYPES = ("date", "str", "num")
+BSON_TYPES = {"date": "date", "str": "string", "num": "number"}
+
+
+def _tag_value(sort_value):
+    if sort_value is None:
+        return None, None
+    if isinstance(sort_value, datetime):
+        return "date", sort_value.isoformat()
+    if isinstance(sort_value, str):
+        return "str", sort_value
+    if isinstance(sort_value, (int, float)) and not isinstance(sort_value, bool):
+        return "num", sort_value
+    raise TypeError(f"Unsupported sort value type: {type(sort_value).__name__}")
+
+
+def _untag_value(tag, value):
+    if value is None:
+        return None, None
+    # Tokens issued before type tags only held dates
+    tag = tag or "date"
+    if tag == "date":
+        return tag, datetime.fromisoformat(value)
+    if tag == "str" and isinstance(value, str):
+        return tag, value
+    if tag == "num" and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return tag, value
+    raise ValueError(f"Bad cursor value for type {tag}")
+
+
+def encode_cursor(sort_value, doc_id) -> str:
+    tag, value = _tag_value(sort_value)
+    payload = {"v": value, "id": str(doc_id)}
+    if tag and tag != "date":
+        payload["t"] = tag
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Returns (type tag, sort value, _id); the tag is None for null sort values."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        tag, sort_value = _untag_value(payload.get("t"), payload.get("v"))
+        return tag, sort_value, ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, AttributeError, InvalidId) as e:
+        raise InvalidCursor(f"Invalid pagination cursor: {token}") from e
+
+
+# -------------------------------
+# Query helpers
+# -------------------------------
+def keyset_filter(sort_field: str, cursor: Optional[str]) -> dict:
+    """
+    Returns the filter selecting documents strictly after the cursor position
+    when sorting by (sort_field, _id) descending.
+    """
+    if not cursor:
+        return {}
+
+    tag, sort_value, doc_id = decode_cursor(cursor)
+    if tag is None:
+        return {sort_field: None, "_id": {"$lt": doc_id}}
+
+    # $lt only compares values of the same type, so every type sorting below
+    # the cursor's is selected explicitly; null/missing values come last
+    conditions = [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, "_id": {"$lt": doc_id}},
+    ]
+    for lower in CURSOR_TYPES[CURSOR_TYPES.index(tag) + 1:]:
+        conditions.append({sort_field: {"$type": BSON_TYPES[lower]}})
+    conditions.append({sort_field: None})
+    return {"$or": conditions}
+
+
+def keyset_sort(sort_field: str):
+    return [(sort_field, -1), ("_id", -1)]
+
+
+def merge_filters(*filters: dict) -> dict:
+    filters = [f for f in filters if f]
+    if not filters:
+        return {}
+    if len(filters) == 1:
+        return filters[0]
+    return {"$and": filters}
+
+
+def parse_projection(fields: Optional[str], required=(), hidden=()) -> Optional[dict]:
+    """
+    Turns a comma-separated `fields=` query value into a Mongo projection.
+    Fields listed in `required` are always included so the caller can build cursors;
+    fields listed in `hidden` are internal, excluded by default and cannot be requested.
+    """
+    if not fields:
+        return {name: 0 for name in hidden} or None
+
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    for name in names:
+        if name.startswith("$") or not all(part.isidentifier() for part in name.split(".")):
+            raise ValueError(f"Invalid field name: {name}")
+        if name.split(".")[0] in hidden:
+            raise ValueError(f"Field not available: {name}")
+
+    projection = {name: 1 for name in names}
+    for name in required:
+        projection.setdefault(name, 1)
+    return projection
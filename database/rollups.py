@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta, timezone
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from database.connection import async_db
+from database.normalization import normalize_term
+
+rollup_collection = async_db["case_rollups"]
+
+# Case fields a rollup row is derived from
+ROLLUP_FIELDS = {"date_occurred": 1, "location.country": 1, "violation_types": 1, "status": 1}
+ROLLUP_KEY_FIELDS = ("day", "country", "violation", "status")
+DUPLICATE_KEY_ERROR = 11000
+
+
+# -------------------------------
+# Rows per case
+# -------------------------------
+# Every case adds to the row (day, country, violation=None, status) and to
+# (day, country, violation, status) per violation type it lists. Rows hold the
+# raw country / violation labels the charts display plus their normalized
+# forms for the filters, and two counters:
+#   count - occurrences, what $unwind of violation_types yields (pie chart)
+#   cases - distinct cases; spellings of one violation type in the same case
+#           ("Torture", "torture") add to it once (country and timeline charts)
+def rollup_day(value):
+    """Midnight (UTC, naive) of the day a datetime falls on; None for anything else."""
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime(value.year, value.month, value.day)
+
+
+def case_rollup_counts(case: dict) -> dict:
+    """{(day, country, violation, status): (count, cases)} a case contributes."""
+    location = case.get("location") or {}
+    day, country, status = rollup_day(case.get("date_occurred")), location.get("country"), case.get("status")
+
+    counts = {(day, country, None, status): (1, 1)}
+    seen = set()
+    for violation in case.get("violation_types") or []:
+        if not violation:
+            continue
+        key = (day, country, violation, status)
+        term = normalize_term(violation)
+        count, cases = counts.get(key, (0, 0))
+        counts[key] = (count + 1, cases + (term not in seen))
+        seen.add(term)
+    return counts
+
+
+def add_counts(totals: dict, counts: dict, sign: int = 1):
+    for key, (count, cases) in counts.items():
+        total = totals.get(key, (0, 0))
+        totals[key] = (total[0] + sign * count, total[1] + sign * cases)
+
+
+def rollup_deltas(before: dict = None, after: dict = None) -> dict:
+    """Counter changes turning the rows of `before` into those of `after` (either may be None)."""
+    deltas = {}
+    if before:
+        add_counts(deltas, case_rollup_counts(before), -1)
+    if after:
+        add_counts(deltas, case_rollup_counts(after))
+    return {key: delta for key, delta in deltas.items() if delta != (0, 0)}
+
+
+def rollup_filter(key: tuple) -> dict:
+    return dict(zip(ROLLUP_KEY_FIELDS, key))
+
+
+def rollup_operations(deltas: dict) -> list:
+    return [
+        UpdateOne(
+            rollup_filter(key),
+            {"$inc": {"count": delta[0], "cases": delta[1]},
+             "$setOnInsert": {"country_key": normalize_term(key[1]), "violation_key": normalize_term(key[2])}},
+            upsert=True,
+        )
+        for key, delta in deltas.items()
+    ]
+
+
+def emptied_rows_filter(deltas: dict) -> dict:
+    """Rows a decrement may have brought to zero; they are deleted to keep the collection small."""
+    decremented = [rollup_filter(key) for key, delta in deltas.items() if delta[0] < 0]
+    return {"$or": decremented, "count": {"$lte": 0}} if decremented else None
+
+
+# -------------------------------
+# Writes
+# -------------------------------
+async def apply_rollup_deltas(deltas: dict, collection=rollup_collection):
+    if not deltas:
+        return
+    operations = rollup_operations(deltas)
+    try:
+        await collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # Two first-time upserts of one row raced; the row exists now, so retry those once
+        retry = [operations[error["index"]] for error in e.details.get("writeErrors", [])
+                 if error.get("code") == DUPLICATE_KEY_ERROR]
+        if len(retry) < len(e.details.get("writeErrors", [])):
+            raise
+        await collection.bulk_write(retry, ordered=False)
+
+    emptied = emptied_rows_filter(deltas)
+    if emptied:
+        await collection.delete_many(emptied)
+
+
+async def record_rollup_deltas(deltas: dict):
+    """
+    Applies count changes computed from case writes.
+
+    Call after the case write succeeded. A failure here is logged rather than
+    raised, since the case itself is saved; rebuild_rollups.py repairs the drift.
+    """
+    try:
+        await apply_rollup_deltas(deltas)
+    except Exception as e:
+        print("❌ Error updating case rollups:", e)
+
+
+async def record_case_change(before: dict = None, after: dict = None):
+    """Moves the rollup counts of a case from its `before` to its `after` state."""
+    await record_rollup_deltas(rollup_deltas(before, after))
+
+
+# -------------------------------
+# Date ranges
+# -------------------------------
+def _as_utc(value):
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def split_date_range(date_from, date_to):
+    """
+    Splits an inclusive [date_from, date_to] filter into whole days and partial days.
+
+    Returns (condition on the rollup `day`, or None when no whole day is
+    covered; list of date_occurred conditions for the partial days at either
+    end, which are counted from the cases themselves).
+    """
+    date_from, date_to = _as_utc(date_from), _as_utc(date_to)
+    first_day = None
+    if date_from is not None:
+        first_day = rollup_day(date_from)
+        if first_day != date_from:
+            first_day += timedelta(days=1)
+    # date_to is inclusive: the day it falls on is only complete up to date_to
+    end_day = rollup_day(date_to) if date_to is not None else None
+
+    if first_day is not None and end_day is not None and first_day >= end_day:
+        return None, [{"$gte": date_from, "$lte": date_to}]
+
+    days, edges = {}, []
+    if date_from is not None:
+        days["$gte"] = first_day
+        if first_day != date_from:
+            edges.append({"$gte": date_from, "$lt": first_day})
+    if date_to is not None:
+        days["$lt"] = end_day
+        edges.append({"$gte": end_day, "$lte": date_to})
+    return days, edges
@@ -16,6 +16,13 @@ def show():
             selected_violation = st.text_input("Filter by Violation Type:")
         with col3:
             date_range = st.date_input("Date Range (from - to)", [])
+        col4, col5, col6 = st.columns(3)
+        with col4:
+            granularity = st.selectbox("Timeline granularity", ["month", "week", "day", "quarter", "year"])
+        with col5:
+            breakdown = st.selectbox("Timeline breakdown", ["none", "violation", "country"])
+        with col6:
+            tz = st.text_input("Time zone", value="UTC")
 
     params = {}
     if selected_country:
@@ -26,12 +33,22 @@ def show():
         params["date_from"] = date_range[0].isoformat()
         params["date_to"] = date_range[1].isoformat()
 
+    # ----- All series in one request -----
+    dashboard_params = {**params, "granularity": granularity, "tz": tz}
+    if breakdown != "none":
+        dashboard_params["breakdown"] = breakdown
+    try:
+        response = requests.get("http://127.0.0.1:8000/api/analytics/dashboard", params=dashboard_params)
+        response.raise_for_status()
+        dashboard = response.json()
+    except Exception as e:
+        st.error(f"Error loading dashboard data: {e}")
+        return
+
     # ----- Pie Chart: Violation Types -----
     st.markdown("### 🧯 Violation Types Distribution")
     try:
-        response = requests.get("http://127.0.0.1:8000/api/analytics/violations", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = dashboard["violations"]
         df = pd.DataFrame({"Violation": list(data.keys()), "Count": list(data.values())})
         fig = px.pie(df, names="Violation", values="Count", hole=0.4)
         st.plotly_chart(fig, use_container_width=True)
@@ -41,10 +58,7 @@ def show():
     # ----- Bar Chart: Cases by Country -----
     st.markdown("### 🌍 Cases by Country")
     try:
-        response = requests.get("http://127.0.0.1:8000/api/analytics/geodata", params=params)
-        response.raise_for_status()
-        data = response.json()
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(dashboard["countries"])
         fig = px.bar(df, x="country", y="count", color="country", title="Cases by Country")
         st.plotly_chart(fig, use_container_width=True)
     except Exception as e:
@@ -53,51 +67,61 @@ def show():
     # ----- Line Chart: Cases Over Time -----
     st.markdown("### 📆 Cases Over Time")
     try:
-        response = requests.get("http://127.0.0.1:8000/api/analytics/timeline", params=params)
-        response.raise_for_status()
-        data = response.json()
-        df = pd.DataFrame(data)
-        fig = px.line(df, x="date", y="count", markers=True, title="Cases by Month")
+        df = pd.DataFrame(dashboard["timeline"])
+        if breakdown == "none":
+            fig = px.line(df, x="date", y="count", markers=True, title=f"Cases by {granularity.capitalize()}")
+        else:
+            # One series per violation type / country, gap-filled on the server
+            fig = px.line(df, x="date", y="count", color="series", markers=True,
+                          title=f"Cases by {granularity.capitalize()} and {breakdown.capitalize()}")
         st.plotly_chart(fig, use_container_width=True)
     except Exception as e:
         st.error(f"Error loading timeline: {e}")
 
+    cases = dashboard["cases"]
+    if dashboard["cases_truncated"]:
+        st.info(f"The export holds the {len(cases)} most recent of {dashboard['total']} matching cases.")
+
     # ----- Map -----
     st.markdown("### 🗺️ Geographic Map of Cases")
     try:
-        response = requests.get("http://127.0.0.1:8000/api/cases", params=params)
+        # Clustered on the server; single cases appear from zoom 10 on
+        zoom = st.slider("Map detail (zoom level)", min_value=1, max_value=14, value=2)
+        map_url = "http://127.0.0.1:8000/api/analytics/map"
+        map_params = {**params, "zoom": zoom}
+        if zoom > 2:
+            # Only the viewport around the cases' centroid is clustered in detail
+            overview = requests.get(map_url, params={**params, "zoom": 0})
+            overview.raise_for_status()
+            clusters = overview.json()["items"]
+            if clusters:
+                total = sum(item["count"] for item in clusters)
+                lat = sum(item["lat"] * item["count"] for item in clusters) / total
+                lon = sum(item["lon"] * item["count"] for item in clusters) / total
+                half_lon, half_lat = 720 / 2 ** zoom, 360 / 2 ** zoom
+                west, east = (lon - half_lon + 180) % 360 - 180, (lon + half_lon + 180) % 360 - 180
+                south, north = max(lat - half_lat, -90), min(lat + half_lat, 90)
+                map_params["bbox"] = f"{west},{south},{east},{north}"
+        response = requests.get(map_url, params=map_params)
         response.raise_for_status()
-        data = response.json()
-        locations = []
-
-        if isinstance(data, list):
-            for case in data:
-                if not isinstance(case, dict):
-                    continue
-                location = case.get("location", {})
-                coordinates = location.get("coordinates", [])
-                coords = []
+        items = response.json()["items"]
 
-                # ✅ التعامل مع coordinate كـ dict أو list
-                if isinstance(coordinates, dict):
-                    coords = coordinates.get("coordinates", [])
-                elif isinstance(coordinates, list):
-                    coords = coordinates
-
-                if isinstance(coords, list) and len(coords) == 2:
-                    locations.append({
-                        "case_id": case.get("case_id", ""),
-                        "title": case.get("title", ""),
-                        "lon": coords[0],
-                        "lat": coords[1],
-                        "status": case.get("status", "unknown")
-                    })
-
-        df_map = pd.DataFrame(locations)
+        df_map = pd.DataFrame([{
+            "lat": item["lat"],
+            "lon": item["lon"],
+            "count": item["count"],
+            "title": item.get("title") if item["type"] == "point" else f"{item['count']} cases",
+            "case_id": item.get("case_id", ""),
+            "status": item.get("status", "cluster") if item["type"] == "point" else "cluster",
+        } for item in items])
         if not df_map.empty:
-            fig = px.scatter_mapbox(df_map, lat="lat", lon="lon", hover_name="title",
-                                    hover_data=["case_id", "status"],
-                                    color="status", zoom=2, height=500)
+            center = {
+                "lat": (df_map["lat"] * df_map["count"]).sum() / df_map["count"].sum(),
+                "lon": (df_map["lon"] * df_map["count"]).sum() / df_map["count"].sum(),
+            }
+            fig = px.scatter_mapbox(df_map, lat="lat", lon="lon", size="count", hover_name="title",
+                                    hover_data=["case_id", "count"],
+                                    color="status", zoom=zoom, center=center, height=500)
             fig.update_layout(mapbox_style="open-street-map")
             st.plotly_chart(fig, use_container_width=True)
         else:
@@ -108,10 +132,7 @@ def show():
     # ----- Export to Excel -----
     st.markdown("### 📥 Export Case Data to Excel")
     try:
-        response = requests.get("http://127.0.0.1:8000/api/cases", params=params)
-        response.raise_for_status()
-        data = response.json()
-        df = pd.DataFrame(data)
+        df = pd.DataFrame(cases)
         if not df.empty:
             export_df = df[["case_id", "title", "status", "priority", "violation_types", "location", "date_occurred"]] \
                 if all(col in df.columns for col in ["case_id", "title", "status", "priority", "violation_types", "location", "date_occurred"]) \
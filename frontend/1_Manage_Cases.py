@@ -3,6 +3,8 @@ import requests
 import pandas as pd
 from datetime import date
 
+PAGE_SIZE = 100
+
 def show():
     # st.set_page_config(page_title="All Cases", layout="wide")
     st.title("📋 All Registered Cases")
@@ -43,23 +45,41 @@ def show():
     if search_query:
         params["query_text"] = search_query
 
-    # Fetch and display cases
+    # Fetch and display cases, one page at a time (newest first)
     try:
-        response = requests.get(base_url, params=params)
-        if response.status_code == 200:
-            cases = response.json()
-            if cases:
-                for case in cases:
-                    loc = case.get("location", {})
-                    case["country"] = loc.get("country", "")
-                    case["region"] = loc.get("region", "")
-                    case["violations"] = ", ".join(case.get("violation_types", []))
-                df = pd.DataFrame(cases)
-                df_display = df[["case_id", "title", "status", "priority", "country", "region", "violations", "date_occurred"]]
-                st.dataframe(df_display, use_container_width=True)
-            else:
-                st.warning("No matching cases found.")
+        # The first page is re-read on every run, like before; pages loaded with
+        # "Load more" are kept until the filters change
+        listing = st.session_state.get("case_listing")
+        if listing is None or listing["params"] != params or listing["pages"] == 1:
+            response = requests.get(base_url, params={**params, "limit": PAGE_SIZE})
+            if response.status_code != 200:
+                st.error(f"❌ Failed to fetch cases. Status code: {response.status_code}")
+                return
+            listing = st.session_state["case_listing"] = {
+                "params": params, "cases": response.json(), "cursor": response.headers.get("X-Next-Cursor"), "pages": 1,
+            }
+
+        cases = [dict(case) for case in listing["cases"]]
+        if cases:
+            for case in cases:
+                loc = case.get("location", {})
+                case["country"] = loc.get("country", "")
+                case["region"] = loc.get("region", "")
+                case["violations"] = ", ".join(case.get("violation_types", []))
+            df = pd.DataFrame(cases)
+            df_display = df[["case_id", "title", "status", "priority", "country", "region", "violations", "date_occurred"]]
+            st.dataframe(df_display, use_container_width=True)
         else:
-            st.error(f"❌ Failed to fetch cases. Status code: {response.status_code}")
+            st.warning("No matching cases found.")
+
+        if listing["cursor"] and st.button(f"⬇️ Load {PAGE_SIZE} more cases"):
+            response = requests.get(base_url, params={**params, "limit": PAGE_SIZE, "cursor": listing["cursor"]})
+            if response.status_code != 200:
+                st.error(f"❌ Failed to fetch cases. Status code: {response.status_code}")
+                return
+            listing["cases"] += response.json()
+            listing["cursor"] = response.headers.get("X-Next-Cursor")
+            listing["pages"] += 1
+            st.rerun()
     except Exception as e:
         st.error(f"🔌 Error connecting to the API: {e}")
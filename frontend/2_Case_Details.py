@@ -1,19 +1,25 @@
 import streamlit as st
 import requests
+from frontend.api_cache import get_json
 
 def show():
     st.title("📄 View Case Details")
 
-    # Step 1: Fetch all cases for dropdown
+    # Step 1: Search cases by ID or title
+    query = st.text_input("🔎 Search by case ID or title", placeholder="e.g. HRM-2023 or Forced displacement")
+    if not query.strip():
+        st.info("Type the beginning of a case ID or title to find a case.")
+        st.stop()
+
     try:
-        case_list_response = requests.get("http://localhost:8000/api/cases")
-        if case_list_response.status_code != 200:
-            st.error("❌ Failed to load case list.")
-            st.stop()
-        all_cases = case_list_response.json()
-        case_options = [f"{case['case_id']} — {case['title']}" for case in all_cases]
+        matches = get_json("http://localhost:8000/api/cases/suggest", params={"q": query, "limit": 20})
+        case_options = [f"{case['case_id']} — {case['title']}" for case in matches]
     except Exception as e:
-        st.error(f"🔌 Error loading case list: {e}")
+        st.error(f"🔌 Error searching cases: {e}")
+        st.stop()
+
+    if not case_options:
+        st.warning("No cases match your search.")
         st.stop()
 
     # Step 2: Select case from dropdown
@@ -22,11 +28,10 @@ def show():
 
     # Step 3: Fetch selected case details
     try:
-        case_response = requests.get(f"http://localhost:8000/api/cases/{selected_case_id}")
-        if case_response.status_code != 200:
-            st.error("❌ Failed to load case details.")
-            st.stop()
-        case = case_response.json()
+        case = get_json(f"http://localhost:8000/api/cases/{selected_case_id}")
+    except requests.HTTPError:
+        st.error("❌ Failed to load case details.")
+        st.stop()
     except Exception as e:
         st.error(f"🔌 Failed to connect to server: {e}")
         st.stop()
@@ -56,6 +61,8 @@ def show():
         for ev in evidence_list:
             full_url = base_url + ev["url"]
             st.markdown(f"- `{ev['type']}`: [{ev['description']}]({full_url})")
+            if ev.get("thumbnail_url"):
+                st.image(base_url + ev["thumbnail_url"], width=200)
 
     # Step 5: Status history
     st.markdown("---")
@@ -1,18 +1,26 @@
 import streamlit as st
 import requests
+from frontend.api_cache import get_json
 from datetime import datetime, date
 
 def show():
     st.title("🛠️ Edit Existing Human Rights Case")
 
-    # Step 1: Fetch list of cases for dropdown
+    # Step 1: Search cases by ID or title
+    query = st.text_input("🔎 Search by case ID or title", placeholder="e.g. HRM-2023 or Forced displacement")
+    if not query.strip():
+        st.info("Type the beginning of a case ID or title to find a case.")
+        st.stop()
+
     try:
-        list_response = requests.get("http://localhost:8000/api/cases")
-        list_response.raise_for_status()
-        all_cases = list_response.json()
-        case_options = [f"{c['case_id']} — {c['title']}" for c in all_cases]
+        matches = get_json("http://localhost:8000/api/cases/suggest", params={"q": query, "limit": 20})
+        case_options = [f"{c['case_id']} — {c['title']}" for c in matches]
     except Exception as e:
-        st.error(f"❌ Failed to fetch case list: {e}")
+        st.error(f"❌ Failed to search cases: {e}")
+        st.stop()
+
+    if not case_options:
+        st.warning("No cases match your search.")
         st.stop()
 
     selected_label = st.selectbox("Select a case to edit", case_options)
@@ -20,9 +28,7 @@ def show():
 
     # Step 2: Fetch selected case details
     try:
-        case_response = requests.get(f"http://localhost:8000/api/cases/{selected_case_id}")
-        case_response.raise_for_status()
-        case = case_response.json()
+        case = get_json(f"http://localhost:8000/api/cases/{selected_case_id}")
     except Exception as e:
         st.error(f"❌ Failed to fetch case data: {e}")
         st.stop()
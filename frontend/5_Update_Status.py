@@ -1,14 +1,13 @@
 import streamlit as st
 import requests
+from frontend.api_cache import get_json
 
 def show():
     st.title("🔄 Change Case Status")
 
     # Step 1: Get list of case IDs from backend
     try:
-        response = requests.get("http://127.0.0.1:8000/api/cases")
-        response.raise_for_status()
-        cases = response.json()
+        cases = get_json("http://127.0.0.1:8000/api/cases/index")["cases"]
         case_ids = [case["case_id"] for case in cases]
     except Exception as e:
         st.error(f"❌ Failed to fetch cases: {e}")
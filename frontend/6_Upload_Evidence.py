@@ -1,14 +1,13 @@
 import streamlit as st
 import requests
+from frontend.api_cache import get_json
 
 def show():
     st.title("📁 Upload Evidence File to a Case")
 
     # Step 1: Load all case IDs from API
     try:
-        response = requests.get("http://127.0.0.1:8000/api/cases")
-        response.raise_for_status()
-        cases = response.json()
+        cases = get_json("http://127.0.0.1:8000/api/cases/index")["cases"]
         case_ids = sorted({case["case_id"] for case in cases})
     except Exception as e:
         st.error(f"❌ Failed to fetch cases: {e}")
@@ -35,6 +34,7 @@ def show():
                     patch_url = f"http://127.0.0.1:8000/api/cases/{selected_case_id}"
                     patch_data = {
                         "evidence": [{
+                            **file_info,
                             "type": file_type,
                             "url": file_info.get("url", ""),
                             "description": description or file_info.get("description", "")
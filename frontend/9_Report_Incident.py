@@ -119,22 +119,24 @@ if menu == "Submit Report":
             st.toast("Location updated from map click!")
             st.session_state.map_clicked_recently = True
             try:
-                location_from_coords = geolocator.reverse((st.session_state.lat, st.session_state.lon), timeout=20)
-                if location_from_coords and location_from_coords.address:
-                    address_parts = location_from_coords.raw.get('address', {})
-                    detected_country = address_parts.get('country')
-                    detected_city = address_parts.get('city') or address_parts.get('town') or address_parts.get('village')
-                    
-                    if detected_country:
-                        st.session_state.country_display_value = detected_country
-                    if detected_city:
-                        st.session_state.city_display_value = detected_city
-                    else:
-                        st.session_state.city_display_value = ""
-                else: 
+                # Resolved by the backend, which caches results and can work offline
+                geo_response = requests.get(
+                    f"{API_URL}/geocode/reverse",
+                    params={"latitude": st.session_state.lat, "longitude": st.session_state.lon},
+                    timeout=20,
+                )
+                geo_response.raise_for_status()
+                place = geo_response.json()
+                detected_country = place.get("country")
+                detected_city = place.get("city")
+
+                if detected_country and detected_country != "Unknown":
+                    st.session_state.country_display_value = detected_country
+                    st.session_state.city_display_value = detected_city or ""
+                else:
                     st.session_state.country_display_value = ""
                     st.session_state.city_display_value = ""
-            except GeocoderTimedOut:
+            except requests.Timeout:
                 st.warning("Reverse geocoder timed out. Could not determine location name from coordinates.")
             except Exception as e:
                 st.warning(f"An error occurred during reverse geocoding: {e}")
@@ -236,7 +238,10 @@ if menu == "Submit Report":
                     # Request to API_URL (which now includes /api)
                     response = requests.post(f"{API_URL}/reports/", data=data, files=files_to_upload)
                     if response.status_code == 201:
-                        status_message_placeholder.success("✅ Report submitted successfully!")
+                        created = response.json()
+                        status_message_placeholder.success(f"✅ Report {created.get('report_id', '')} submitted successfully!")
+                        if created.get("enrichment"):
+                            st.info("📍 Location details and photo previews are being added in the background.")
 
                         st.session_state.lat = 31.9037
                         st.session_state.lon = 35.2163
@@ -285,7 +290,7 @@ elif menu == "View Reports":
 
     filter_country = st.sidebar.text_input("Filter by Country", key="filter_country")
     
-    params = {"limit": 100}
+    params = {"limit": 100, "total": "estimated"}
 
     if filter_status and filter_status != "All":
         params["status"] = filter_status
@@ -299,15 +304,31 @@ elif menu == "View Reports":
     if filter_country:
         params["country"] = filter_country
 
+    # Reports loaded so far for the current filters; "Load more" follows X-Next-Cursor
+    filters_key = tuple(sorted(params.items()))
+    if st.session_state.get("reports_filters") != filters_key:
+        st.session_state.reports_filters = filters_key
+        st.session_state.reports_loaded = None
+
     try:
-        with st.spinner("Fetching reports..."):
-            # Request to API_URL (which now includes /api)
-            response = requests.get(f"{API_URL}/reports/", params=params)
-        
-        if response.ok:
-            reports = response.json()
+        response = None
+        if st.session_state.reports_loaded is None:
+            with st.spinner("Fetching reports..."):
+                # Request to API_URL (which now includes /api)
+                response = requests.get(f"{API_URL}/reports/", params=params)
+            if response.ok:
+                st.session_state.reports_loaded = response.json()
+                st.session_state.reports_next_cursor = response.headers.get("X-Next-Cursor")
+                st.session_state.reports_total = response.headers.get("X-Total-Count")
+                st.session_state.reports_total_exact = response.headers.get("X-Total-Exact") == "true"
+
+        if st.session_state.reports_loaded is not None:
+            reports = st.session_state.reports_loaded
             if not reports:
                 st.info("No reports found matching the criteria.")
+            elif st.session_state.reports_total:
+                approx = "" if st.session_state.reports_total_exact else "at least "
+                st.caption(f"Showing {len(reports)} of {approx}{st.session_state.reports_total} reports")
             for report in reports:
                 report_id = report.get('report_id', 'N/A')
                 incident_details = report.get('incident_details', {})
@@ -343,6 +364,7 @@ elif menu == "View Reports":
                                 )
                                 if update_response.status_code == 200:
                                     st.success(f"Status for Report {report_id} updated to {new_status}!")
+                                    st.session_state.reports_loaded = None
                                     st.rerun() 
                                 else:
                                     st.error(f"Failed to update status for Report {report_id}: {update_response.status_code} - {update_response.text}")
@@ -373,13 +395,28 @@ elif menu == "View Reports":
                                 # IMPORTANT: Use BASE_BACKEND_URL for static files as they are mounted directly
                                 full_url = f"{BASE_BACKEND_URL}{ev_url}" # <--- التعديل الثاني هنا
                                 if ev_type == "photo":
-                                    st.image(full_url, caption=ev_desc, width=250)
+                                    # Show the small rendering; the original is only fetched when opened
+                                    thumb_url = ev.get('thumbnail_url')
+                                    st.image(f"{BASE_BACKEND_URL}{thumb_url}" if thumb_url else full_url, caption=ev_desc, width=250)
+                                    if thumb_url:
+                                        st.markdown(f"[Open original]({full_url})")
                                 elif ev_type == "video":
                                     st.video(full_url)
                                 else:
                                     st.markdown(f"[{ev_type.capitalize()}]: [{os.path.basename(ev_url)}]({full_url})")
                             else:
                                 st.write(f"[{ev_type.capitalize()}] No URL available.")
+
+            if st.session_state.reports_next_cursor and st.button("⬇️ Load more reports"):
+                with st.spinner("Fetching more reports..."):
+                    more = requests.get(f"{API_URL}/reports/",
+                                        params={**params, "total": None, "cursor": st.session_state.reports_next_cursor})
+                if more.ok:
+                    st.session_state.reports_loaded.extend(more.json())
+                    st.session_state.reports_next_cursor = more.headers.get("X-Next-Cursor")
+                    st.rerun()
+                else:
+                    st.error(f"Failed to fetch more reports. Status code: {more.status_code} - {more.text}")
         else:
             st.error(f"Failed to fetch reports. Status code: {response.status_code} - {response.text}")
     except requests.exceptions.ConnectionError:
@@ -0,0 +1,28 @@
+import requests
+import streamlit as st
+
+
+def get_json(url, params=None):
+    """
+    GET that revalidates with the server instead of downloading again.
+
+    The last response for each URL is kept in the session together with its
+    ETag; when the server answers 304 Not Modified the cached body is reused.
+    """
+    cache = st.session_state.setdefault("_http_cache", {})
+    key = (url, tuple(sorted((params or {}).items())))
+
+    headers = {}
+    if key in cache:
+        headers["If-None-Match"] = cache[key][0]
+
+    response = requests.get(url, params=params, headers=headers)
+    if response.status_code == 304:
+        return cache[key][1]
+    response.raise_for_status()
+
+    data = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        cache[key] = (etag, data)
+    return data
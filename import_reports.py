@@ -0,0 +1,69 @@
+"""
+Imports incident reports from an NDJSON file through POST /api/reports/import.
+
+    python import_reports.py partner_dump.ndjson
+    python import_reports.py partner_dump.ndjson --chunk-size 2000 --api-url http://127.0.0.1:8000
+
+Each line is one report shaped like IncidentReport (report_id optional; a
+supplied one is kept as source_report_id). The file is read lazily and sent in
+chunks, so progress is printed per chunk and errors point at file line numbers.
+Reports whose source_report_id is already stored are skipped, so an interrupted
+import can simply be run again.
+"""
+import argparse
+import sys
+
+import requests
+
+API_URL = "http://127.0.0.1:8000"
+CHUNK_SIZE = 5000
+
+
+def iter_chunks(path, chunk_size):
+    """Yields lists of (file line number, line) with up to `chunk_size` non-blank lines."""
+    chunk = []
+    with open(path, encoding="utf-8") as source:
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            chunk.append((line_number, line.rstrip("\n")))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_file(path, api_url=API_URL, chunk_size=CHUNK_SIZE):
+    totals = {"total": 0, "inserted": 0, "duplicates": 0, "invalid": 0, "failed": 0, "geocoding_queued": 0}
+    for chunk in iter_chunks(path, chunk_size):
+        response = requests.post(
+            f"{api_url}/api/reports/import",
+            data="\n".join(line for _, line in chunk).encode("utf-8"),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        response.raise_for_status()
+        result = response.json()
+        for key in totals:
+            totals[key] += result[key]
+
+        # The API numbers lines within the chunk it received
+        for error in result["errors"]:
+            print(f"   line {chunk[error['line'] - 1][0]}: {error['error']}")
+        if result["errors_truncated"]:
+            print("   (more errors in this chunk were not listed)")
+        print(f"\U0001F4E5 Imported up to line {chunk[-1][0]} - {totals}")
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", help="NDJSON file with one report per line")
+    parser.add_argument("--api-url", default=API_URL)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    totals = import_file(args.file, args.api_url, args.chunk_size)
+    print(f"✅ Done: {totals}")
+    if totals["invalid"] or totals["failed"]:
+        sys.exit(1)
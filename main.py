@@ -1,17 +1,73 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
-from routers.case_routes import router as case_router
+from database.connection import async_case_collection, async_case_history_collection
+from database.indexes import ensure_indexes, print_index_report
+from database.rollups import rollup_collection
+from routers.case_routes import router as case_router, reconcile_status_history
 from routers.analytics_routes import router as analytics_router
-from routers.incident_routes import router as incident_router  
+from routers.incident_routes import (
+    router as incident_router, collection as incident_collection, geocoder, report_jobs, sync_report_id_counter,
+)
+from routers.evidence_routes import router as evidence_router, uploads_router
+from utils.blob_store import blob_store
+from utils.thumbnails import thumbnail_worker
 if not os.path.exists("uploads"):
     os.makedirs("uploads")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Declare and reconcile the indexes the routes rely on
+    try:
+        app.state.index_report = await ensure_indexes({
+            "cases": async_case_collection,
+            "case_status_history": async_case_history_collection,
+            "case_rollups": rollup_collection,
+            "incident_reports": incident_collection,
+            "geocode_cache": geocoder.collection,
+            "jobs": report_jobs.collection,
+        })
+        print_index_report(app.state.index_report)
+    except Exception as e:
+        app.state.index_report = None
+        print("❌ Error while ensuring indexes:", e)
+
+    try:
+        await sync_report_id_counter()
+    except Exception as e:
+        print("❌ Error while syncing the report ID counter:", e)
+
+    # Status transitions interrupted between the case update and the history write
+    try:
+        flushed = await reconcile_status_history()
+        if flushed:
+            print(f"🕓 Recorded {flushed} pending status history entries")
+    except Exception as e:
+        print("❌ Error while reconciling the status history:", e)
+
+    # Analytics read from the rollups; they are only backfilled by the rebuild command
+    try:
+        if not await rollup_collection.find_one({}, {"_id": 1}) and await async_case_collection.find_one({}, {"_id": 1}):
+            print("⚠️ case_rollups is empty; run `python rebuild_rollups.py` for the analytics to count existing cases")
+    except Exception as e:
+        print("❌ Error while checking the case rollups:", e)
+
+    thumbnail_worker.start()
+    await report_jobs.start()
+    blob_store.start_sweeper()
+    yield
+    await blob_store.stop_sweeper()
+    await report_jobs.stop()
+    thumbnail_worker.shutdown()
+
+
 app = FastAPI(
     title="Human Rights Monitor API",
-    description="API for reporting and tracking human rights incidents."
+    description="API for reporting and tracking human rights incidents.",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -19,13 +75,14 @@ app.add_middleware(
     allow_origins=["http://localhost:8501"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Exact", "ETag", "Content-Range", "Accept-Ranges"],
 )
 
 app.include_router(case_router, prefix="/api", tags=["Cases"])
 app.include_router(analytics_router, prefix="/api", tags=["Analytics"])
 app.include_router(incident_router, prefix="/api", tags=["Incident"])
-
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.include_router(evidence_router, prefix="/api", tags=["Evidence"])
+app.include_router(uploads_router, tags=["Evidence"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,49 @@
+"""
+Backfills the `normalized` shadow fields used by the country/violation filters
+and the case_id/title autocomplete.
+
+    python migrate_normalized_fields.py            # only cases missing the fields
+    python migrate_normalized_fields.py --all      # recompute for every case
+"""
+import argparse
+
+from pymongo import UpdateOne
+
+from database.connection import case_collection
+from database.normalization import case_normalized_fields
+
+BATCH_SIZE = 1000
+
+
+def migrate(recompute_all=False, batch_size=BATCH_SIZE):
+    # normalized.case_id was added after the other fields, so it marks up-to-date cases
+    query = {} if recompute_all else {"normalized.case_id": {"$exists": False}}
+    projection = {"case_id": 1, "title": 1, "location.country": 1, "violation_types": 1}
+
+    total = case_collection.count_documents(query)
+    print(f"🔄 Backfilling normalized fields for {total} cases")
+
+    updated, operations = 0, []
+    for case in case_collection.find(query, projection).batch_size(batch_size):
+        operations.append(UpdateOne(
+            {"_id": case["_id"]},
+            {"$set": {"normalized": case_normalized_fields(case)}}
+        ))
+        if len(operations) >= batch_size:
+            updated += case_collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+            print(f"   {updated}/{total}")
+
+    if operations:
+        updated += case_collection.bulk_write(operations, ordered=False).modified_count
+
+    print(f"✅ Done: {updated} cases updated")
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="Recompute the fields for every case")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    migrate(recompute_all=args.all, batch_size=args.batch_size)
@@ -19,6 +19,10 @@ class EvidenceItem(BaseModel):
     url: str
     description: Optional[str] = None
     date_captured: Optional[datetime] = None
+    sha256: Optional[str] = None  # checksum computed while the upload is streamed
+    size: Optional[int] = None  # bytes
+    thumbnail_url: Optional[str] = None  # small WebP rendering for photos
+    preview_url: Optional[str] = None  # screen-sized WebP rendering for photos
 
 
 class Perpetrator(BaseModel):
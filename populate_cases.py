@@ -1,7 +1,11 @@
+import argparse
+import json
 import requests
 from datetime import datetime
 
 API_URL = "http://127.0.0.1:8000/api/cases"
+BULK_API_URL = f"{API_URL}/bulk"
+CHUNK_SIZE = 5000
 
 sample_cases = [
     {
@@ -210,9 +214,73 @@ sample_cases = [
     }
 ]
 
-for case in sample_cases:
-    try:
-        response = requests.post(API_URL, json=case)
-        print(f"\U0001F4E4 Sent: {case['case_id']} - Status: {response.status_code} - {response.json()}")
-    except Exception as e:
-        print(f"\u274C Error sending {case['case_id']}: {e}")
+
+
+def post_one_by_one(cases):
+    for case in cases:
+        try:
+            response = requests.post(API_URL, json=case)
+            print(f"\U0001F4E4 Sent: {case['case_id']} - Status: {response.status_code} - {response.json()}")
+        except Exception as e:
+            print(f"\u274C Error sending {case['case_id']}: {e}")
+
+
+def iter_fixture_lines(path):
+    """Yields one JSON document per line from an NDJSON file or a JSON array file."""
+    with open(path, encoding="utf-8") as fixture:
+        first = fixture.read(1)
+        while first.isspace():
+            first = fixture.read(1)
+        fixture.seek(0)
+        if first == "[":
+            for case in json.load(fixture):
+                yield json.dumps(case)
+        else:
+            for line in fixture:
+                if line.strip():
+                    yield line.rstrip("\n")
+
+
+def post_bulk(lines, chunk_size=CHUNK_SIZE):
+    totals = {"inserted": 0, "duplicate": 0, "invalid": 0}
+
+    def send(chunk, offset):
+        response = requests.post(
+            BULK_API_URL,
+            data="\n".join(chunk).encode("utf-8"),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        response.raise_for_status()
+        result = response.json()
+        for key in totals:
+            totals[key] += result[key]
+        for item in result["results"]:
+            if item["status"] != "inserted":
+                print(f"   line {offset + item['index'] + 1}: {item['status']} {item.get('error', item.get('case_id', ''))}")
+        print(f"\U0001F4E4 Sent {offset + len(chunk)} cases so far - {totals}")
+
+    chunk, offset = [], 0
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            send(chunk, offset)
+            offset += len(chunk)
+            chunk = []
+    if chunk:
+        send(chunk, offset)
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load sample or fixture cases through the API.")
+    parser.add_argument("--bulk", action="store_true", help="Use POST /api/cases/bulk instead of one request per case")
+    parser.add_argument("--file", help="JSON array or NDJSON fixture file to load (implies --bulk)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.file:
+        post_bulk(iter_fixture_lines(args.file), args.chunk_size)
+    elif args.bulk:
+        post_bulk((json.dumps(case) for case in sample_cases), args.chunk_size)
+    else:
+        post_one_by_one(sample_cases)
@@ -0,0 +1,75 @@
+"""
+Recomputes the analytics rollups (case_rollups) from the cases and repairs any drift.
+
+    python rebuild_rollups.py            # repair: apply the differences found
+    python rebuild_rollups.py --check    # only report differences; exit code 1 if any
+
+Run it once after upgrading (the collection starts empty), and whenever a
+write bypassed the API or a rollup update failed ("❌ Error updating case
+rollups" in the API log).
+"""
+import argparse
+import sys
+
+from database.connection import case_collection, db
+from database.rollups import (
+    ROLLUP_FIELDS, ROLLUP_KEY_FIELDS, add_counts, case_rollup_counts, rollup_operations,
+)
+
+BATCH_SIZE = 1000
+rollup_collection = db["case_rollups"]
+
+
+def expected_counts(batch_size=BATCH_SIZE) -> dict:
+    counts = {}
+    for case in case_collection.find({}, ROLLUP_FIELDS).batch_size(batch_size):
+        add_counts(counts, case_rollup_counts(case))
+    return counts
+
+
+def stored_counts() -> dict:
+    counts = {}
+    projection = {"_id": 0, "count": 1, "cases": 1, **{field: 1 for field in ROLLUP_KEY_FIELDS}}
+    for row in rollup_collection.find({}, projection):
+        key = tuple(row.get(field) for field in ROLLUP_KEY_FIELDS)
+        add_counts(counts, {key: (row.get("count", 0), row.get("cases", 0))})
+    return counts
+
+
+def compare(batch_size=BATCH_SIZE) -> dict:
+    """Returns the (count, cases) change per rollup key that would make the stored rows match the cases."""
+    differences = expected_counts(batch_size)
+    add_counts(differences, stored_counts(), -1)
+    return {key: delta for key, delta in differences.items() if delta != (0, 0)}
+
+
+def rebuild(check_only=False, batch_size=BATCH_SIZE):
+    differences = compare(batch_size)
+    if not differences:
+        print("✅ Rollups match the cases")
+        return differences
+
+    print(f"⚠️ {len(differences)} rollup rows differ from the cases")
+    for key, delta in sorted(differences.items(), key=lambda item: str(item[0]))[:20]:
+        print(f"   {dict(zip(ROLLUP_KEY_FIELDS, key))}: count {delta[0]:+d}, cases {delta[1]:+d}")
+    if check_only:
+        return differences
+
+    operations = rollup_operations(differences)
+    for start in range(0, len(operations), batch_size):
+        rollup_collection.bulk_write(operations[start:start + batch_size], ordered=False)
+    if any(delta[0] < 0 for delta in differences.values()):
+        rollup_collection.delete_many({"count": {"$lte": 0}})
+    print(f"✅ Repaired {len(differences)} rollup rows")
+    return differences
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Only report differences, do not repair them")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    differences = rebuild(check_only=args.check, batch_size=args.batch_size)
+    if args.check and differences:
+        sys.exit(1)
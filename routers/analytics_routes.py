@@ -1,7 +1,13 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
-from datetime import datetime
-from database.connection import case_collection
+from typing import Literal, Optional
+from datetime import datetime, timedelta, timezone
+from collections import Counter
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import asyncio
+import math
+from database.connection import async_case_collection as case_collection
+from database.normalization import MatchMode, normalize_term, term_condition
+from database.rollups import rollup_collection, split_date_range
 
 router = APIRouter()
 
@@ -12,15 +18,20 @@ def build_match_filter(
     country: Optional[str],
     violation: Optional[str],
     date_from: Optional[datetime],
-    date_to: Optional[datetime]
+    date_to: Optional[datetime],
+    match_mode: MatchMode = "prefix",
+    status: Optional[str] = None
 ):
     match = {}
 
     if country:
-        match["location.country"] = {"$regex": country, "$options": "i"}
+        match["normalized.country"] = term_condition(country, match_mode)
 
     if violation:
-        match["violation_types"] = {"$regex": violation, "$options": "i"}
+        match["normalized.violation_types"] = term_condition(violation, match_mode)
+
+    if status:
+        match["status"] = status
 
     if date_from or date_to:
         match["date_occurred"] = {}
@@ -31,6 +42,95 @@ def build_match_filter(
 
     return match
 
+# -------------------------------
+# Helper: counts from the rollups
+# -------------------------------
+# The case_rollups collection (database/rollups.py) holds per-day counts by
+# country x violation type x status, so whole days of a date range are summed
+# from it and only the partial days at its ends are read from the cases.
+#   per_violation - `count` of the per-violation rows (pie chart)
+#   per_case      - `cases` of the rows for one violation type, or of the
+#                   violation=None rows (country and timeline charts)
+RollupRows = Literal["per_violation", "per_case"]
+
+
+def build_rollup_match(country, violation, status, match_mode: MatchMode, rows: RollupRows, days: dict):
+    match = {}
+    if country:
+        match["country_key"] = term_condition(country, match_mode)
+    if status:
+        match["status"] = status
+    if rows == "per_violation":
+        match["violation"] = {"$ne": None}
+    elif violation:
+        match["violation_key"] = normalize_term(violation)
+        match["cases"] = {"$gt": 0}
+    else:
+        match["violation"] = None
+    if days:
+        match["day"] = days
+    return match
+
+
+# Stages grouping matched cases, or matched rollup rows, into {_id: key, count};
+# shared by the per-chart endpoints and the dashboard
+VIOLATION_CASE_STAGES = [
+    {"$unwind": "$violation_types"},
+    {"$group": {"_id": "$violation_types", "count": {"$sum": 1}}},
+]
+VIOLATION_ROLLUP_STAGES = [
+    {"$group": {"_id": "$violation", "count": {"$sum": "$count"}}},
+]
+COUNTRY_CASE_STAGES = [
+    {"$group": {"_id": "$location.country", "count": {"$sum": 1}}},
+]
+COUNTRY_ROLLUP_STAGES = [
+    {"$group": {"_id": "$country", "count": {"$sum": "$cases"}}},
+]
+TOTAL_CASE_STAGES = [
+    {"$group": {"_id": None, "count": {"$sum": 1}}},
+]
+TOTAL_ROLLUP_STAGES = [
+    {"$group": {"_id": None, "count": {"$sum": "$cases"}}},
+]
+
+async def aggregate_counts(collection, match: dict, stages: list) -> Counter:
+    """Runs `stages` (ending in a {_id: key, count} group) and returns the counts per key."""
+    pipeline = ([{"$match": match}] if match else []) + stages
+    counts = Counter()
+    async for entry in collection.aggregate(pipeline):
+        counts[entry["_id"]] += entry["count"]
+    return counts
+
+
+def rollups_answer(rows: RollupRows, violation, match_mode: MatchMode) -> bool:
+    # A violation filter on per-violation counts needs the other violation types
+    # of the matching cases, and a non-exact one can match several types of one
+    # case; neither can be answered from per-type rows
+    return not (violation and (rows == "per_violation" or match_mode != "exact"))
+
+
+async def grouped_counts(case_stages, rollup_stages, rows: RollupRows, country, violation, status,
+                         date_from, date_to, match_mode: MatchMode) -> Counter:
+    if not rollups_answer(rows, violation, match_mode):
+        match = build_match_filter(country, violation, date_from, date_to, match_mode, status)
+        return await aggregate_counts(case_collection, match, case_stages)
+
+    days, edges = split_date_range(date_from, date_to)
+    case_match = build_match_filter(country, violation, None, None, match_mode, status)
+
+    parts = []
+    if days is not None:
+        rollup_match = build_rollup_match(country, violation, status, match_mode, rows, days)
+        parts.append(aggregate_counts(rollup_collection, rollup_match, rollup_stages))
+    for edge in edges:
+        parts.append(aggregate_counts(case_collection, {**case_match, "date_occurred": edge}, case_stages))
+
+    counts = Counter()
+    for part in await asyncio.gather(*parts):
+        counts.update(part)
+    return counts
+
 # -------------------------------
 # 1. Violations Pie Chart
 # -------------------------------
@@ -39,25 +139,16 @@ async def get_violation_statistics(
     country: Optional[str] = Query(None),
     violation: Optional[str] = Query(None),
     date_from: Optional[datetime] = Query(None),
-    date_to: Optional[datetime] = Query(None)
+    date_to: Optional[datetime] = Query(None),
+    status: Optional[str] = Query(None),
+    match_mode: MatchMode = Query("prefix", alias="match")
 ):
     try:
-        match = build_match_filter(country, violation, date_from, date_to)
-        pipeline = []
-        if match:
-            pipeline.append({"$match": match})
-
-        pipeline += [
-            {"$unwind": "$violation_types"},
-            {"$group": {
-                "_id": "$violation_types",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
-
-        result = list(case_collection.aggregate(pipeline))
-        return {entry["_id"]: entry["count"] for entry in result}
+        counts = await grouped_counts(
+            case_stages=VIOLATION_CASE_STAGES, rollup_stages=VIOLATION_ROLLUP_STAGES, rows="per_violation", country=country, violation=violation, status=status,
+            date_from=date_from, date_to=date_to, match_mode=match_mode,
+        )
+        return {name: count for name, count in counts.most_common() if count > 0}
     except Exception as e:
         print("❌ Error in /analytics/violations:", e)
         raise HTTPException(status_code=500, detail="Failed to fetch violation statistics")
@@ -70,68 +161,402 @@ async def get_country_statistics(
     country: Optional[str] = Query(None),
     violation: Optional[str] = Query(None),
     date_from: Optional[datetime] = Query(None),
-    date_to: Optional[datetime] = Query(None)
+    date_to: Optional[datetime] = Query(None),
+    status: Optional[str] = Query(None),
+    match_mode: MatchMode = Query("prefix", alias="match")
 ):
     try:
-        match = build_match_filter(country, violation, date_from, date_to)
-        pipeline = []
-        if match:
-            pipeline.append({"$match": match})
-
-        pipeline += [
-            {"$group": {
-                "_id": "$location.country",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
-
-        result = list(case_collection.aggregate(pipeline))
-        return [{"country": entry["_id"], "count": entry["count"]} for entry in result]
+        counts = await grouped_counts(
+            case_stages=COUNTRY_CASE_STAGES, rollup_stages=COUNTRY_ROLLUP_STAGES, rows="per_case", country=country, violation=violation, status=status,
+            date_from=date_from, date_to=date_to, match_mode=match_mode,
+        )
+        return [{"country": name, "count": count} for name, count in counts.most_common() if count > 0]
     except Exception as e:
         print("❌ Error in /analytics/geodata:", e)
         raise HTTPException(status_code=500, detail="Failed to fetch country statistics")
 
 # -------------------------------
-# 3. Timeline Chart (Cases by Month)
+# 3. Timeline Chart
 # -------------------------------
+# Cases are bucketed by the local calendar day they occurred on in `tz`: the
+# day is rebuilt as a UTC "wall clock" date, then truncated with $dateTrunc
+# and gap-filled with $densify, so DST shifts never split a bucket.
+Granularity = Literal["day", "week", "month", "quarter", "year"]
+Breakdown = Literal["violation", "country"]
+
+# $densify has no quarter unit
+DENSIFY_STEPS = {"day": (1, "day"), "week": (1, "week"), "month": (1, "month"), "quarter": (3, "month"), "year": (1, "year")}
+# Rollup days are UTC days
+UTC_TIMEZONES = {"UTC", "Etc/UTC", "GMT", "Etc/GMT"}
+BREAKDOWN_CASE_FIELDS = {"violation": "$violation_types", "country": "$location.country"}
+BREAKDOWN_ROLLUP_FIELDS = {"violation": "$violation", "country": "$country"}
+
+
+def parse_timezone(tz: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone: {tz}")
+
+
+def local_day(value: datetime, zone: ZoneInfo) -> datetime:
+    """The calendar day (as a naive midnight) `value` falls on in `zone`; naive values are UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(zone)
+    return datetime(value.year, value.month, value.day)
+
+
+def truncate_bucket(day: datetime, granularity: Granularity) -> datetime:
+    """Start of the bucket holding `day`, as $dateTrunc computes it (weeks start on Monday)."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "quarter":
+        return day.replace(month=3 * ((day.month - 1) // 3) + 1, day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def next_bucket(bucket: datetime, granularity: Granularity) -> datetime:
+    if granularity in ("day", "week"):
+        return bucket + timedelta(days=1 if granularity == "day" else 7)
+    months = {"month": 1, "quarter": 3, "year": 12}[granularity]
+    month = bucket.month - 1 + months
+    return bucket.replace(year=bucket.year + month // 12, month=month % 12 + 1)
+
+
+def bucket_label(bucket: datetime, granularity: Granularity) -> str:
+    if granularity == "month":
+        return bucket.strftime("%Y-%m")
+    if granularity == "quarter":
+        return f"{bucket.year}-Q{(bucket.month - 1) // 3 + 1}"
+    if granularity == "year":
+        return str(bucket.year)
+    return bucket.strftime("%Y-%m-%d")
+
+
+def timeline_bounds(date_from, date_to, granularity: Granularity, zone: ZoneInfo):
+    """$densify range: every bucket of a closed date range, else the buckets between the first and last case."""
+    if date_from is None or date_to is None:
+        return "full"
+    lower = truncate_bucket(local_day(date_from, zone), granularity)
+    upper = next_bucket(truncate_bucket(local_day(date_to, zone), granularity), granularity)
+    return [lower, upper]
+
+
+def timeline_case_source(match: dict, tz: str, breakdown: Optional[Breakdown]) -> list:
+    """Stages turning cases into {local, series, n} rows."""
+    stages = [{"$match": match}] if match else []
+    # 🛡️ Filter only records with valid date_occurred
+    stages.append({"$match": {"date_occurred": {"$type": "date"}}})
+    if breakdown == "violation":
+        stages.append({"$unwind": "$violation_types"})
+
+    local = {"$dateFromParts": {
+        part: {operator: {"date": "$date_occurred", "timezone": tz}}
+        for part, operator in (("year", "$year"), ("month", "$month"), ("day", "$dayOfMonth"))
+    }}
+    row = {"_id": 0, "local": local, "n": {"$literal": 1}}
+    if breakdown:
+        row["series"] = BREAKDOWN_CASE_FIELDS[breakdown]
+    stages.append({"$project": row})
+    return stages
+
+
+def timeline_rollup_source(match: dict, breakdown: Optional[Breakdown]) -> list:
+    """Stages turning rollup rows into {local, series, n} rows (UTC days only)."""
+    row = {"_id": 0, "local": "$day", "n": "$count" if breakdown == "violation" else "$cases"}
+    if breakdown:
+        row["series"] = BREAKDOWN_ROLLUP_FIELDS[breakdown]
+    return [{"$match": match}, {"$match": {"day": {"$type": "date"}}}, {"$project": row}]
+
+
+def timeline_tail(granularity: Granularity, breakdown: Optional[Breakdown], bounds) -> list:
+    """Groups {local, series, n} rows into buckets and fills empty buckets (per series) with 0."""
+    trunc = {"date": "$local", "unit": granularity}
+    if granularity == "week":
+        trunc["startOfWeek"] = "monday"
+    group_id = {"bucket": {"$dateTrunc": trunc}}
+    if breakdown:
+        group_id["series"] = "$series"
+
+    step, unit = DENSIFY_STEPS[granularity]
+    densify = {"field": "bucket", "range": {"step": step, "unit": unit, "bounds": bounds}}
+    if breakdown:
+        densify["partitionByFields"] = ["series"]
+
+    return [
+        {"$group": {"_id": group_id, "count": {"$sum": "$n"}}},
+        {"$project": {"_id": 0, "bucket": "$_id.bucket", "series": "$_id.series", "count": 1}},
+        {"$densify": densify},
+        {"$set": {"count": {"$ifNull": ["$count", 0]}}},
+        {"$sort": {"bucket": 1, "series": 1}},
+    ]
+
+
+def timeline_points(result: list, granularity: Granularity, breakdown: Optional[Breakdown]) -> list:
+    points = []
+    for entry in result:
+        point = {"date": bucket_label(entry["bucket"], granularity)}
+        if breakdown:
+            point["series"] = entry.get("series")
+        point["count"] = entry["count"]
+        points.append(point)
+    return points
+
+
+async def timeline_series(country, violation, date_from, date_to, status, match_mode: MatchMode,
+                          granularity: Granularity, tz: str, breakdown: Optional[Breakdown]) -> list:
+    """Timeline points, from the rollups (whole UTC days) and the cases (everything else), in one aggregation."""
+    bounds = timeline_bounds(date_from, date_to, granularity, parse_timezone(tz))
+    tail = timeline_tail(granularity, breakdown, bounds)
+    rows = "per_violation" if breakdown == "violation" else "per_case"
+
+    days, edges = None, []
+    if tz in UTC_TIMEZONES and rollups_answer(rows, violation, match_mode):
+        days, edges = split_date_range(date_from, date_to)
+
+    if days is None:
+        match = build_match_filter(country, violation, date_from, date_to, match_mode, status)
+        collection, pipeline = case_collection, timeline_case_source(match, tz, breakdown) + tail
+    else:
+        # Whole days from the rollups, the partial days at the ends from the cases, in one aggregation
+        pipeline = timeline_rollup_source(
+            build_rollup_match(country, violation, status, match_mode, rows, days), breakdown)
+        if edges:
+            case_match = build_match_filter(country, violation, None, None, match_mode, status)
+            case_match["$or"] = [{"date_occurred": edge} for edge in edges]
+            pipeline.append({"$unionWith": {
+                "coll": case_collection.name,
+                "pipeline": timeline_case_source(case_match, tz, breakdown),
+            }})
+        collection, pipeline = rollup_collection, pipeline + tail
+
+    result = await collection.aggregate(pipeline).to_list(length=None)
+    return timeline_points(result, granularity, breakdown)
+
+
 @router.get("/analytics/timeline")
 async def get_cases_over_time(
     country: Optional[str] = Query(None),
     violation: Optional[str] = Query(None),
     date_from: Optional[datetime] = Query(None),
-    date_to: Optional[datetime] = Query(None)
+    date_to: Optional[datetime] = Query(None),
+    status: Optional[str] = Query(None),
+    match_mode: MatchMode = Query("prefix", alias="match"),
+    granularity: Granularity = Query("month"),
+    tz: str = Query("UTC", description="IANA time zone the buckets follow, e.g. Asia/Gaza"),
+    breakdown: Optional[Breakdown] = Query(None)
 ):
     try:
-        match = build_match_filter(country, violation, date_from, date_to)
-        pipeline = []
-        if match:
-            pipeline.append({"$match": match})
-
-        # 🛡️ Filter only records with valid date_occurred
-        pipeline.append({"$match": {"date_occurred": {"$type": "date"}}})
-
-        pipeline += [
-            {
-                "$group": {
-                    "_id": {
-                        "year": {"$year": "$date_occurred"},
-                        "month": {"$month": "$date_occurred"}
-                    },
-                    "count": {"$sum": 1}
-                }
-            },
-            {"$sort": {"_id.year": 1, "_id.month": 1}}
-        ]
-
-        result = list(case_collection.aggregate(pipeline))
-        return [
-            {
-                "date": f"{entry['_id']['year']}-{entry['_id']['month']:02d}",
-                "count": entry["count"]
-            }
-            for entry in result
-        ]
+        return await timeline_series(country, violation, date_from, date_to, status, match_mode,
+                                     granularity, tz, breakdown)
+    except HTTPException:
+        raise
     except Exception as e:
         print("❌ Error in /analytics/timeline:", e)
         raise HTTPException(status_code=500, detail="Failed to generate timeline")
+
+# -------------------------------
+# 4. Dashboard (all series in one pass)
+# -------------------------------
+DASHBOARD_CASE_LIMIT = 5000
+MAX_DASHBOARD_CASE_LIMIT = 20000
+# Map points and the Excel export columns
+DASHBOARD_CASE_FIELDS = {
+    "_id": 0, "case_id": 1, "title": 1, "status": 1, "priority": 1,
+    "violation_types": 1, "location": 1, "date_occurred": 1,
+}
+
+
+@router.get("/analytics/dashboard")
+async def get_dashboard(
+    country: Optional[str] = Query(None),
+    violation: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    status: Optional[str] = Query(None),
+    match_mode: MatchMode = Query("prefix", alias="match"),
+    limit: int = Query(DASHBOARD_CASE_LIMIT, ge=1, le=MAX_DASHBOARD_CASE_LIMIT),
+    granularity: Granularity = Query("month"),
+    tz: str = Query("UTC"),
+    breakdown: Optional[Breakdown] = Query(None, description="Split the timeline by violation type or country")
+):
+    """
+    Every dashboard series, plus the newest `limit` matching cases for the map and the export.
+
+    Without a violation filter the series are summed from the rollups like the
+    per-chart endpoints, and the only case read is the capped, index-sorted page.
+    A violation filter needs each case's other violation types, so then all
+    series come from one $facet over the matching cases instead.
+    """
+    try:
+        zone = parse_timezone(tz)
+        match = build_match_filter(country, violation, date_from, date_to, match_mode, status)
+
+        if violation:
+            bounds = timeline_bounds(date_from, date_to, granularity, zone)
+            pipeline = [{"$match": match}]
+            pipeline.append({"$facet": {
+                "total": TOTAL_CASE_STAGES,
+                "violations": VIOLATION_CASE_STAGES,
+                "countries": COUNTRY_CASE_STAGES,
+                "timeline": timeline_case_source({}, tz, breakdown) + timeline_tail(granularity, breakdown, bounds),
+                "cases": [
+                    {"$sort": {"date_occurred": -1, "_id": -1}},
+                    {"$limit": limit + 1},
+                    {"$project": DASHBOARD_CASE_FIELDS},
+                ],
+            }})
+            result = (await case_collection.aggregate(pipeline).to_list(length=1))[0]
+            total = result["total"][0]["count"] if result["total"] else 0
+            violations = Counter({entry["_id"]: entry["count"] for entry in result["violations"]})
+            countries = Counter({entry["_id"]: entry["count"] for entry in result["countries"]})
+            timeline, cases = timeline_points(result["timeline"], granularity, breakdown), result["cases"]
+        else:
+            filters = dict(country=country, violation=None, status=status,
+                           date_from=date_from, date_to=date_to, match_mode=match_mode)
+            totals, violations, countries, timeline, cases = await asyncio.gather(
+                grouped_counts(TOTAL_CASE_STAGES, TOTAL_ROLLUP_STAGES, "per_case", **filters),
+                grouped_counts(VIOLATION_CASE_STAGES, VIOLATION_ROLLUP_STAGES, "per_violation", **filters),
+                grouped_counts(COUNTRY_CASE_STAGES, COUNTRY_ROLLUP_STAGES, "per_case", **filters),
+                timeline_series(country, None, date_from, date_to, status, match_mode, granularity, tz, breakdown),
+                case_collection.find(match, DASHBOARD_CASE_FIELDS)
+                .sort([("date_occurred", -1), ("_id", -1)])
+                .limit(limit + 1)
+                .to_list(length=None),
+            )
+            total = totals[None]
+
+        return {
+            "total": total,
+            "violations": {name: count for name, count in violations.most_common() if count > 0},
+            "countries": [{"country": name, "count": count} for name, count in countries.most_common() if count > 0],
+            "timeline": timeline,
+            "cases": cases[:limit],
+            "cases_truncated": len(cases) > limit,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("❌ Error in /analytics/dashboard:", e)
+        raise HTTPException(status_code=500, detail="Failed to build dashboard")
+
+# -------------------------------
+# 5. Clustered Map
+# -------------------------------
+# Cases are bucketed on a lon/lat grid whose cells are about MAP_CELL_PIXELS
+# wide on screen at the requested zoom (256px web map tiles), so the number of
+# items returned is bounded by the viewport, not by the number of cases.
+MAP_CELL_PIXELS = 64
+MAX_MAP_CELLS = 2000
+# From this zoom level on, cells holding a single case are returned as that case
+MAP_POINT_ZOOM = 10
+WORLD_BBOX = (-180.0, -90.0, 180.0, 90.0)
+# GeoJSON polygon edges are geodesics; short segments keep them close to the parallels
+MAP_EDGE_STEP_DEGREES = 10.0
+MAP_MAX_LATITUDE = 89.9
+
+MAP_LON = {"$arrayElemAt": ["$location.coordinates.coordinates", 0]}
+MAP_LAT = {"$arrayElemAt": ["$location.coordinates.coordinates", 1]}
+
+
+def parse_bbox(bbox: Optional[str]):
+    """'minLon,minLat,maxLon,maxLat' -> tuple of floats; minLon > maxLon crosses the antimeridian."""
+    if not bbox:
+        return WORLD_BBOX
+    try:
+        west, south, east, north = (float(part) for part in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be minLon,minLat,maxLon,maxLat")
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south < north <= 90):
+        raise HTTPException(status_code=400, detail="bbox is outside -180..180 / -90..90 or empty")
+    return west, south, east, north
+
+
+def bbox_polygons(west, south, east, north):
+    """GeoJSON polygons covering a bbox, each narrower than a hemisphere as $geoWithin requires."""
+    # Vertices on a pole would all be the same point
+    south, north = max(south, -MAP_MAX_LATITUDE), min(north, MAP_MAX_LATITUDE)
+    spans = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+    polygons = []
+    for span_west, span_east in spans:
+        parts = max(1, math.ceil((span_east - span_west) / 90))
+        width = (span_east - span_west) / parts
+        for i in range(parts):
+            left, right = span_west + i * width, span_west + (i + 1) * width
+            steps = max(1, math.ceil((right - left) / MAP_EDGE_STEP_DEGREES))
+            bottom = [[left + (right - left) * k / steps, south] for k in range(steps + 1)]
+            top = [[lon, north] for lon, _ in reversed(bottom)]
+            polygons.append({"type": "Polygon", "coordinates": [bottom + top + [bottom[0]]]})
+    return polygons
+
+
+def map_cell_degrees(zoom: int, west, south, east, north) -> float:
+    """Grid cell size for `zoom`, coarsened until the bbox holds at most MAX_MAP_CELLS cells."""
+    cell = 360.0 / (2 ** zoom) * MAP_CELL_PIXELS / 256
+    width = (east - west) % 360 or 360.0
+    while (width / cell) * ((north - south) / cell) > MAX_MAP_CELLS:
+        cell *= 2
+    return cell
+
+
+@router.get("/analytics/map")
+async def get_case_map(
+    bbox: Optional[str] = Query(None, description="minLon,minLat,maxLon,maxLat (whole world if omitted)"),
+    zoom: int = Query(2, ge=0, le=22),
+    country: Optional[str] = Query(None),
+    violation: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    status: Optional[str] = Query(None),
+    match_mode: MatchMode = Query("prefix", alias="match")
+):
+    try:
+        west, south, east, north = parse_bbox(bbox)
+        match = build_match_filter(country, violation, date_from, date_to, match_mode, status)
+        if (west, south, east, north) == WORLD_BBOX:
+            match["location.coordinates.type"] = "Point"
+        else:
+            # Answered by the location_2dsphere index
+            match["$or"] = [{"location.coordinates": {"$geoWithin": {"$geometry": polygon}}}
+                            for polygon in bbox_polygons(west, south, east, north)]
+
+        cell = map_cell_degrees(zoom, west, south, east, north)
+        pipeline = [
+            {"$match": match},
+            {"$group": {
+                "_id": {
+                    "x": {"$floor": {"$divide": [MAP_LON, cell]}},
+                    "y": {"$floor": {"$divide": [MAP_LAT, cell]}},
+                },
+                "count": {"$sum": 1},
+                "lon": {"$avg": MAP_LON},
+                "lat": {"$avg": MAP_LAT},
+                "case_id": {"$first": "$case_id"},
+                "title": {"$first": "$title"},
+                "status": {"$first": "$status"},
+            }},
+            {"$sort": {"count": -1}},
+            {"$limit": MAX_MAP_CELLS},
+        ]
+
+        items, total = [], 0
+        async for cluster in case_collection.aggregate(pipeline):
+            total += cluster["count"]
+            item = {"lat": cluster["lat"], "lon": cluster["lon"], "count": cluster["count"]}
+            if cluster["count"] == 1 and zoom >= MAP_POINT_ZOOM:
+                item.update(type="point", case_id=cluster["case_id"], title=cluster["title"], status=cluster["status"])
+            else:
+                item["type"] = "cluster"
+            items.append(item)
+
+        return {"zoom": zoom, "bbox": [west, south, east, north], "cell_degrees": cell, "total": total, "items": items}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("❌ Error in /analytics/map:", e)
+        raise HTTPException(status_code=500, detail="Failed to build case map")
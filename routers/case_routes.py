@@ -1,26 +1,53 @@
-from fastapi import APIRouter, HTTPException, Body, Query, UploadFile, File
+from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from datetime import datetime
 from models.case_model import Case
-from database.connection import case_collection, case_history_collection
-from pydantic import BaseModel
-import os
+from database.connection import (
+    async_case_collection as case_collection,
+    async_case_history_collection as case_history_collection,
+)
+from database.case_index import (
+    CASE_INDEX_FIELDS, CaseIndexCache, bump_case_index_version, current_case_index_version,
+)
+from database.normalization import (
+    MatchMode, case_normalized_fields, normalize_term, normalized_updates, term_condition,
+)
+from database.rollups import ROLLUP_FIELDS, add_counts, case_rollup_counts, record_case_change, record_rollup_deltas
+from database.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor,
+    encode_cursor, keyset_filter, keyset_sort, merge_filters, parse_projection,
+)
+from utils.http_cache import etag_matches, json_response, make_etag, not_modified
+from utils.serialization import aiter_lines, aiter_ndjson
+from utils.blob_store import blob_store
+from utils.thumbnails import is_image, thumbnail_worker, variant_urls
+from utils.uploads import UploadTooLarge
+from pydantic import BaseModel, ValidationError
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from bson import ObjectId
+from collections import Counter
+import asyncio
+import json
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+# Stored for indexed filtering only, never returned to clients
+INTERNAL_CASE_FIELDS = ("normalized", "pending_history")
+
 # Model for PATCH status update
 class StatusUpdate(BaseModel):
     status: str
+    # Optional optimistic concurrency check: the status_version the client last saw
+    status_version: Optional[int] = None
 
 # ------------------------
 # Create a new case
 # ------------------------
-@router.post("/cases")
-async def create_case(case: Case):
-    existing = case_collection.find_one({"case_id": case.case_id})
-    if existing:
-        raise HTTPException(status_code=400, detail="Case ID already exists.")
-
+def prepare_case_document(case: Case) -> dict:
     case_data = case.dict()
 
     for item in case_data.get("evidence", []):
@@ -29,33 +56,166 @@ async def create_case(case: Case):
 
     case_data["created_at"] = datetime.utcnow()
     case_data["updated_at"] = datetime.utcnow()
+    case_data["normalized"] = case_normalized_fields(case_data)
+    return case_data
+
+
+@router.post("/cases")
+async def create_case(case: Case):
+    existing = await case_collection.find_one({"case_id": case.case_id})
+    if existing:
+        raise HTTPException(status_code=400, detail="Case ID already exists.")
+
+    case_data = prepare_case_document(case)
 
-    result = case_collection.insert_one(case_data)
+    result = await case_collection.insert_one(case_data)
     if not result.inserted_id:
         raise HTTPException(status_code=500, detail="Failed to add case.")
+    await bump_case_index_version()
+    await record_case_change(after=case_data)
 
     return {"message": "Case added successfully!", "case_id": str(result.inserted_id)}
 
+# ------------------------
+# Bulk create cases (JSON array or NDJSON)
+# ------------------------
+BULK_CHUNK_SIZE = 1000
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+async def _insert_case_chunk(chunk, results, seen_ids):
+    """Inserts (index, Case) pairs with one unordered insert_many and records per-item results."""
+    ids = [case.case_id for _, case in chunk]
+    existing = await case_collection.find({"case_id": {"$in": ids}}, {"case_id": 1}).to_list(length=None)
+    existing_ids = {doc["case_id"] for doc in existing}
+
+    to_insert = []
+    for index, case in chunk:
+        if case.case_id in existing_ids or case.case_id in seen_ids:
+            results.append({"index": index, "case_id": case.case_id, "status": "duplicate"})
+            continue
+        seen_ids.add(case.case_id)
+        to_insert.append((index, case))
+
+    if not to_insert:
+        return
+
+    failed = {}
+    documents = [prepare_case_document(case) for _, case in to_insert]
+    try:
+        await case_collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        # Unordered: every document without an error was still written
+        for write_error in e.details.get("writeErrors", []):
+            failed[write_error["index"]] = write_error
+
+    deltas = {}
+    for position, (index, case) in enumerate(to_insert):
+        write_error = failed.get(position)
+        if write_error is None:
+            add_counts(deltas, case_rollup_counts(documents[position]))
+            results.append({"index": index, "case_id": case.case_id, "status": "inserted"})
+        elif write_error.get("code") == DUPLICATE_KEY_ERROR:
+            results.append({"index": index, "case_id": case.case_id, "status": "duplicate"})
+        else:
+            results.append({"index": index, "case_id": case.case_id, "status": "invalid", "error": write_error.get("errmsg")})
+    await record_rollup_deltas(deltas)
+
+
+async def _iter_bulk_items(request: Request):
+    """Yields raw case payloads from a JSON array body or an NDJSON stream."""
+    if NDJSON_MEDIA_TYPE in request.headers.get("content-type", ""):
+        async for line in aiter_lines(request.stream()):
+            if line.strip():
+                yield line
+        return
+
+    try:
+        body = await request.json()
+    except ValueError:  # json.JSONDecodeError, or a body that is not UTF-8
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of cases or an NDJSON body.")
+    for item in body:
+        yield item
+
+
+@router.post("/cases/bulk")
+async def bulk_create_cases(request: Request):
+    try:
+        results, chunk, seen_ids = [], [], set()
+        index = 0
+        async for item in _iter_bulk_items(request):
+            try:
+                if isinstance(item, (bytes, str)):
+                    item = json.loads(item)
+                chunk.append((index, Case.model_validate(item)))
+            except ValidationError as e:
+                results.append({"index": index, "status": "invalid", "error": _validation_message(e)})
+            except ValueError as e:
+                results.append({"index": index, "status": "invalid", "error": f"Invalid JSON: {e}"})
+            index += 1
+
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                await _insert_case_chunk(chunk, results, seen_ids)
+                chunk = []
+
+        if chunk:
+            await _insert_case_chunk(chunk, results, seen_ids)
+
+        results.sort(key=lambda r: r["index"])
+        summary = {status: sum(1 for r in results if r["status"] == status)
+                   for status in ("inserted", "duplicate", "invalid")}
+        if summary["inserted"]:
+            await bump_case_index_version()
+        return {"message": "Bulk import finished", "total": index, **summary, "results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("❌ Error in POST /cases/bulk:", e)
+        raise HTTPException(status_code=500, detail="Failed to import cases")
+
 # ------------------------
 # Get all cases (with filters)
 # ------------------------
 @router.get("/cases")
 async def get_all_cases(
+    request: Request,
+    response: Response,
     country: Optional[str] = Query(None),
     violation: Optional[str] = Query(None),
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
     status: Optional[str] = Query(None),
-    query_text: Optional[str] = Query(None)
+    query_text: Optional[str] = Query(None),
+    match: MatchMode = Query("prefix", description="How country/violation are matched: exact, prefix or contains"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description=f"Page size (default {DEFAULT_PAGE_SIZE})"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. case_id,title,status"),
+    stream: bool = Query(False, description="Stream every matching case as NDJSON (same as Accept: application/x-ndjson)")
 ):
     try:
+        streaming = stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+        try:
+            # Pages need the sort key to build the next cursor
+            projection = parse_projection(fields, required=() if streaming else ("date_occurred",),
+                                          hidden=INTERNAL_CASE_FIELDS)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
         query = {}
 
         if country:
-            query["location.country"] = {"$regex": country, "$options": "i"}
+            query["normalized.country"] = term_condition(country, match)
 
         if violation:
-            query["violation_types"] = {"$regex": violation, "$options": "i"}
+            query["normalized.violation_types"] = term_condition(violation, match)
 
         if status:
             query["status"] = status
@@ -74,28 +234,116 @@ async def get_all_cases(
                 {"description": {"$regex": query_text, "$options": "i"}},
             ]
 
-        cases_cursor = case_collection.find(query)
-        cases = []
-        for case in cases_cursor:
+        # Streaming export: every case, one per line, read from the cursor in batches
+        if streaming:
+            if limit is not None or cursor is not None:
+                raise HTTPException(status_code=400, detail="limit and cursor cannot be combined with streaming")
+            cases_cursor = case_collection.find(query, projection).batch_size(STREAM_BATCH_SIZE)
+            return StreamingResponse(aiter_ndjson(cases_cursor), media_type=NDJSON_MEDIA_TYPE)
+
+        # Keyset pagination on (date_occurred, _id), newest first; always bounded
+        page_size = limit or DEFAULT_PAGE_SIZE
+        try:
+            query = merge_filters(query, keyset_filter("date_occurred", cursor))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        cases = await (
+            case_collection.find(query, projection)
+            .sort(keyset_sort("date_occurred"))
+            .limit(page_size + 1)
+            .to_list(length=None)
+        )
+
+        if len(cases) > page_size:
+            cases = cases[:page_size]
+            last = cases[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor(last.get("date_occurred"), last["_id"])
+
+        strip_date = bool(fields) and "date_occurred" not in {f.strip() for f in fields.split(",")}
+        for case in cases:
             case["_id"] = str(case["_id"])
-            cases.append(case)
+            if strip_date:
+                case.pop("date_occurred", None)
 
         return cases
+    except HTTPException:
+        raise
     except Exception as e:
         print("❌ Error in filtered GET /cases:", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve cases")
 
+# ------------------------
+# Compact case index for selectors
+# ------------------------
+case_index_cache = CaseIndexCache(case_collection)
+
+
+@router.get("/cases/index")
+async def get_case_index(request: Request):
+    try:
+        version, generation = await current_case_index_version()
+        etag = make_etag(f"case-index-{version}")
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        body = await case_index_cache.get(version, generation)
+        return Response(content=body, media_type="application/json",
+                        headers={"ETag": etag, "Cache-Control": "no-cache"})
+    except Exception as e:
+        print("❌ Error in GET /cases/index:", e)
+        raise HTTPException(status_code=500, detail="Failed to retrieve case index")
+
+# ------------------------
+# Autocomplete by case_id or title prefix
+# ------------------------
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+
+
+@router.get("/cases/suggest")
+async def suggest_cases(
+    q: str = Query(..., min_length=1, description="Prefix of a case_id or title"),
+    limit: int = Query(SUGGEST_DEFAULT_LIMIT, ge=1, le=SUGGEST_MAX_LIMIT),
+):
+    try:
+        if not normalize_term(q):
+            return []
+
+        # One anchored query per field, each answered from its covering index
+        condition = term_condition(q, "prefix")
+        by_id, by_title = await asyncio.gather(*(
+            case_collection.find({f"normalized.{field}": condition}, CASE_INDEX_FIELDS)
+            .sort(f"normalized.{field}", 1)
+            .limit(limit)
+            .to_list(length=limit)
+            for field in ("case_id", "title")
+        ))
+
+        # case_id matches first, then title matches not already listed
+        suggestions, seen = [], set()
+        for case in by_id + by_title:
+            if case["case_id"] not in seen:
+                seen.add(case["case_id"])
+                suggestions.append(case)
+        return suggestions[:limit]
+    except Exception as e:
+        print("❌ Error in GET /cases/suggest:", e)
+        raise HTTPException(status_code=500, detail="Failed to suggest cases")
+
 # ------------------------
 # Get a case by ID
 # ------------------------
 @router.get("/cases/{case_id}")
-async def get_case_by_id(case_id: str):
+async def get_case_by_id(request: Request, case_id: str):
     try:
-        case = case_collection.find_one({"case_id": case_id})
+        case = await case_collection.find_one({"case_id": case_id}, {name: 0 for name in INTERNAL_CASE_FIELDS})
         if not case:
             raise HTTPException(status_code=404, detail="Case not found")
         case["_id"] = str(case["_id"])
-        return case
+        return json_response(request, case)
+    except HTTPException:
+        raise
     except Exception as e:
         print("❌ Error in GET /cases/{id}:", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve case")
@@ -103,33 +351,114 @@ async def get_case_by_id(case_id: str):
 # ------------------------
 # Update status only
 # ------------------------
+class StatusConflict(Exception):
+    """The caller's status_version is not the case's current one."""
+
+
+async def transition_status(case_id: str, new_status: str, updated_by: str = "admin", expected_version: Optional[int] = None):
+    """
+    Sets the status and returns the case as it was before, or None.
+
+    One pipeline update reads the previous status, bumps status_version and
+    appends the history entry to pending_history, so concurrent transitions
+    each see the real previous status. The entry is only cleared once it is in
+    case_status_history, so a failure in between leaves a marker for
+    reconcile_status_history() instead of losing it.
+    Raises StatusConflict if expected_version is given and is not the current one.
+    """
+    query = {"case_id": case_id}
+    if expected_version is not None:
+        # Cases never transitioned have no status_version yet
+        query["status_version"] = expected_version or {"$in": [0, None]}
+
+    now = datetime.utcnow()
+    entry_id = ObjectId()
+    next_version = {"$add": [{"$ifNull": ["$status_version", 0]}, 1]}
+    previous = await case_collection.find_one_and_update(
+        query,
+        [{"$set": {
+            "status": {"$literal": new_status},
+            "updated_at": now,
+            "status_version": next_version,
+            "pending_history": {"$concatArrays": [
+                {"$ifNull": ["$pending_history", []]},
+                [{
+                    "_id": entry_id,
+                    "case_id": {"$literal": case_id},
+                    "old_status": {"$ifNull": ["$status", None]},
+                    "new_status": {"$literal": new_status},
+                    "version": next_version,
+                    "updated_at": now,
+                    "updated_by": {"$literal": updated_by}
+                }]
+            ]}
+        }}],
+        projection={"status_version": 1, "pending_history": 1, **ROLLUP_FIELDS},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        if expected_version is not None and await case_collection.count_documents({"case_id": case_id}, limit=1):
+            raise StatusConflict(f"Case is not at status_version {expected_version}")
+        return None
+
+    version = (previous.get("status_version") or 0) + 1
+    entry = {
+        "_id": entry_id,
+        "case_id": case_id,
+        "old_status": previous.get("status"),
+        "new_status": new_status,
+        "version": version,
+        "updated_at": now,
+        "updated_by": updated_by
+    }
+
+    await bump_case_index_version()
+    await record_case_change(before=previous, after={**previous, "status": new_status})
+    # Also flushes entries an earlier, interrupted transition of this case left behind
+    try:
+        await flush_pending_history(case_id, previous.get("pending_history", []) + [entry])
+    except Exception as e:
+        # The status is changed; the marker stays on the case for reconcile_status_history()
+        print("❌ Error while writing the status history of", case_id, ":", e)
+    return previous
+
+
+async def flush_pending_history(case_id: str, entries: list) -> int:
+    """Copies pending history entries into case_status_history (idempotent on _id) and clears them."""
+    for entry in entries:
+        try:
+            await case_history_collection.insert_one(entry)
+        except DuplicateKeyError:
+            pass  # Already copied before an interruption
+    await case_collection.update_one(
+        {"case_id": case_id},
+        {"$pull": {"pending_history": {"_id": {"$in": [entry["_id"] for entry in entries]}}}}
+    )
+    return len(entries)
+
+
+async def reconcile_status_history() -> int:
+    """Flushes the history entries of transitions interrupted before their history write."""
+    flushed = 0
+    async for case in case_collection.find({"pending_history._id": {"$exists": True}},
+                                           {"case_id": 1, "pending_history": 1}):
+        flushed += await flush_pending_history(case["case_id"], case["pending_history"])
+    return flushed
+
+
 @router.patch("/cases/{case_id}/status")
 async def update_case_status(case_id: str, data: StatusUpdate):
     try:
-        case = case_collection.find_one({"case_id": case_id})
-        if not case:
+        previous = await transition_status(case_id, data.status, expected_version=data.status_version)
+        if previous is None:
             raise HTTPException(status_code=404, detail="Case not found")
 
-        old_status = case["status"]
-        new_status = data.status
-
-        result = case_collection.update_one(
-            {"case_id": case_id},
-            {"$set": {"status": new_status, "updated_at": datetime.utcnow()}}
-        )
-
-        if result.modified_count == 0:
-            raise HTTPException(status_code=500, detail="Status not updated")
-
-        case_history_collection.insert_one({
-            "case_id": case_id,
-            "old_status": old_status,
-            "new_status": new_status,
-            "updated_at": datetime.utcnow(),
-            "updated_by": "admin"
-        })
-
-        return {"message": "Case status updated successfully", "new_status": new_status}
+        return {"message": "Case status updated successfully", "new_status": data.status,
+                "status_version": (previous.get("status_version") or 0) + 1}
+    except StatusConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         print("❌ Error in PATCH /cases/{case_id}/status:", e)
         raise HTTPException(status_code=500, detail="Failed to update status")
@@ -137,24 +466,68 @@ async def update_case_status(case_id: str, data: StatusUpdate):
 # ------------------------
 # Update full case (Edit Case)
 # ------------------------
+def evidence_blob_counts(evidence) -> Counter:
+    return Counter(item["sha256"] for item in evidence if isinstance(item, dict) and item.get("sha256"))
+
+
+async def release_replaced_evidence(old_evidence, new_evidence):
+    """
+    Moves blob references from the old evidence list to the new one. Entries are
+    compared as a multiset of sha256, so two entries sharing one blob hold two references.
+    """
+    old_counts, new_counts = evidence_blob_counts(old_evidence), evidence_blob_counts(new_evidence)
+    for sha256, count in (old_counts - new_counts).items():
+        for _ in range(count):
+            await blob_store.release(sha256)
+    for sha256, count in (new_counts - old_counts).items():
+        for _ in range(count):
+            await blob_store.retain(sha256)
+
+
+def apply_set(document: dict, updates: dict) -> dict:
+    """Returns a copy of `document` with a $set (dotted keys included) applied, as Mongo would."""
+    document = dict(document)
+    for key, value in updates.items():
+        target, *path = key.split(".")
+        if not path:
+            document[target] = value
+            continue
+        node = document[target] = dict(document.get(target) or {})
+        for part in path[:-1]:
+            node = node[part] = dict(node.get(part) or {})
+        node[path[-1]] = value
+    return document
+
+
 @router.patch("/cases/{case_id}")
 async def update_case(case_id: str, updated_data: dict):
     try:
-        case = case_collection.find_one({"case_id": case_id})
-        if not case:
-            raise HTTPException(status_code=404, detail="Case not found")
-
+        updated_data = {k: v for k, v in updated_data.items() if not k.startswith("normalized")}
+        updated_data.update(normalized_updates(updated_data))
         updated_data["updated_at"] = datetime.utcnow()
 
-        result = case_collection.update_one(
+        # The state it replaced, read atomically with the write, drives the rollup and evidence updates
+        case = await case_collection.find_one_and_update(
             {"case_id": case_id},
-            {"$set": updated_data}
+            {"$set": updated_data},
+            return_document=ReturnDocument.BEFORE
         )
+        if not case:
+            raise HTTPException(status_code=404, detail="Case not found")
+
+        if CASE_INDEX_FIELDS.keys() & updated_data.keys():
+            # A renamed case leaves its old entry behind unless the index is rebuilt
+            await bump_case_index_version(full_rebuild="case_id" in updated_data)
 
-        if result.modified_count == 0:
-            raise HTTPException(status_code=500, detail="Case update failed")
+        # No-op unless the date, country, violation types or status changed
+        await record_case_change(before=case, after=apply_set(case, updated_data))
+
+        if "evidence" in updated_data:
+            await release_replaced_evidence(case.get("evidence") or [], updated_data["evidence"] or [])
 
         return {"message": "Case updated successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         print("❌ Error in full PATCH /cases:", e)
         raise HTTPException(status_code=500, detail="Failed to update case")
@@ -165,15 +538,13 @@ async def update_case(case_id: str, updated_data: dict):
 @router.delete("/cases/{case_id}")
 async def archive_case(case_id: str):
     try:
-        result = case_collection.update_one(
-            {"case_id": case_id},
-            {"$set": {"status": "archived", "updated_at": datetime.utcnow()}}
-        )
-
-        if result.matched_count == 0:
+        previous = await transition_status(case_id, "archived")
+        if previous is None:
             raise HTTPException(status_code=404, detail="Case not found")
 
         return {"message": f"Case {case_id} archived successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         print("❌ Error in DELETE /cases/{case_id}:", e)
         raise HTTPException(status_code=500, detail="Failed to archive case")
@@ -184,9 +555,9 @@ async def archive_case(case_id: str):
 @router.get("/cases/{case_id}/history")
 async def get_case_status_history(case_id: str):
     try:
-        history_cursor = case_history_collection.find({"case_id": case_id}).sort("updated_at", -1)
+        history_cursor = case_history_collection.find({"case_id": case_id}).sort([("version", -1), ("updated_at", -1)])
         history = []
-        for record in history_cursor:
+        async for record in history_cursor:
             record["_id"] = str(record["_id"])
             history.append(record)
         return history
@@ -197,31 +568,45 @@ async def get_case_status_history(case_id: str):
 # ------------------------
 # Upload file to case
 # ------------------------
-UPLOAD_FOLDER = "uploads"
-
 @router.post("/cases/{case_id}/upload")
 async def upload_file_to_case(case_id: str, file: UploadFile = File(...)):
     try:
-        case = case_collection.find_one({"case_id": case_id})
+        case = await case_collection.find_one({"case_id": case_id}, {"_id": 1})
         if not case:
             raise HTTPException(status_code=404, detail="Case not found")
 
-        file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+        try:
+            blob = await blob_store.put_upload(file)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
         evidence_entry = {
             "type": "file",
-            "url": f"/{UPLOAD_FOLDER}/{file.filename}",
-            "description": f"Uploaded: {file.filename}"
+            "url": blob["url"],
+            "description": f"Uploaded: {file.filename}",
+            "sha256": blob["sha256"],
+            "size": blob["size"]
         }
-
-        case_collection.update_one(
-            {"case_id": case_id},
-            {"$push": {"evidence": evidence_entry}}
-        )
+        if is_image(file.filename):
+            thumbnail_worker.submit(blob["sha256"], blob["path"])
+            evidence_entry.update(variant_urls(blob["sha256"]))
+
+        try:
+            result = await case_collection.update_one(
+                {"case_id": case_id},
+                {"$push": {"evidence": evidence_entry}}
+            )
+        except BaseException:
+            await blob_store.release(blob["sha256"])
+            raise
+        if result.matched_count == 0:
+            # Deleted while the file was uploading
+            await blob_store.release(blob["sha256"])
+            raise HTTPException(status_code=404, detail="Case not found")
 
         return {"message": "File uploaded and linked to case", "file": evidence_entry}
+    except HTTPException:
+        raise
     except Exception as e:
         print("❌ Error in file upload:", e)
         raise HTTPException(status_code=500, detail="Failed to upload file")
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException, Path, Request
+import mimetypes
+import os
+import re
+
+from utils.blob_store import UPLOAD_ROOT, blob_store
+from utils.http_cache import file_response
+from utils.thumbnails import VARIANTS, is_image, thumbnail_worker, variant_path
+
+router = APIRouter()
+
+# Mounted without the /api prefix, replaces the plain StaticFiles mount
+uploads_router = APIRouter()
+
+SHA256_PATTERN = r"^[0-9a-f]{64}$"
+_HASHED_NAME = re.compile(r"^[0-9a-f]{64}(_[a-z]+)?$")
+
+# ------------------------
+# Thumbnail / preview of photo evidence
+# ------------------------
+@router.get("/evidence/{sha256}/{variant}")
+async def get_evidence_variant(
+    request: Request,
+    variant: str,
+    # Validated before it is used to build any path under uploads/
+    sha256: str = Path(..., pattern=SHA256_PATTERN, description="Lowercase hex SHA-256 of the evidence file"),
+):
+    if variant not in VARIANTS:
+        raise HTTPException(status_code=404, detail="Unknown variant")
+
+    path = variant_path(sha256, variant)
+    if not os.path.exists(path):
+        # Not rendered yet (or the background job was lost): render it now
+        source_path = await blob_store.get_path(sha256)
+        if not source_path or not is_image(source_path) or not os.path.exists(source_path):
+            raise HTTPException(status_code=404, detail="Evidence image not found")
+        try:
+            await thumbnail_worker.ensure(sha256, source_path)
+        except Exception as e:
+            print(f"❌ Error rendering {variant} for {sha256}:", e)
+            raise HTTPException(status_code=415, detail="Evidence file is not a readable image")
+
+    return await file_response(request, path, "image/webp", content_hash=f"{sha256}_{variant}")
+
+# ------------------------
+# Uploaded files (ETag, 304 and Range support)
+# ------------------------
+@uploads_router.api_route("/uploads/{file_path:path}", methods=["GET", "HEAD"])
+async def serve_upload(request: Request, file_path: str):
+    root = os.path.realpath(UPLOAD_ROOT)
+    full_path = os.path.realpath(os.path.join(root, file_path))
+    in_progress = os.path.dirname(full_path) == os.path.join(root, "blobs", "tmp") or full_path.endswith(".part")
+    if not full_path.startswith(root + os.sep) or in_progress or not os.path.isfile(full_path):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # Blob and thumbnail names already carry their content hash
+    stem = os.path.splitext(os.path.basename(full_path))[0]
+    content_hash = stem if _HASHED_NAME.match(stem) else None
+
+    media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    return await file_response(request, full_path, media_type, content_hash=content_hash)
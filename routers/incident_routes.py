@@ -1,18 +1,30 @@
 # routers/incident_routes.py
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, status
-from typing import List, Optional, Any
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from typing import List, Literal, Optional, Any
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 import datetime
 from pydantic import BaseModel, Field, EmailStr, BeforeValidator, field_validator, model_validator, ValidationError
 from typing_extensions import Annotated
-import shutil
 import os
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
 from dotenv import load_dotenv
+import json
 import re
 
+from database.connection import REPORTS_DATABASE_NAME, REPORTS_MONGO_URI
+from database.counters import SequenceAllocator
+from database.pagination import InvalidCursor, encode_cursor, keyset_filter, keyset_sort, merge_filters
+from utils.blob_store import blob_store
+from utils.geocoding import GeocodingCache, make_backend
+from utils.http_cache import json_response
+from utils.jobs import JobQueue
+from utils.serialization import aiter_lines, dumps
+from utils.thumbnails import thumbnail_worker, variant_urls
+from utils.uploads import UploadTooLarge, safe_extension
+
 # router = APIRouter()  # <--- هذا هو التعريف الصحيح للراوتر
 router = APIRouter(tags=["Incident Reports"]) # يمكنك إضافة tags هنا
 
@@ -29,20 +41,35 @@ load_dotenv()
 # )
 
 # تفاصيل الاتصال بقاعدة بيانات MongoDB
-MONGO_DETAILS = os.getenv("MONGODB_URI")
+MONGO_DETAILS = REPORTS_MONGO_URI
 if not MONGO_DETAILS:
     raise RuntimeError("MONGODB_URI غير موجود في ملف .env. يرجى التأكد من تعيينه.")
 
 client = AsyncIOMotorClient(MONGO_DETAILS)
-db = client.human_rights_monitor
+db = client[REPORTS_DATABASE_NAME]
 collection = db.incident_reports
 
+# Report IDs come from an atomic per-year counter; numbers start at REPORT_ID_BASE + 1.
+# REPORT_ID_BLOCK_SIZE > 1 lets each worker lease IDs in blocks (fewer round trips,
+# but IDs from different workers are not issued in submission order).
+REPORT_ID_BASE = 1000
+REPORT_ID_BLOCK_SIZE = int(os.getenv("REPORT_ID_BLOCK_SIZE", "1"))
+report_id_sequence = SequenceAllocator(db.counters, block_size=REPORT_ID_BLOCK_SIZE)
+
+# Above this many matches an estimated total stops counting (see list_reports)
+TOTAL_COUNT_CAP = 10_000
+
+# Background work after a report is stored (see enrich_report); started by main.py
+report_jobs = JobQueue(db.jobs)
+
 # تحديد مجلد لرفع الملفات والتأكد من وجوده (يمكن نقل هذا لـ main.py أيضًا إذا أردت مركزية أكبر)
 UPLOAD_FOLDER = "./uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 # تهيئة Geocoder
-geolocator = Nominatim(user_agent="hr_monitor_app")
+# Answers are cached per rounded coordinate cell, in memory and in the geocode_cache collection
+# (GEOCODER_BACKEND selects Nominatim or the offline boundary lookup)
+geocoder = GeocodingCache(db.geocode_cache, make_backend(user_agent="hr_monitor_app"))
 
 # --- Pydantic Models للتحقق من البيانات ---
 # (كل نماذج Pydantic الخاصة بك كما هي)
@@ -103,6 +130,19 @@ class ReportEvidence(BaseModel):
     type: str
     url: str
     description: Optional[str] = None
+    sha256: Optional[str] = None  # key of the file in the content-addressed blob store
+    size: Optional[int] = None
+    thumbnail_url: Optional[str] = None
+    preview_url: Optional[str] = None
+
+class ReportEnrichmentError(BaseModel):
+    sha256: str
+    error: str
+
+class ReportEnrichment(BaseModel):
+    job_id: str
+    status: str = "pending"  # pending -> done, partial or failed; job-level failures are recorded on the job
+    errors: Optional[List[ReportEnrichmentError]] = None  # photos whose thumbnails could not be rendered
 
 class IncidentReport(BaseModel):
     id: Optional[str] = Field(default=None, alias="_id")
@@ -114,6 +154,8 @@ class IncidentReport(BaseModel):
     evidence: List[ReportEvidence] = []
     status: str = "new"
     assigned_to: Optional[str] = None
+    source_report_id: Optional[str] = None  # ID in the partner's system for imported reports
+    enrichment: Optional[ReportEnrichment] = None
     created_at: datetime.datetime = Field(default_factory=lambda: datetime.datetime.now(datetime.timezone.utc))
 
     class Config:
@@ -161,42 +203,100 @@ class IncidentReport(BaseModel):
 class ReportStatusUpdate(BaseModel):
     status: str = Field(..., pattern="^(new|in_progress|closed|resolved|on_hold)$", description="Status of the report")
 
+# --- Fast read path ---
+# Reports are only written through the models above, so reads trust the stored
+# shape: a document is turned into the response JSON directly (defaults filled
+# in, _id as a string) instead of running IncidentReport.model_validate and then
+# response_model validation again. Keep these field lists in step with the models.
+# Documents missing a required field still go through the model.
+REQUIRED_REPORT_FIELDS = ("report_id", "reporter_type", "incident_details")
+CONTACT_FIELDS = ("email", "phone", "preferred_contact")
+EVIDENCE_FIELDS = ("type", "url", "description", "sha256", "size", "thumbnail_url", "preview_url")
+
+
+def report_to_json(doc: dict) -> Optional[dict]:
+    """
+    Returns the same dict as IncidentReport.model_validate(doc).model_dump(by_alias=True),
+    with datetimes left for utils.serialization.dumps. None if the document is invalid.
+    """
+    details = doc.get("incident_details")
+    if not isinstance(details, dict) or any(field not in doc for field in REQUIRED_REPORT_FIELDS):
+        return _validated_report_json(doc)
+
+    location = details.get("location") or {}
+    contact = doc.get("contact_info")
+    return {
+        "_id": str(doc["_id"]) if "_id" in doc else None,
+        "report_id": doc["report_id"],
+        "reporter_type": doc["reporter_type"],
+        "anonymous": doc.get("anonymous", False),
+        "contact_info": {field: contact.get(field) for field in CONTACT_FIELDS} if contact else None,
+        "incident_details": {
+            "date": details.get("date"),
+            "location": {
+                "country": location.get("country"),
+                "city": location.get("city"),
+                "coordinates": location.get("coordinates"),
+            },
+            "description": details.get("description"),
+            "violation_types": details.get("violation_types", []),
+        },
+        "evidence": [{field: item.get(field) for field in EVIDENCE_FIELDS} for item in doc.get("evidence") or []],
+        "status": doc.get("status", "new"),
+        "assigned_to": doc.get("assigned_to"),
+        "source_report_id": doc.get("source_report_id"),
+        "enrichment": doc.get("enrichment"),
+        "created_at": doc.get("created_at"),
+    }
+
+
+def _validated_report_json(doc: dict) -> Optional[dict]:
+    doc = dict(doc)
+    if "_id" in doc:
+        doc["id"] = str(doc.pop("_id"))
+    try:
+        return IncidentReport.model_validate(doc).model_dump(mode="json", by_alias=True)
+    except ValidationError as e:
+        print(f"Validation error for document: {doc} - Error: {e}")
+        return None
+
+
+def reports_response(payload, headers: dict = None) -> Response:
+    """JSON response built with the fast encoder; bypasses response_model validation."""
+    return Response(content=dumps(payload), media_type="application/json", headers=headers)
+
 # --- وظائف مساعدة (كما هي) ---
+def report_id_sequence_name(year: int) -> str:
+    return f"incident_report_id:{year}"
+
+
 async def generate_report_id():
+    """Allocates the next IR-<year>-<number> from this year's counter (first ID is IR-<year>-1001)."""
     current_year = datetime.datetime.now(datetime.timezone.utc).year
-    latest_report = await collection.find_one(
-        {"report_id": {"$regex": r"^IR-\d{4}-\d+$"}},
-        sort=[("report_id", -1)]
-    )
+    seq = await report_id_sequence.next(report_id_sequence_name(current_year))
+    return f"IR-{current_year}-{REPORT_ID_BASE + seq}"
 
-    if latest_report and "report_id" in latest_report:
-        match = re.search(r"IR-(\d{4})-(\d+)", latest_report["report_id"])
-        if match and int(match.group(1)) == current_year:
-            last_number = int(match.group(2))
-            new_number = last_number + 1
-            return f"IR-{current_year}-{new_number}"
 
-    return f"IR-{current_year}-1001"
+async def sync_report_id_counter():
+    """
+    Moves this year's counter past the highest existing report ID, so reports
+    created before the counter existed are never handed out again. Run at startup.
+    """
+    current_year = datetime.datetime.now(datetime.timezone.utc).year
+    prefix = f"IR-{current_year}-"
+    pipeline = [
+        {"$match": {"report_id": {"$regex": "^" + re.escape(prefix) + r"\d+$"}}},
+        {"$project": {"number": {"$toLong": {"$substrCP": ["$report_id", len(prefix), 20]}}}},
+        {"$group": {"_id": None, "last": {"$max": "$number"}}},
+    ]
+    result = await collection.aggregate(pipeline).to_list(length=1)
+    last_number = (result[0]["last"] or 0) if result else 0
+    if last_number > REPORT_ID_BASE:
+        await report_id_sequence.ensure_at_least(report_id_sequence_name(current_year),
+                                                 last_number - REPORT_ID_BASE)
 
-async def reverse_geocode(latitude: float, longitude: float):
-    try:
-        location = geolocator.reverse((latitude, longitude), language='en', timeout=10)
-        if location and location.raw and 'address' in location.raw:
-            address = location.raw['address']
-            city_name = address.get("city") or address.get("town") or \
-                        address.get("village") or address.get("state") or \
-                        address.get("county")
-            return {
-                "country": address.get("country", "Unknown"),
-                "city": city_name
-            }
-    except GeocoderTimedOut:
-        print(f"Geocoder timed out for coordinates: {latitude}, {longitude}")
-        return {"country": "Unknown", "city": None}
-    except Exception as e:
-        print(f"An error occurred during geocoding for coordinates {latitude}, {longitude}: {e}")
-        return {"country": "Unknown", "city": None}
-    return {"country": "Unknown", "city": None}
+async def reverse_geocode(latitude: float, longitude: float, raise_errors: bool = False):
+    return await geocoder.reverse(latitude, longitude, raise_errors=raise_errors)
 
 # --- نقاط نهاية الـ API (تعديل: استخدام 'router' بدلاً من 'app') ---
 
@@ -218,28 +318,27 @@ async def create_report(
 ):
     """
     Creates a new incident report in the database, handling form data and file uploads.
+
+    Only validation, file storage and the insert happen in the request. Reverse
+    geocoding of missing country/city and thumbnail rendering run afterwards as
+    an `enrich_report` background job, tracked in `enrichment` and GET /jobs/{job_id}.
     """
     # ... بقية الكود كما هي ولكن باستخدام router.post بدلاً من app.post
     violation_list = [v.strip() for v in violation_types.split(",") if v.strip()]
 
-    location_info_from_coords = await reverse_geocode(latitude, longitude)
-    resolved_country = location_info_from_coords["country"]
-    resolved_city = location_info_from_coords["city"]
-
-    if country and country.strip() and country.strip().lower() != resolved_country.lower():
-        resolved_country = country.strip()
-    
-    if city and city.strip() and city.strip().lower() != (resolved_city or '').lower():
-        resolved_city = city.strip()
-
-    report_id = await generate_report_id()
-
     contact_info_data = None
     if not anonymous:
         if not email and not phone:
             raise HTTPException(status_code=400, detail="Email or phone is required if not submitting anonymously.")
         contact_info_data = ContactInfo(email=email, phone=phone, preferred_contact=preferred_contact)
 
+    # Values typed by the reporter win; the enrichment job geocodes the rest
+    resolved_country = country.strip() if country and country.strip() else None
+    resolved_city = city.strip() if city and city.strip() else None
+    to_geocode = [field for field, value in (("country", resolved_country), ("city", resolved_city)) if not value]
+
+    report_id = await generate_report_id()
+
     incident_report_data = IncidentReport(
         report_id=report_id,
         reporter_type=reporter_type,
@@ -248,7 +347,7 @@ async def create_report(
         incident_details=IncidentDetails(
             date=date,
             location=Location(
-                country=resolved_country,
+                country=resolved_country or "Unknown",
                 city=resolved_city,
                 coordinates=Coordinates(type="Point", coordinates=[longitude, latitude])
             ),
@@ -260,60 +359,304 @@ async def create_report(
         created_at=datetime.datetime.now(datetime.timezone.utc)
     )
 
-    if files:
-        for file in files:
-            file_extension = ""
-            if "." in file.filename:
-                base_name, file_extension = os.path.splitext(file.filename)
-                file_extension = file_extension.lower().strip()
-                sanitized_base_name = re.sub(r'[^\w\s.-]', '', base_name).strip()
-            else:
-                sanitized_base_name = re.sub(r'[^\w\s.-]', '', file.filename).strip()
-
-            if not sanitized_base_name:
-                sanitized_base_name = "uploaded_file"
-            
-            unique_filename = f"{report_id}_{datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')}_{sanitized_base_name}{file_extension}"
-            file_location = os.path.join(UPLOAD_FOLDER, unique_filename)
+    renders = []
+    acquired = []  # blob references taken by this request
+    try:
+        if files:
+            for file in files:
+                file_extension = safe_extension(file.filename)
 
-            try:
-                with open(file_location, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
-            except Exception as e:
-                print(f"Error saving file {file.filename}: {e}")
-                raise HTTPException(status_code=500, detail=f"Could not save file {file.filename}: {e}")
-            finally:
-                file.file.close()
-
-            ftype = "document"
-            if file_extension in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
-                ftype = "photo"
-            elif file_extension in [".mp4", ".avi", ".mov", ".webm", ".flv"]:
-                ftype = "video"
-
-            incident_report_data.evidence.append(
-                ReportEvidence(
-                    type=ftype,
-                    url=f"/uploads/{unique_filename}",
-                    description=file.filename
+                try:
+                    blob = await blob_store.put_upload(file)
+                    acquired.append(blob["sha256"])
+                except UploadTooLarge as e:
+                    raise HTTPException(status_code=413, detail=f"{file.filename}: {e}")
+                except Exception as e:
+                    print(f"Error saving file {file.filename}: {e}")
+                    raise HTTPException(status_code=500, detail=f"Could not save file {file.filename}: {e}")
+                finally:
+                    await file.close()
+
+                ftype = "document"
+                if file_extension in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
+                    ftype = "photo"
+                elif file_extension in [".mp4", ".avi", ".mov", ".webm", ".flv"]:
+                    ftype = "video"
+
+                thumbnails = {}
+                if ftype == "photo":
+                    renders.append({"sha256": blob["sha256"], "path": blob["path"]})
+                    thumbnails = variant_urls(blob["sha256"])
+
+                incident_report_data.evidence.append(
+                    ReportEvidence(
+                        type=ftype,
+                        url=blob["url"],
+                        description=file.filename,
+                        sha256=blob["sha256"],
+                        size=blob["size"],
+                        **thumbnails
+                    )
                 )
-            )
 
-    report_dict_to_insert = incident_report_data.model_dump(by_alias=True, exclude_none=True)
-    if "_id" in report_dict_to_insert and report_dict_to_insert["_id"] is None:
-        del report_dict_to_insert["_id"]
+        job_id = None
+        if to_geocode or renders:
+            job_id = str(ObjectId())
+            incident_report_data.enrichment = ReportEnrichment(job_id=job_id)
 
-    result = await collection.insert_one(report_dict_to_insert)
+        report_dict_to_insert = incident_report_data.model_dump(by_alias=True, exclude_none=True)
+        if "_id" in report_dict_to_insert and report_dict_to_insert["_id"] is None:
+            del report_dict_to_insert["_id"]
 
-    created_report_doc = await collection.find_one({"_id": result.inserted_id})
-    if not created_report_doc:
-        raise HTTPException(status_code=500, detail="Failed to retrieve created report after insertion.")
+        result = await collection.insert_one(report_dict_to_insert)
+    except BaseException:
+        # The report was not stored, so nothing refers to its files
+        for sha256 in acquired:
+            await blob_store.release(sha256)
+        raise
 
-    if '_id' in created_report_doc:
-        created_report_doc['id'] = str(created_report_doc['_id'])
-        del created_report_doc['_id']
+    if job_id:
+        try:
+            await report_jobs.enqueue("enrich_report", {
+                "report_id": report_id,
+                "latitude": latitude,
+                "longitude": longitude,
+                "geocode": to_geocode,
+                "renders": renders,
+            }, job_id=job_id)
+        except Exception as e:
+            # The report is stored; only its enrichment is lost
+            print(f"❌ Error queueing enrichment for report {report_id}:", e)
+
+    # Answer from the validated model instead of reading the report back
+    incident_report_data.id = str(result.inserted_id)
+    return incident_report_data
+
+
+# --- Background enrichment ---
+@report_jobs.handler("enrich_report")
+async def enrich_report(payload: dict):
+    """
+    Fills in geocoded country/city, then renders photo thumbnails for a new report.
+
+    The location is saved before any rendering. Each photo is rendered on its
+    own: unreadable ones are listed in enrichment.errors and the status becomes
+    "partial" (or "failed" if nothing succeeded) instead of failing the job.
+    A failed geocoder lookup leaves the location untouched and fails the job
+    after rendering, so the queue retries it (and marks the job failed once the
+    attempts run out).
+    """
+    report_filter = {"report_id": payload["report_id"]}
+    location = {}
+    geocode_error = None
+    if payload.get("geocode"):
+        try:
+            place = await reverse_geocode(payload["latitude"], payload["longitude"], raise_errors=True)
+        except Exception as e:
+            geocode_error = e
+        else:
+            for field in payload["geocode"]:
+                location[f"incident_details.location.{field}"] = place.get(field)
+                if field == "country" and not place.get(field):
+                    location[f"incident_details.location.{field}"] = "Unknown"
+            result = await collection.update_one(report_filter, {"$set": location})
+            if result.matched_count == 0:
+                raise LookupError(f"report {payload['report_id']} not found")
+
+    renders = payload.get("renders", [])
+    errors = []
+    for render in renders:
+        try:
+            await thumbnail_worker.ensure(render["sha256"], render["path"])
+        except Exception as e:
+            print(f"❌ Error rendering thumbnails of {render['sha256']} for report {payload['report_id']}:", e)
+            errors.append({"sha256": render["sha256"], "error": str(e)})
+
+    if geocode_error is not None:
+        if errors:
+            await collection.update_one(report_filter, {"$set": {"enrichment.errors": errors}})
+        raise RuntimeError(f"geocoding failed: {geocode_error}") from geocode_error
+
+    if not errors:
+        status = "done"
+    elif location or len(errors) < len(renders):
+        status = "partial"
+    else:
+        status = "failed"
+    updates = {"enrichment.status": status}
+    if errors:
+        updates["enrichment.errors"] = errors
+    result = await collection.update_one(report_filter, {"$set": updates})
+    if result.matched_count == 0:
+        raise LookupError(f"report {payload['report_id']} not found")
+
+    summary = {key.rsplit(".", 1)[-1]: value for key, value in location.items()}
+    summary["status"] = status
+    if errors:
+        summary["errors"] = errors
+    return summary
+
+
+# --- Bulk import (NDJSON) ---
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
 
-    return IncidentReport.model_validate(created_report_doc)
+
+def _parse_import_line(raw: bytes):
+    """
+    Validates one NDJSON line against IncidentReport.
+    Returns (report, fields to geocode). A supplied report_id is kept as
+    source_report_id; the real ID is allocated at insert time.
+    """
+    item = json.loads(raw)
+    if not isinstance(item, dict):
+        raise ValueError("each line must be a JSON object")
+
+    item.pop("_id", None)
+    item.pop("id", None)
+    if item.get("report_id") and not item.get("source_report_id"):
+        item["source_report_id"] = item["report_id"]
+    item["report_id"] = "pending"
+
+    # Coordinates without a resolved country/city are geocoded after the insert
+    location = (item.get("incident_details") or {}).get("location")
+    to_geocode = []
+    if isinstance(location, dict) and location.get("country") in (None, "", "Unknown"):
+        location["country"] = "Unknown"
+        to_geocode = ["country"] if location.get("city") else ["country", "city"]
+    return IncidentReport.model_validate(item), to_geocode
+
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+async def _skip_imported(batch, summary, seen_source_ids):
+    """Drops entries whose source_report_id was already imported (stored, or earlier in this body)."""
+    source_ids = [report.source_report_id for _, report, _ in batch if report.source_report_id]
+    existing = set()
+    if source_ids:
+        cursor = collection.find({"source_report_id": {"$in": source_ids}}, {"_id": 0, "source_report_id": 1})
+        existing = {doc["source_report_id"] async for doc in cursor}
+
+    kept = []
+    for entry in batch:
+        source_id = entry[1].source_report_id
+        if source_id and (source_id in existing or source_id in seen_source_ids):
+            summary["duplicates"] += 1
+            continue
+        if source_id:
+            seen_source_ids.add(source_id)
+        kept.append(entry)
+    return kept
+
+
+async def _insert_import_batch(batch, summary, errors, seen_source_ids):
+    """Allocates IDs for (line, report, to_geocode) entries in one $inc and writes them with one insert_many."""
+    batch = await _skip_imported(batch, summary, seen_source_ids)
+    if not batch:
+        return
+
+    current_year = datetime.datetime.now(datetime.timezone.utc).year
+    numbers = await report_id_sequence.next_many(report_id_sequence_name(current_year), len(batch))
+
+    documents, enrich = [], []
+    for (line_number, report, to_geocode), seq in zip(batch, numbers):
+        report.report_id = f"IR-{current_year}-{REPORT_ID_BASE + seq}"
+        if to_geocode:
+            report.enrichment = ReportEnrichment(job_id=str(ObjectId()))
+            enrich.append((report, to_geocode))
+        document = report.model_dump(by_alias=True, exclude_none=True)
+        document.pop("_id", None)
+        documents.append(document)
+
+    failed = {}
+    try:
+        await collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        # Unordered: every document without an error was still written
+        for write_error in e.details.get("writeErrors", []):
+            failed[write_error["index"]] = write_error
+
+    for position, (line_number, report, _) in enumerate(batch):
+        write_error = failed.get(position)
+        if write_error is None:
+            summary["inserted"] += 1
+        elif write_error.get("code") == DUPLICATE_KEY_ERROR and "source_report_id" in (write_error.get("keyPattern") or {}):
+            # Imported concurrently by another request
+            summary["duplicates"] += 1
+        else:
+            summary["failed"] += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "error": write_error.get("errmsg")})
+
+    failed_ids = {batch[position][1].report_id for position in failed}
+    payloads, job_ids = [], []
+    for report, to_geocode in enrich:
+        if report.report_id in failed_ids:
+            continue
+        coordinates = report.incident_details.location.coordinates.coordinates
+        payloads.append({
+            "report_id": report.report_id,
+            "longitude": coordinates[0],
+            "latitude": coordinates[1],
+            "geocode": to_geocode,
+            "renders": [],
+        })
+        job_ids.append(report.enrichment.job_id)
+    await report_jobs.enqueue_many("enrich_report", payloads, job_ids)
+    summary["geocoding_queued"] += len(payloads)
+
+
+@router.post("/reports/import", response_model=dict)
+async def import_reports(request: Request):
+    """
+    Imports incident reports from an NDJSON body (one IncidentReport-shaped object per line).
+
+    The body is read as a stream and written in batches of IMPORT_BATCH_SIZE,
+    each with its report IDs reserved by a single counter update. Reports whose
+    location already has a country are stored as-is; the others are geocoded by
+    background jobs. Returns counts and per-line errors (1-based line numbers
+    within the body, first MAX_REPORTED_ERRORS only). Reports whose
+    source_report_id was imported before are skipped and counted as duplicates,
+    so re-running an import is safe.
+    """
+    summary = {"total": 0, "inserted": 0, "duplicates": 0, "invalid": 0, "failed": 0, "geocoding_queued": 0}
+    errors, batch, seen_source_ids = [], [], set()
+    try:
+        line_number = 0
+        async for raw in aiter_lines(request.stream()):
+            line_number += 1
+            if not raw.strip():
+                continue
+            summary["total"] += 1
+            try:
+                report, to_geocode = _parse_import_line(raw)
+                batch.append((line_number, report, to_geocode))
+            except (ValidationError, ValueError) as e:
+                summary["invalid"] += 1
+                message = _validation_message(e) if isinstance(e, ValidationError) else f"Invalid JSON: {e}"
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"line": line_number, "error": message})
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await _insert_import_batch(batch, summary, errors, seen_source_ids)
+                batch = []
+                print(f"📥 Report import: {summary}")
+
+        if batch:
+            await _insert_import_batch(batch, summary, errors, seen_source_ids)
+    except Exception as e:
+        print("❌ Error in POST /reports/import:", e)
+        raise HTTPException(status_code=500, detail=f"Import stopped after {summary['inserted']} reports: {e}")
+
+    return {"message": "Import finished", **summary, "errors": errors,
+            "errors_truncated": summary["invalid"] + summary["failed"] > len(errors)}
 
 
 @router.get("/reports/", response_model=List[IncidentReport])
@@ -322,11 +665,19 @@ async def list_reports(
     start_date: Optional[datetime.date] = Query(None, description="Filter reports created on or after this date (YYYY-MM-DD)"),
     end_date: Optional[datetime.date] = Query(None, description="Filter reports created on or before this date (YYYY-MM-DD)"),
     country: Optional[str] = Query(None, description="Filter reports by country"),
-    skip: int = Query(0, ge=0, description="Number of reports to skip for pagination"),
-    limit: int = Query(20, ge=1, le=100, description="Maximum number of reports to return")
+    skip: int = Query(0, ge=0, description="Deprecated offset paging; ignored when `cursor` is given"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of reports to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    total: Optional[Literal["estimated", "exact"]] = Query(None, description="Also return the number of matching reports in X-Total-Count")
 ):
     """
-    Retrieves a list of incident reports, with optional filtering and pagination.
+    Retrieves a list of incident reports, newest first, with optional filtering.
+
+    Pages are keyset-based on (created_at, _id): when more reports follow, the
+    token for the next page is returned in the `X-Next-Cursor` header.
+    `total=exact` counts every match; `total=estimated` uses collection metadata
+    without filters and a count capped at TOTAL_COUNT_CAP with them
+    (`X-Total-Exact` says which one was returned).
     """
     # ... بقية الكود كما هي ولكن باستخدام router.get بدلاً من app.get
     query = {}
@@ -345,18 +696,38 @@ async def list_reports(
     if country:
         query["incident_details.location.country"] = country
 
-    cursor = collection.find(query).skip(skip).limit(limit)
-    results = []
-    async for doc in cursor:
-        try:
-            if '_id' in doc:
-                doc['id'] = str(doc['_id'])
-                del doc['_id']
-            results.append(IncidentReport.model_validate(doc))
-        except ValidationError as e:
-            print(f"Validation error for document: {doc} - Error: {e}")
-            continue
-    return results
+    headers = {}
+    if total:
+        count, exact = await count_reports(query, total)
+        headers["X-Total-Count"] = str(count)
+        headers["X-Total-Exact"] = "true" if exact else "false"
+
+    try:
+        page_query = merge_filters(query, keyset_filter("created_at", cursor))
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    docs_cursor = collection.find(page_query).sort(keyset_sort("created_at"))
+    if skip and not cursor:
+        docs_cursor = docs_cursor.skip(skip)
+    docs = await docs_cursor.limit(limit + 1).to_list(length=None)
+
+    if len(docs) > limit:
+        docs = docs[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(docs[-1].get("created_at"), docs[-1]["_id"])
+
+    results = [report for report in map(report_to_json, docs) if report is not None]
+    return reports_response(results, headers)
+
+
+async def count_reports(query: dict, mode: str):
+    """Returns (count, exact) for list_reports' X-Total-Count header."""
+    if mode == "estimated":
+        if not query:
+            return await collection.estimated_document_count(), False
+        count = await collection.count_documents(query, limit=TOTAL_COUNT_CAP)
+        return count, count < TOTAL_COUNT_CAP
+    return await collection.count_documents(query), True
 
 
 @router.get("/reports/analytics", response_model=List[dict])
@@ -377,22 +748,81 @@ async def reports_analytics():
     return [{"violation_type": r["_id"], "count": r["count"]} for r in agg_result]
 
 
+@router.get("/reports/suggest", response_model=List[dict])
+async def suggest_reports(
+    q: str = Query(..., min_length=1, description="Prefix of a report ID, e.g. 'IR-2025-10'"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Returns up to `limit` reports whose report_id starts with `q`.
+    Report IDs are upper case, so the prefix is upper-cased and matched with an
+    anchored regex that walks the unique report_id index.
+    """
+    prefix = q.strip().upper()
+    if not prefix:
+        return []
+    projection = {"_id": 0, "report_id": 1, "status": 1, "incident_details.location.country": 1}
+    cursor = (
+        collection.find({"report_id": {"$regex": "^" + re.escape(prefix)}}, projection)
+        .sort("report_id", 1)
+        .limit(limit)
+    )
+    return [
+        {
+            "report_id": doc["report_id"],
+            "status": doc.get("status"),
+            "country": doc.get("incident_details", {}).get("location", {}).get("country"),
+        }
+        async for doc in cursor
+    ]
+
+
+@router.get("/geocode/reverse", response_model=dict)
+async def geocode_reverse(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180)
+):
+    """
+    Resolves coordinates to {"country", "city"} with the configured backend and cache,
+    so clients (e.g. the report form's map) do not need their own geocoder.
+    """
+    return await reverse_geocode(latitude, longitude)
+
+
+@router.get("/jobs/{job_id}", response_model=dict)
+async def get_job(job_id: str):
+    """
+    Status of a background job (queued, running, done or failed), e.g. the
+    enrichment job whose ID a new report carries in `enrichment.job_id`.
+    """
+    job = await report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jsonable_encoder(job)
+
+
+@router.get("/geocoding/stats", response_model=dict)
+async def geocoding_stats():
+    """
+    Hit rate of the reverse geocoding cache in this worker process
+    (memory LRU hits, persistent Mongo hits, and misses that reached the geocoder).
+    """
+    return geocoder.stats()
+
+
 @router.get("/reports/{report_id}", response_model=IncidentReport)
-async def get_report_by_id(report_id: str):
+async def get_report_by_id(request: Request, report_id: str):
     """
     Retrieves a single incident report by its unique report ID.
+    Sends an ETag and answers 304 Not Modified when the client's copy is current.
     """
     # ... بقية الكود كما هي ولكن باستخدام router.get بدلاً من app.get
     report = await collection.find_one({"report_id": report_id})
     if report:
-        try:
-            if '_id' in report:
-                report['id'] = str(report['_id'])
-                del report['_id']
-            return IncidentReport.model_validate(report)
-        except ValidationError as e:
-            print(f"Validation error for report {report_id}: {report} - Error: {e}")
+        payload = report_to_json(report)
+        if payload is None:
             raise HTTPException(status_code=500, detail="Failed to parse report data.")
+        return json_response(request, payload)
     raise HTTPException(status_code=404, detail="Report not found")
 
 
@@ -402,27 +832,22 @@ async def update_report_status(report_id: str, status_update: ReportStatusUpdate
     Updates the status of an existing incident report.
     """
     # ... بقية الكود كما هي ولكن باستخدام router.patch بدلاً من app.patch
-    existing_report = await collection.find_one({"report_id": report_id})
-    if not existing_report:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
-
-    result = await collection.update_one(
-        {"report_id": report_id},
-        {"$set": {"status": status_update.status}}
+    # One round trip: update and read back together, only if the status changes
+    updated_report_doc = await collection.find_one_and_update(
+        {"report_id": report_id, "status": {"$ne": status_update.status}},
+        {"$set": {"status": status_update.status}},
+        return_document=ReturnDocument.AFTER
     )
 
-    if result.modified_count == 0:
+    if not updated_report_doc:
+        if not await collection.count_documents({"report_id": report_id}, limit=1):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Report status not updated. Perhaps the status is already the same or report not found."
         )
 
-    updated_report_doc = await collection.find_one({"report_id": report_id})
-    if not updated_report_doc:
+    payload = report_to_json(updated_report_doc)
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve updated report.")
-
-    if '_id' in updated_report_doc:
-        updated_report_doc['id'] = str(updated_report_doc['_id'])
-        del updated_report_doc['_id']
-
-    return IncidentReport.model_validate(updated_report_doc)
+    return reports_response(payload)
@@ -0,0 +1,22 @@
+"""
+Deletes evidence blobs (uploads/blobs) that no evidence entry references any more.
+
+    python sweep_blobs.py
+
+The API already does this every BLOB_SWEEP_INTERVAL_MINUTES (default 60);
+run it by hand to reclaim space right away, or schedule it when the periodic
+sweep is disabled (BLOB_SWEEP_INTERVAL_MINUTES=0). Safe while the API is
+running.
+"""
+import asyncio
+
+from utils.blob_store import blob_store
+
+
+async def main():
+    removed = await blob_store.sweep()
+    print(f"✅ Deleted {removed} unreferenced blobs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+import asyncio
+import mimetypes
+import os
+import uuid
+from datetime import datetime
+
+from fastapi import UploadFile
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
+
+from database.connection import async_db
+from utils.uploads import MAX_UPLOAD_BYTES, safe_extension, stream_upload_to_file
+
+UPLOAD_ROOT = "uploads"
+BLOB_DIR = "blobs"
+# How often the API deletes unreferenced blobs; 0 disables the periodic sweep
+BLOB_SWEEP_INTERVAL_MINUTES = int(os.getenv("BLOB_SWEEP_INTERVAL_MINUTES", "60"))
+
+
+def blob_relpath(sha256: str, extension: str = "") -> str:
+    """blobs/ab/cd/abcd...<ext>: two levels of fan-out keep directories small."""
+    return "/".join([BLOB_DIR, sha256[:2], sha256[2:4], f"{sha256}{extension}"])
+
+
+class BlobStore:
+    """
+    Content-addressed evidence store.
+
+    Files live under uploads/blobs keyed by their SHA-256, so identical uploads
+    share one file on disk. The `blobs` collection keeps one record per file
+    with a reference count of the evidence entries pointing at it.
+    """
+
+    def __init__(self, collection, root: str = UPLOAD_ROOT):
+        self.collection = collection
+        self.root = root
+        self.tmp_dir = os.path.join(root, BLOB_DIR, "tmp")
+        self._sweeper = None
+
+    def path_for(self, relpath: str) -> str:
+        return os.path.join(self.root, *relpath.split("/"))
+
+    async def put_upload(self, file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> dict:
+        """Stores an upload (or re-uses an existing identical blob) and takes a reference to it."""
+        await run_in_threadpool(os.makedirs, self.tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(self.tmp_dir, uuid.uuid4().hex)
+        size, sha256 = await stream_upload_to_file(file, tmp_path, max_bytes)
+
+        extension = safe_extension(file.filename)
+        try:
+            record = await self._add_reference(sha256, {
+                "path": blob_relpath(sha256, extension),
+                "size": size,
+                "content_type": mimetypes.guess_type(file.filename or "")[0],
+                "created_at": datetime.utcnow(),
+            })
+            final_path = self.path_for(record["path"])
+            # A first reference always writes its file, so a concurrent sweep() of
+            # the previous record for this content cannot leave it without one
+            deduplicated = record["refs"] > 1 and await run_in_threadpool(os.path.exists, final_path)
+            if deduplicated:
+                await run_in_threadpool(os.remove, tmp_path)
+            else:
+                await run_in_threadpool(os.makedirs, os.path.dirname(final_path), exist_ok=True)
+                await run_in_threadpool(os.replace, tmp_path, final_path)
+        except BaseException:
+            if await run_in_threadpool(os.path.exists, tmp_path):
+                await run_in_threadpool(os.remove, tmp_path)
+            raise
+
+        return {
+            "sha256": sha256,
+            "size": size,
+            "url": f"/{self.root}/{record['path']}",
+            "path": final_path,
+            "content_type": record.get("content_type"),
+            "deduplicated": deduplicated,
+        }
+
+    async def _add_reference(self, sha256: str, metadata: dict) -> dict:
+        update = {"$inc": {"refs": 1}, "$setOnInsert": metadata}
+        try:
+            return await self.collection.find_one_and_update(
+                {"_id": sha256}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lost an upsert race with an identical upload; the record exists now
+            return await self.collection.find_one_and_update(
+                {"_id": sha256}, update, return_document=ReturnDocument.AFTER
+            )
+
+    async def get_path(self, sha256: str):
+        """Local path of a stored blob, or None if it is unknown."""
+        record = await self.collection.find_one({"_id": sha256}, {"path": 1})
+        return self.path_for(record["path"]) if record else None
+
+    async def retain(self, sha256: str) -> bool:
+        """Takes one more reference to an existing blob (e.g. an evidence entry copied to a new place)."""
+        result = await self.collection.update_one({"_id": sha256}, {"$inc": {"refs": 1}})
+        return result.modified_count == 1
+
+    async def release(self, sha256: str):
+        """
+        Drops one reference. Unreferenced blobs are left on disk for sweep(),
+        so a concurrent upload of the same content never loses its file.
+        """
+        await self.collection.update_one({"_id": sha256, "refs": {"$gt": 0}}, {"$inc": {"refs": -1}})
+
+    async def sweep(self) -> int:
+        """Deletes blobs that no evidence entry references any more; safe to run during uploads."""
+        removed = 0
+        async for record in self.collection.find({"refs": {"$lte": 0}}, {"path": 1}):
+            result = await self.collection.delete_one({"_id": record["_id"], "refs": {"$lte": 0}})
+            if not result.deleted_count:
+                continue  # referenced again in the meantime
+            path = self.path_for(record["path"])
+            trash_path = os.path.join(self.tmp_dir, f"sweep-{uuid.uuid4().hex}")
+            try:
+                await run_in_threadpool(os.makedirs, self.tmp_dir, exist_ok=True)
+                await run_in_threadpool(os.replace, path, trash_path)
+            except FileNotFoundError:
+                continue
+            # An upload of the same content may have re-created the record meanwhile;
+            # it writes its own file, so only put ours back if it is not there yet
+            if await self.collection.find_one({"_id": record["_id"]}, {"_id": 1}) and \
+                    not await run_in_threadpool(os.path.exists, path):
+                await run_in_threadpool(os.replace, trash_path, path)
+                continue
+            await run_in_threadpool(os.remove, trash_path)
+            removed += 1
+        return removed
+
+    # -------------------------------
+    # Periodic sweep
+    # -------------------------------
+    def start_sweeper(self, interval_minutes: int = BLOB_SWEEP_INTERVAL_MINUTES):
+        if self._sweeper is None and interval_minutes > 0:
+            self._sweeper = asyncio.create_task(self._sweep_every(interval_minutes * 60))
+
+    async def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    async def _sweep_every(self, seconds: float):
+        while True:
+            await asyncio.sleep(seconds)
+            try:
+                removed = await self.sweep()
+                if removed:
+                    print(f"🧹 Deleted {removed} unreferenced evidence blobs")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("❌ Error while sweeping evidence blobs:", e)
+
+
+blob_store = BlobStore(async_db["blobs"])
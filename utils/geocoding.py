@@ -0,0 +1,174 @@
+import asyncio
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from geopy.exc import GeocoderServiceError, GeocoderTimedOut
+from geopy.geocoders import Nominatim
+from pymongo.errors import PyMongoError
+
+# Coordinates are rounded to this many decimals to form a cache cell
+# (3 decimals is roughly 110 m, so reports from one village share a cell)
+GEOCODE_CELL_DECIMALS = int(os.getenv("GEOCODE_CELL_DECIMALS", "3"))
+GEOCODE_CACHE_TTL_DAYS = int(os.getenv("GEOCODE_CACHE_TTL_DAYS", "90"))
+GEOCODE_LRU_SIZE = int(os.getenv("GEOCODE_LRU_SIZE", "10000"))
+GEOCODE_TIMEOUT = 10
+# "nominatim" (online) or "offline" (local boundary polygons, see utils/offline_geocoding.py)
+GEOCODER_BACKEND = os.getenv("GEOCODER_BACKEND", "nominatim")
+
+UNKNOWN_PLACE = {"country": "Unknown", "city": None}
+
+
+def cell_key(latitude: float, longitude: float, decimals: int = GEOCODE_CELL_DECIMALS, backend: str = None) -> str:
+    """Rounded cell, prefixed with the backend name so backends never share cache entries."""
+    cell = f"{latitude:.{decimals}f},{longitude:.{decimals}f}"
+    return f"{backend}:{cell}" if backend else cell
+
+
+# -------------------------------
+# Backends
+# -------------------------------
+# A backend is any object with a blocking reverse(latitude, longitude) that
+# returns {"country", "city"}, returns None when the point has no address, and
+# raises when the lookup itself failed (those results are not cached).
+class NominatimBackend:
+    name = "nominatim"
+
+    def __init__(self, user_agent: str = "hr_monitor_app", timeout: int = GEOCODE_TIMEOUT):
+        self.geolocator = Nominatim(user_agent=user_agent)
+        self.timeout = timeout
+
+    def reverse(self, latitude: float, longitude: float):
+        location = self.geolocator.reverse((latitude, longitude), language="en", timeout=self.timeout)
+        if not location or not location.raw or "address" not in location.raw:
+            return None
+        address = location.raw["address"]
+        return {
+            "country": address.get("country", "Unknown"),
+            "city": address.get("city") or address.get("town") or address.get("village")
+                    or address.get("state") or address.get("county"),
+        }
+
+
+def make_backend(name: str = GEOCODER_BACKEND, user_agent: str = "hr_monitor_app"):
+    if name == "nominatim":
+        return NominatimBackend(user_agent=user_agent)
+    if name == "offline":
+        from utils.offline_geocoding import OfflineBackend
+        return OfflineBackend()
+    raise ValueError(f"Unknown GEOCODER_BACKEND {name!r}; expected 'nominatim' or 'offline'")
+
+
+# -------------------------------
+# Two-level cache
+# -------------------------------
+class GeocodingCache:
+    """
+    Reverse geocoding behind an in-process LRU and a persistent Mongo table.
+
+    Lookups are keyed by rounded coordinate cells. A hit in either level skips
+    the network; a miss calls the backend in a worker thread (it blocks) and
+    stores the answer in both levels. Entries in Mongo expire after `ttl`
+    through a TTL index on `expires_at`. Concurrent misses for the same cell
+    share one backend call. If Mongo is unavailable the lookup goes to the
+    backend as if the entry were missing, and the answer is only kept in memory.
+    """
+
+    def __init__(self, collection, backend, max_entries: int = GEOCODE_LRU_SIZE,
+                 ttl: timedelta = timedelta(days=GEOCODE_CACHE_TTL_DAYS)):
+        self.collection = collection
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lru = OrderedDict()
+        self._inflight = {}
+        self._stats = {"memory_hits": 0, "persistent_hits": 0, "coalesced": 0, "misses": 0, "errors": 0,
+                       "cache_errors": 0}
+
+    async def reverse(self, latitude: float, longitude: float, raise_errors: bool = False) -> dict:
+        """
+        Returns {"country", "city"}. A failed backend lookup gives UNKNOWN_PLACE
+        (never cached), or is raised with raise_errors so callers can retry it.
+        """
+        key = cell_key(latitude, longitude, backend=getattr(self.backend, "name", None))
+
+        place = self._lru.get(key)
+        if place is not None:
+            self._lru.move_to_end(key)
+            self._stats["memory_hits"] += 1
+            return dict(place)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._stats["coalesced"] += 1
+        else:
+            pending = asyncio.ensure_future(self._load(key, latitude, longitude))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        try:
+            return dict(await asyncio.shield(pending))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if raise_errors:
+                raise
+            return dict(UNKNOWN_PLACE)
+
+    async def _load(self, key: str, latitude: float, longitude: float) -> dict:
+        try:
+            stored = await self.collection.find_one({"_id": key}, {"country": 1, "city": 1})
+        except PyMongoError as e:
+            self._stats["cache_errors"] += 1
+            print(f"❌ Error reading the geocode cache for {key}: {e}")
+            stored = None
+        if stored:
+            self._stats["persistent_hits"] += 1
+            place = {"country": stored.get("country"), "city": stored.get("city")}
+            self._remember(key, place)
+            return place
+
+        self._stats["misses"] += 1
+        try:
+            place = await asyncio.to_thread(self.backend.reverse, latitude, longitude)
+        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            self._stats["errors"] += 1
+            print(f"Geocoder failed for coordinates: {latitude}, {longitude}: {e}")
+            raise
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"An error occurred during geocoding for coordinates {latitude}, {longitude}: {e}")
+            raise
+
+        place = place or dict(UNKNOWN_PLACE)
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {"_id": key},
+                {"$set": {**place, "backend": getattr(self.backend, "name", None),
+                          "created_at": now, "expires_at": now + self.ttl}},
+                upsert=True,
+            )
+        except PyMongoError as e:
+            self._stats["cache_errors"] += 1
+            print(f"❌ Error writing the geocode cache for {key}: {e}")
+        self._remember(key, place)
+        return place
+
+    def _remember(self, key: str, place: dict):
+        self._lru[key] = place
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def stats(self) -> dict:
+        # Coalesced lookups waited on another request's miss and never reached the backend
+        hits = self._stats["memory_hits"] + self._stats["persistent_hits"] + self._stats["coalesced"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": len(self._lru),
+            "cell_decimals": GEOCODE_CELL_DECIMALS,
+            "backend": getattr(self.backend, "name", type(self.backend).__name__),
+        }
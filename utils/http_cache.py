@@ -0,0 +1,158 @@
+import hashlib
+import os
+import re
+from collections import OrderedDict
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from utils.serialization import dumps
+
+FILE_CHUNK_SIZE = 256 * 1024
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# -------------------------------
+# ETags
+# -------------------------------
+def make_etag(value: str) -> str:
+    return f'"{value}"'
+
+
+def etag_for_bytes(data: bytes) -> str:
+    return make_etag(hashlib.sha256(data).hexdigest()[:32])
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def json_response(request: Request, payload) -> Response:
+    """JSON response with a strong content-hash ETag; answers 304 when the client copy is current."""
+    body = dumps(payload)
+    etag = etag_for_bytes(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json",
+                    headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+# -------------------------------
+# Files with byte ranges
+# -------------------------------
+class _FileDigestCache:
+    """Content hashes of files without a hash in their name, keyed by (path, size, mtime)."""
+
+    def __init__(self, max_entries=10_000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, path: str, stat) -> str:
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        digest = self._entries.get(key)
+        if digest is None:
+            digest = _hash_file(path)
+            self._entries[key] = digest
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return digest
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(FILE_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+file_digests = _FileDigestCache()
+
+
+async def file_etag(path: str, stat, content_hash: str = None) -> str:
+    if content_hash:
+        return make_etag(content_hash)
+    return make_etag(await run_in_threadpool(file_digests.get, path, stat))
+
+
+def parse_range(header: str, size: int):
+    """
+    Returns (start, end) inclusive for a single byte range, None when the header
+    should be ignored (absent or multi-range), or raises ValueError if unsatisfiable.
+    """
+    if not header or "," in header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def _iter_file(path: str, start: int, length: int):
+    with open(path, "rb") as source:
+        source.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = source.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def file_response(request: Request, path: str, media_type: str, content_hash: str = None) -> Response:
+    """Serves a file with a strong ETag, 304 revalidation and single byte-range support."""
+    stat = await run_in_threadpool(os.stat, path)
+    etag = await file_etag(path, stat, content_hash)
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": "no-cache"}
+
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    size = stat.st_size
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_iter_file(path, 0, size), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    length = end - start + 1
+    headers["Content-Length"] = str(length)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(_iter_file(path, start, length), status_code=206, media_type=media_type, headers=headers)
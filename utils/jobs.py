@@ -0,0 +1,180 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = 3
+# Running jobs refresh updated_at (their lease) this often while the handler works
+JOB_HEARTBEAT_SECONDS = 30
+# A running job whose lease was not refreshed for this long belongs to a dead
+# process; the reaper re-queues it
+JOB_STALE_AFTER = timedelta(seconds=JOB_HEARTBEAT_SECONDS * 4)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobQueue:
+    """
+    In-process background job queue with status tracked in Mongo.
+
+    Every job is a document in `collection` ({kind, payload, status, attempts,
+    error, ...}), so its progress can be queried and it survives a restart:
+    start() picks up jobs left queued. A running job holds a lease, renewed by a
+    heartbeat on `updated_at`; a reaper (at start, then every heartbeat period)
+    re-queues running jobs whose lease expired because their process died.
+    Workers claim a job with an atomic queued -> running update, so a job is
+    only run by one worker even if several API processes share the collection.
+    Failed jobs are retried up to `max_attempts` times.
+    """
+
+    def __init__(self, collection, workers: int = JOB_WORKERS, max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.collection = collection
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.handlers = {}
+        self._queue = None
+        self._tasks = []
+
+    def handler(self, kind: str):
+        """Decorator registering `async def handler(payload)` for a job kind."""
+        def register(func):
+            self.handlers[kind] = func
+            return func
+        return register
+
+    async def enqueue(self, kind: str, payload: dict, job_id: str = None) -> str:
+        """Stores and schedules a job; `job_id` lets callers reference it before it exists."""
+        now = datetime.utcnow()
+        job_id = ObjectId(job_id) if job_id else ObjectId()
+        await self.collection.insert_one({
+            "_id": job_id, "kind": kind, "payload": payload, "status": QUEUED,
+            "attempts": 0, "error": None, "created_at": now, "updated_at": now,
+        })
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+        return str(job_id)
+
+    async def enqueue_many(self, kind: str, payloads: list, job_ids: list = None) -> list:
+        """Stores and schedules several jobs of one kind with a single insert_many."""
+        now = datetime.utcnow()
+        ids = [ObjectId(job_id) if job_id else ObjectId() for job_id in (job_ids or [None] * len(payloads))]
+        if not payloads:
+            return []
+        await self.collection.insert_many([{
+            "_id": job_id, "kind": kind, "payload": payload, "status": QUEUED,
+            "attempts": 0, "error": None, "created_at": now, "updated_at": now,
+        } for job_id, payload in zip(ids, payloads)])
+        if self._queue is not None:
+            for job_id in ids:
+                self._queue.put_nowait(job_id)
+        return [str(job_id) for job_id in ids]
+
+    async def get(self, job_id: str):
+        if not ObjectId.is_valid(job_id):
+            return None
+        job = await self.collection.find_one({"_id": ObjectId(job_id)})
+        if job:
+            job["id"] = str(job.pop("_id"))
+        return job
+
+    # -------------------------------
+    # Lifecycle
+    # -------------------------------
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        await self.requeue_expired()
+        async for job in self.collection.find({"status": QUEUED}, {"_id": 1}).sort("created_at", 1):
+            self._queue.put_nowait(job["_id"])
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reap()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def requeue_expired(self) -> list:
+        """Re-queues running jobs whose lease expired; returns their ids."""
+        requeued = []
+        stale = datetime.utcnow() - JOB_STALE_AFTER
+        async for job in self.collection.find({"status": RUNNING, "updated_at": {"$lt": stale}}, {"_id": 1}):
+            result = await self.collection.update_one(
+                {"_id": job["_id"], "status": RUNNING, "updated_at": {"$lt": stale}},
+                {"$set": {"status": QUEUED, "updated_at": datetime.utcnow()}},
+            )
+            if result.modified_count:
+                requeued.append(job["_id"])
+        return requeued
+
+    # -------------------------------
+    # Workers
+    # -------------------------------
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                for job_id in await self.requeue_expired():
+                    print(f"⚠️ Job {job_id} lost its worker, re-queued")
+                    self._queue.put_nowait(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("❌ Error while re-queueing expired jobs:", e)
+
+    async def _heartbeat(self, job_id):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            await self.collection.update_one({"_id": job_id, "status": RUNNING},
+                                             {"$set": {"updated_at": datetime.utcnow()}})
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Error in job worker for {job_id}:", e)
+
+    async def _run(self, job_id):
+        job = await self.collection.find_one_and_update(
+            {"_id": job_id, "status": QUEUED},
+            {"$set": {"status": RUNNING, "started_at": datetime.utcnow(), "updated_at": datetime.utcnow()},
+             "$inc": {"attempts": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is None:
+            return  # claimed by another worker, or already finished
+
+        handler = self.handlers.get(job["kind"])
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            if handler is None:
+                raise LookupError(f"no handler for job kind {job['kind']!r}")
+            result = await handler(job["payload"])
+        except Exception as e:
+            retry = handler is not None and job["attempts"] < self.max_attempts
+            await self.collection.update_one({"_id": job_id}, {"$set": {
+                "status": QUEUED if retry else FAILED, "error": str(e), "updated_at": datetime.utcnow(),
+            }})
+            print(f"❌ Job {job_id} ({job['kind']}) failed on attempt {job['attempts']}: {e}")
+            if retry:
+                # Back off without holding this worker
+                queue = self._queue
+                asyncio.get_running_loop().call_later(2 ** job["attempts"], queue.put_nowait, job_id)
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self.collection.update_one({"_id": job_id}, {"$set": {
+            "status": DONE, "result": result, "error": None,
+            "finished_at": datetime.utcnow(), "updated_at": datetime.utcnow(),
+        }})
@@ -0,0 +1,137 @@
+import json
+import math
+import os
+import threading
+
+# GeoJSON FeatureCollection of country or admin-1 boundaries (e.g. Natural Earth
+# "Admin 1 – States, Provinces", whose features carry `admin` and `name`).
+# The bundled default is Natural Earth 1:110m countries (country level only).
+BUNDLED_BOUNDARIES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "data", "boundaries.geojson")
+GEOCODER_BOUNDARIES = os.getenv("GEOCODER_BOUNDARIES", BUNDLED_BOUNDARIES)
+GEOCODER_COUNTRY_PROPERTY = os.getenv("GEOCODER_COUNTRY_PROPERTY", "admin")
+GEOCODER_REGION_PROPERTY = os.getenv("GEOCODER_REGION_PROPERTY", "name")
+GRID_CELL_DEGREES = 1.0
+
+
+def _ring_contains(ring, x, y) -> bool:
+    """Even-odd ray casting; `ring` is a list of [lon, lat] positions."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+class _Polygon:
+    __slots__ = ("exterior", "holes", "bbox", "place")
+
+    def __init__(self, rings, place):
+        self.exterior = rings[0]
+        self.holes = rings[1:]
+        xs = [p[0] for p in self.exterior]
+        ys = [p[1] for p in self.exterior]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self.place = place
+
+    def contains(self, x, y) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if x < min_x or x > max_x or y < min_y or y > max_y:
+            return False
+        if not _ring_contains(self.exterior, x, y):
+            return False
+        return not any(_ring_contains(hole, x, y) for hole in self.holes)
+
+
+class GridIndex:
+    """
+    Uniform lon/lat grid over polygon bounding boxes.
+
+    Each cell lists the polygons whose bbox overlaps it, so a lookup tests only
+    the few candidates in one cell: a bbox check, then ray casting.
+    """
+
+    def __init__(self, cell_degrees: float = GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.cells = {}
+        self.polygons = 0
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_degrees), math.floor(y / self.cell_degrees)
+
+    def insert(self, polygon: _Polygon):
+        min_x, min_y, max_x, max_y = polygon.bbox
+        (x0, y0), (x1, y1) = self._cell(min_x, min_y), self._cell(max_x, max_y)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(polygon)
+        self.polygons += 1
+
+    def find(self, x, y):
+        for polygon in self.cells.get(self._cell(x, y), ()):
+            if polygon.contains(x, y):
+                return polygon.place
+        return None
+
+
+def load_boundaries(path: str, country_property: str, region_property: str,
+                    cell_degrees: float = GRID_CELL_DEGREES) -> GridIndex:
+    with open(path, encoding="utf-8") as source:
+        collection = json.load(source)
+
+    index = GridIndex(cell_degrees)
+    for feature in collection.get("features", []):
+        geometry = feature.get("geometry") or {}
+        properties = feature.get("properties") or {}
+        place = {
+            "country": properties.get(country_property) or "Unknown",
+            "city": properties.get(region_property) if region_property != country_property else None,
+        }
+        if geometry.get("type") == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            continue
+        for rings in polygons:
+            if rings and rings[0]:
+                index.insert(_Polygon(rings, place))
+    return index
+
+
+class OfflineBackend:
+    """
+    Reverse geocoder over local boundary polygons; no network access.
+
+    The boundary file must exist when the backend is created (so a missing file
+    stops the API at startup) and is loaded and indexed on first use. Returns
+    the feature's country and admin region (as `city`, matching the Nominatim
+    backend's fallback to state/county), or None for points outside every polygon.
+    """
+    name = "offline"
+
+    def __init__(self, path: str = GEOCODER_BOUNDARIES, country_property: str = GEOCODER_COUNTRY_PROPERTY,
+                 region_property: str = GEOCODER_REGION_PROPERTY):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Boundary file {path} not found; set GEOCODER_BOUNDARIES to a GeoJSON file")
+        self.path = path
+        self.country_property = country_property
+        self.region_property = region_property
+        self._index = None
+        self._lock = threading.Lock()
+
+    def index(self) -> GridIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = load_boundaries(self.path, self.country_property, self.region_property)
+                    print(f"🗺️ Offline geocoder indexed {self._index.polygons} polygons from {self.path}")
+        return self._index
+
+    def reverse(self, latitude: float, longitude: float):
+        place = self.index().find(longitude, latitude)
+        return dict(place) if place else None
@@ -0,0 +1,48 @@
+import json
+from datetime import date, datetime
+
+from bson import ObjectId
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+
+def json_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    """Serializes Mongo documents (ObjectId, datetime) straight to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default)
+    return json.dumps(value, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+async def aiter_ndjson(documents, batch_size=200):
+    """Yields newline-delimited JSON chunks from a Motor cursor, `batch_size` documents at a time."""
+    lines = []
+    async for doc in documents:
+        lines.append(dumps(doc))
+        if len(lines) >= batch_size:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+async def aiter_lines(byte_chunks):
+    """Splits an async stream of byte chunks (e.g. request.stream()) into lines."""
+    pending = b""
+    async for chunk in byte_chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
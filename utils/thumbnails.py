@@ -0,0 +1,95 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+THUMBNAIL_ROOT = os.path.join("uploads", "thumbs")
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+
+# Longest edge in pixels for each generated variant
+VARIANTS = {
+    "thumbnail": 256,
+    "preview": 1024,
+}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff"}
+
+
+def is_image(filename: str) -> bool:
+    return os.path.splitext(filename or "")[1].lower() in IMAGE_EXTENSIONS
+
+
+def variant_path(sha256: str, variant: str) -> str:
+    return os.path.join(THUMBNAIL_ROOT, sha256[:2], sha256[2:4], f"{sha256}_{variant}.webp")
+
+
+def variant_urls(sha256: str) -> dict:
+    return {f"{variant}_url": f"/api/evidence/{sha256}/{variant}" for variant in VARIANTS}
+
+
+def render_variants(source_path: str, sha256: str):
+    """Decodes the image once and writes every missing variant as WebP."""
+    targets = {v: variant_path(sha256, v) for v in VARIANTS if not os.path.exists(variant_path(sha256, v))}
+    if not targets:
+        return
+
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        # Largest first so each smaller variant resizes an already reduced copy
+        for variant in sorted(targets, key=VARIANTS.get, reverse=True):
+            size = VARIANTS[variant]
+            image.thumbnail((size, size), Image.LANCZOS)
+            path = targets[variant]
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            image.save(tmp_path, "WEBP", quality=80, method=4)
+            os.replace(tmp_path, path)
+
+
+class ThumbnailWorker:
+    """Thread pool that renders thumbnails and previews off the event loop."""
+
+    def __init__(self, max_workers: int = THUMBNAIL_WORKERS):
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.RLock()
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="thumbnails")
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def submit(self, sha256: str, source_path: str):
+        """Queues rendering for a blob; repeated submissions share one job."""
+        self.start()
+        with self._lock:
+            future = self._pending.get(sha256)
+            if future is None:
+                future = self._executor.submit(render_variants, source_path, sha256)
+                self._pending[sha256] = future
+                future.add_done_callback(lambda done: self._finished(sha256, done))
+            return future
+
+    async def ensure(self, sha256: str, source_path: str):
+        """Waits until the variants for a blob exist, rendering them if needed."""
+        await asyncio.wrap_future(self.submit(sha256, source_path))
+
+    def _finished(self, sha256: str, future):
+        with self._lock:
+            self._pending.pop(sha256, None)
+        if not future.cancelled() and future.exception() is not None:
+            print(f"❌ Thumbnail rendering failed for {sha256}: {future.exception()}")
+
+
+thumbnail_worker = ThumbnailWorker()
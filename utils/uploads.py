@@ -0,0 +1,65 @@
+import hashlib
+import os
+import re
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "500")) * 1024 * 1024
+
+_SAFE_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the maximum upload size of {max_bytes // (1024 * 1024)} MB")
+        self.max_bytes = max_bytes
+
+
+def safe_extension(filename: str) -> str:
+    extension = os.path.splitext(filename or "")[1].lower()
+    return extension if _SAFE_EXTENSION.match(extension) else ""
+
+
+def _write_chunk(buffer, digest, chunk):
+    digest.update(chunk)
+    buffer.write(chunk)
+
+
+async def stream_upload_to_file(file: UploadFile, path: str, max_bytes: int = MAX_UPLOAD_BYTES):
+    """
+    Copies an upload to `path` in fixed-size chunks, hashing in the same pass.
+
+    Disk writes run in the threadpool so the event loop is never blocked, and the
+    size limit is enforced while streaming. Returns (size, sha256 hex digest).
+    The partial file is removed if anything goes wrong.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    digest = hashlib.sha256()
+    size = 0
+    buffer = await run_in_threadpool(open, path, "wb")
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            await run_in_threadpool(_write_chunk, buffer, digest, chunk)
+        await run_in_threadpool(buffer.close)
+    except BaseException:
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(_remove_quietly, path)
+        raise
+    return size, digest.hexdigest()
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass